@@ -0,0 +1,107 @@
+"""
+Offline stand-ins for IMDb and AMDb built from the test fixtures, so benchmarks measure this code rather than the
+network.
+"""
+import json
+import os
+import threading
+import time
+
+from src.scraper.cache import CachedResponse
+from src.services.amdb_service import AMDbService
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_PATH = os.path.join(ROOT_PATH, "test/resources/imdb_pages/")
+EXPECTED_RESULTS_PATH = os.path.join(ROOT_PATH, "test/resources/expected_results/")
+
+# The fixture file prefix of every title and person with a full set of fixture pages.
+FIXTURES = {
+    "titles.json": {"Avengers Endgame": "title/avengers_endgame", "The Dark Knight": "title/the_dark_knight",
+                    "The Wolf of Wall Street": "title/wolf_of_wall_st"},
+    "names.json": {"Christian Bale": "name/christian_bale", "Gwyneth Paltrow": "name/gwyneth_paltrow",
+                   "Leonardo DiCaprio": "name/leonardo_dicaprio"},
+}
+# The fixture file suffix of each page URL recorded in the expected results.
+PAGES = {"search_uri": "search", "main_uri": "main", "credits_uri": "credits", "awards_uri": "awards",
+         "bio_uri": "bio"}
+
+
+def get_title_queries() -> list:
+    return list(FIXTURES["titles.json"])
+
+
+def load_routes() -> dict:
+    """
+    Returns:
+        A dict of IMDb URL to the raw HTML of its fixture page.
+    """
+    routes = {}
+    for filename, fixtures in FIXTURES.items():
+        with open(EXPECTED_RESULTS_PATH + filename, encoding="utf-8") as f:
+            expected = json.load(f)
+        for query, prefix in fixtures.items():
+            for uri, page in PAGES.items():
+                if uri in expected[query]:
+                    with open(PAGES_PATH + prefix + "_" + page + ".htm", "rb") as f:
+                        routes[expected[query][uri]] = f.read()
+    return routes
+
+
+class NotFoundResponse:
+
+    def __init__(self, url: str):
+        self.url = url
+        self.status_code = 404
+        self.content = b""
+        self.headers = {}
+
+
+class FixtureFetcher:
+    """
+    A drop in for Fetcher that serves fixture pages from memory. URLs without a fixture get a 404.
+
+    Args:
+        routes: A dict of URL to raw HTML, see 'load_routes'.
+        latency: The number of seconds each request is delayed by, to simulate the network.
+    """
+
+    def __init__(self, routes: dict = None, latency: float = 0.0):
+        self.routes = routes if routes is not None else load_routes()
+        self.latency = latency
+        self.cache = None
+        self.rate_limiter = None
+        self.request_count = 0
+        self.__lock = threading.Lock()
+
+    def get(self, url: str):
+        with self.__lock:
+            self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        content = self.routes.get(url)
+        return CachedResponse(url, content) if content is not None else NotFoundResponse(url)
+
+
+class StubAMDbService(AMDbService):
+    """
+    An AMDbService that sends nothing, recording each mutation instead.
+
+    Args:
+        latency: The number of seconds each mutation is delayed by, to simulate the AMDb round trip.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(client=None)
+        self.latency = latency
+        self.mutations = {}
+        self.__lock = threading.Lock()
+
+    def _execute_graphql_request(self, operation_name: str, variables: dict):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.__lock:
+            self.mutations[operation_name] = self.mutations.get(operation_name, 0) + 1
+        return variables
+
+    def mutation_count(self) -> int:
+        return sum(self.mutations.values())
@@ -0,0 +1,72 @@
+"""
+Compares parsing whole IMDb fixture pages against parsing only the regions the extractors read.
+
+Usage:
+    python -m benchmark.parse_regions [--repeat N] [--parser html.parser|lxml]
+"""
+import argparse
+import glob
+import os
+import statistics
+import time
+import tracemalloc
+
+from src.scraper import extractor
+from src.scraper.parser import DEFAULT_PARSER, parse, validate_parser
+
+from benchmark.fixtures import PAGES_PATH
+
+PAGE_REGIONS = {
+    "search": extractor.SEARCH_REGION,
+    "credits": extractor.FULL_CREDITS_REGION,
+    "bio": extractor.BIO_REGION,
+    "awards": extractor.AWARDS_REGION,
+}
+
+
+def measure(content: bytes, parser: str, region, repeat: int) -> (float, int):
+    """
+    Returns:
+        The median parse time in seconds and the peak traced memory in bytes of a single parse.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(content, parser, region)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse(content, parser, region)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def run(parser: str, repeat: int) -> list:
+    results = []
+    for page_type, region in PAGE_REGIONS.items():
+        for filepath in sorted(glob.glob(PAGES_PATH + f"*/*_{page_type}.htm")):
+            with open(filepath, "rb") as f:
+                content = f.read()
+            full_time, full_peak = measure(content, parser, None, repeat)
+            region_time, region_peak = measure(content, parser, region, repeat)
+            results.append({
+                "page": os.path.basename(filepath),
+                "bytes": len(content),
+                "full_ms": full_time * 1000,
+                "region_ms": region_time * 1000,
+                "full_peak_kb": full_peak / 1024,
+                "region_peak_kb": region_peak / 1024,
+            })
+    return results
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--parser", default=DEFAULT_PARSER)
+    args = arg_parser.parse_args()
+
+    print(f"{'page':<36}{'KB':>7}{'full ms':>10}{'region ms':>11}{'full peak KB':>14}{'region peak KB':>16}")
+    for r in run(validate_parser(args.parser), args.repeat):
+        print(f"{r['page']:<36}{r['bytes'] / 1024:>7.0f}{r['full_ms']:>10.1f}{r['region_ms']:>11.1f}"
+              f"{r['full_peak_kb']:>14.0f}{r['region_peak_kb']:>16.0f}")
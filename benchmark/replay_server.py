@@ -0,0 +1,207 @@
+"""
+A local HTTP server that replays the fixture pages under IMDb's own URL scheme ('/find?q=', '/title/tt.../',
+'/title/tt.../fullcredits', '/name/nm.../bio', '/name/nm.../awards'), so the real scraper, Fetcher, connection pool,
+cache and rate limiter can be load tested over a real network stack without touching IMDb. Point a scraper at it with
+'IMDbScraper(base_url=server.base_url)'.
+
+Responses can be delayed by a fixed latency plus random jitter, and a share of them failed with a throttling or server
+error. Every page carries an ETag and a matching 'If-None-Match' gets a '304 Not Modified'.
+
+Usage:
+    python -m benchmark.replay_server [--port 8000] [--latency 0.05] [--jitter 0.02] [--error-rate 0.01]
+                                      [--error-status 503] [--retry-after 1]
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hashlib
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmark.fixtures import load_routes
+
+# Query parameters IMDb only uses for click tracking, which the server ignores when matching a request to a page.
+IGNORED_PARAMS = ("ref_=",)
+
+
+def get_route_key(url: str) -> str:
+    """
+    Returns:
+        The path and query of an IMDb URL, or of a request path, without the click tracking parameters.
+    """
+    parts = urlsplit(url)
+    params = [p for p in parts.query.split("&") if p and not p.startswith(IGNORED_PARAMS)]
+    return parts.path + ("?" + "&".join(params) if params else "")
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """
+    Serves one request from the ReplayServer's pages. HTTP/1.1 so connections are kept alive and pooled as they
+    would be by IMDb.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        replay = self.server.replay
+        delay = replay.get_delay()
+        if delay:
+            time.sleep(delay)
+        if replay.should_fail():
+            headers = {"Retry-After": f"{replay.retry_after:g}"} if replay.retry_after is not None else {}
+            self.__respond(replay.error_status, b"", headers)
+            return
+        page = replay.pages.get(get_route_key(self.path))
+        if page is None:
+            self.__respond(404, b"")
+            return
+        content, etag = page
+        if self.headers.get("If-None-Match") == etag:
+            self.__respond(304, b"", {"ETag": etag})
+            return
+        self.__respond(200, content, {"ETag": etag, "Content-Type": "text/html; charset=utf-8"})
+
+    def __respond(self, status: int, body: bytes, headers: dict = None):
+        self.server.replay.count(status)
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _ReplayHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class ReplayServer:
+    """
+    Serves recorded IMDb pages from a background thread, see the module docstring.
+
+    Args:
+        routes: A dict of IMDb URL to raw HTML. Defaults to every fixture page, see 'benchmark.fixtures.load_routes'.
+        host: The interface to listen on.
+        port: The port to listen on. A free one is picked if 0.
+        latency: The number of seconds every response is delayed by.
+        jitter: The most a response's delay is randomly lengthened or shortened by, in seconds.
+        error_rate: The share of requests, between 0 and 1, answered with 'error_status' instead of their page.
+        error_status: The status code of injected errors e.g. 429, 503 or 500.
+        retry_after: The 'Retry-After' seconds sent with injected errors. No header is sent if None.
+        seed: The seed of the jitter and error injection, for repeatable runs.
+
+    Attributes:
+        pages: A dict of route key, see 'get_route_key', to the page's raw HTML and ETag.
+        request_count: The number of requests served.
+        status_counts: A dict of status code to the number of responses sent with it.
+    """
+    logger = logging.getLogger('ReplayServer')
+
+    def __init__(self, routes: dict = None, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 503, retry_after: float = None,
+                 seed: int = None):
+        routes = routes if routes is not None else load_routes()
+        self.pages = {get_route_key(url): (content, '"' + hashlib.sha1(content).hexdigest()[:16] + '"')
+                      for url, content in routes.items()}
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.status_counts = {}
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__server = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        The scheme, host and port the server is listening on, to be used as a scraper's 'base_url'.
+        """
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """
+        Starts listening and serving from a background thread.
+
+        Returns:
+            The server, for chaining.
+        """
+        self.__server = _ReplayHTTPServer((self.host, self.port), ReplayHandler)
+        self.__server.replay = self
+        self.port = self.__server.server_address[1]
+        threading.Thread(target=self.__server.serve_forever, name="replay-server", daemon=True).start()
+        self.logger.info(f"Replaying {len(self.pages)} pages at {self.base_url}")
+        return self
+
+    def stop(self):
+        """
+        Stops serving and closes the listening socket.
+        """
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def get_delay(self) -> float:
+        """
+        Returns:
+            The number of seconds to delay a response by, the latency plus or minus up to the jitter.
+        """
+        if not self.jitter:
+            return self.latency
+        with self.__lock:
+            return max(0.0, self.latency + self.__random.uniform(-self.jitter, self.jitter))
+
+    def should_fail(self) -> bool:
+        """
+        Returns:
+            Whether to answer a request with an injected error.
+        """
+        if not self.error_rate:
+            return False
+        with self.__lock:
+            return self.__random.random() < self.error_rate
+
+    def count(self, status: int):
+        with self.__lock:
+            self.request_count += 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8000)
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="Seconds every response is delayed by.")
+    arg_parser.add_argument("--jitter", type=float, default=0.0,
+                            help="The most a response's delay is randomly lengthened or shortened by, in seconds.")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0,
+                            help="The share of requests answered with '--error-status' instead of their page.")
+    arg_parser.add_argument("--error-status", type=int, default=503)
+    arg_parser.add_argument("--retry-after", type=float, help="The 'Retry-After' seconds sent with injected errors.")
+    arg_parser.add_argument("--seed", type=int)
+    args = arg_parser.parse_args()
+
+    server = ReplayServer(host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate, error_status=args.error_status, retry_after=args.retry_after,
+                          seed=args.seed).start()
+    print(f"Replaying IMDb at {server.base_url}, Ctrl+C to stop.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,211 @@
+"""
+Benchmarks page parsing, every extractor and a simulated ingest on the test fixtures, without touching IMDb, and saves
+the results as JSON so runs can be compared. One ingest goes through a real Fetcher to a local replay server.
+
+Usage:
+    python -m benchmark.suite [--repeat N] [--parser html.parser|lxml] [--output results.json]
+                              [--compare baseline.json] [--tolerance 1.25]
+
+With '--compare' every timing is checked against the same timing in an earlier run and the exit status is 1 if any
+is more than '--tolerance' times slower.
+"""
+import argparse
+import datetime
+import glob
+import json
+import platform
+import statistics
+import sys
+import time
+
+from src.crawler.crawler import Crawler
+from src.model.award import AwardOrganisation
+from src.scraper import extractor
+from src.scraper.fetcher import Fetcher
+from src.scraper.imdb_scraper import IMDbScraper
+from src.scraper.parser import DEFAULT_PARSER, parse, validate_parser
+
+from benchmark.fixtures import PAGES_PATH, FixtureFetcher, StubAMDbService, get_title_queries, load_routes
+from benchmark.replay_server import ReplayServer
+
+
+def _awards_extractors() -> list:
+    return [(f"get_awards_for_organisation[{o.value}]",
+             lambda soup, organisation=o.value: extractor.get_awards_for_organisation(soup, organisation))
+            for o in AwardOrganisation]
+
+
+# Each page type's fixture file pattern, the region it is parsed with and the extractors that read it.
+PAGE_TYPES = {
+    "search": ("*/*_search.htm", extractor.SEARCH_REGION, [("get_first_result_path", extractor.get_first_result_path)]),
+    "title_main": ("title/*_main.htm", None, [
+        (f.__name__, f) for f in (extractor.get_title_name, extractor.get_title_summary,
+                                  extractor.get_title_release_year, extractor.get_title_certificate_rating,
+                                  extractor.get_title_length_in_mins, extractor.get_title_storyline,
+                                  extractor.get_title_tagline, extractor.get_title_genres, extractor.get_title_cast)]),
+    "full_credits": ("title/*_credits.htm", extractor.FULL_CREDITS_REGION, [
+        (f.__name__, f) for f in (extractor.get_title_directors, extractor.get_title_writers,
+                                  extractor.get_title_producers)]),
+    "name_main": ("name/*_main.htm", None, [
+        (f.__name__, f) for f in (extractor.get_person_name, extractor.get_person_dob)]),
+    "bio": ("name/*_bio.htm", extractor.BIO_REGION, [("get_person_bio", extractor.get_person_bio)]),
+    "awards": ("name/*_awards.htm", extractor.AWARDS_REGION, _awards_extractors()),
+}
+
+
+def time_median(function, repeat: int) -> float:
+    """
+    Returns:
+        The median number of milliseconds a call to function takes over repeat calls.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def bench_pages(parser: str, repeat: int) -> (dict, dict):
+    """
+    Times each page type end to end, parsing its region and running every extractor that reads it, and each
+    extractor on its own against an already parsed page.
+
+    Returns:
+        A dict of page type to its median milliseconds, and a dict of extractor to its median milliseconds, each
+        summed over every fixture page of that type.
+    """
+    pages, extractors = {}, {}
+    for page_type, (pattern, region, functions) in PAGE_TYPES.items():
+        pages[page_type] = 0.0
+        for filepath in sorted(glob.glob(PAGES_PATH + pattern)):
+            with open(filepath, "rb") as f:
+                content = f.read()
+
+            def end_to_end():
+                soup = parse(content, parser, region)
+                for _, function in functions:
+                    function(soup)
+
+            pages[page_type] += time_median(end_to_end, repeat)
+            soup = parse(content, parser, region)
+            for name, function in functions:
+                key = f"{page_type}.{name}"
+                extractors[key] = extractors.get(key, 0.0) + time_median(lambda: function(soup), repeat)
+    return pages, extractors
+
+
+def bench_ingest(parser: str, pipelined: bool, imdb_latency: float, amdb_latency: float) -> dict:
+    """
+    Crawls every fixture title into a StubAMDbService, as 'src/main.py' would.
+
+    Returns:
+        The elapsed milliseconds, the throughput and the number of requests and mutations of the crawl.
+    """
+    fetcher = FixtureFetcher(load_routes(), latency=imdb_latency)
+    return _crawl(IMDbScraper(fetcher=fetcher, parser=parser), pipelined, amdb_latency)
+
+
+def bench_replay_ingest(parser: str, imdb_latency: float, amdb_latency: float) -> dict:
+    """
+    Crawls every fixture title into a StubAMDbService through a real Fetcher from a local ReplayServer, so the
+    connection pool and HTTP handling are measured too.
+
+    Returns:
+        As 'bench_ingest'.
+    """
+    with ReplayServer(latency=imdb_latency) as server:
+        fetcher = Fetcher()
+        try:
+            return _crawl(IMDbScraper(fetcher=fetcher, parser=parser, base_url=server.base_url), False, amdb_latency)
+        finally:
+            fetcher.close()
+
+
+def _crawl(scraper: IMDbScraper, pipelined: bool, amdb_latency: float) -> dict:
+    amdb = StubAMDbService(latency=amdb_latency)
+    crawler = Crawler(scraper, amdb)
+    queries = get_title_queries()
+    start = time.perf_counter()
+    stats = crawler.crawl_pipelined(queries, report_interval=None) if pipelined else crawler.crawl(queries)
+    elapsed = time.perf_counter() - start
+    return {
+        "elapsed_ms": elapsed * 1000,
+        "titles": stats.titles,
+        "failed_titles": stats.failed_titles,
+        "entities": stats.entities,
+        "entities_per_sec": stats.entities / elapsed,
+        "requests": scraper.fetcher.request_count,
+        "mutations": amdb.mutation_count(),
+    }
+
+
+def run(parser: str, repeat: int, imdb_latency: float = 0.0, amdb_latency: float = 0.0) -> dict:
+    pages, extractors = bench_pages(parser, repeat)
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parser": parser,
+            "repeat": repeat,
+            "imdb_latency": imdb_latency,
+            "amdb_latency": amdb_latency,
+        },
+        "pages_ms": pages,
+        "extractors_ms": extractors,
+        "ingest": {
+            "threaded": bench_ingest(parser, False, imdb_latency, amdb_latency),
+            "pipelined": bench_ingest(parser, True, imdb_latency, amdb_latency),
+            "replay": bench_replay_ingest(parser, imdb_latency, amdb_latency),
+        },
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Returns:
+        A (metric, baseline ms, current ms) tuple for every timing that is more than tolerance times slower than in
+        the baseline.
+    """
+    def timings(r):
+        flat = {f"pages.{k}": v for k, v in r.get("pages_ms", {}).items()}
+        flat.update({f"extractors.{k}": v for k, v in r.get("extractors_ms", {}).items()})
+        flat.update({f"ingest.{k}": v["elapsed_ms"] for k, v in r.get("ingest", {}).items()})
+        return flat
+
+    current, previous = timings(results), timings(baseline)
+    return [(metric, previous[metric], ms) for metric, ms in sorted(current.items())
+            if metric in previous and previous[metric] > 0 and ms > previous[metric] * tolerance]
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--parser", default=DEFAULT_PARSER)
+    arg_parser.add_argument("--imdb-latency", type=float, default=0.0,
+                            help="Seconds each simulated IMDb request takes in the ingest benchmark.")
+    arg_parser.add_argument("--amdb-latency", type=float, default=0.0,
+                            help="Seconds each simulated AMDb mutation takes in the ingest benchmark.")
+    arg_parser.add_argument("--output", help="The path to save the results to as JSON.")
+    arg_parser.add_argument("--compare", help="The path of earlier results to check for regressions against.")
+    arg_parser.add_argument("--tolerance", type=float, default=1.25,
+                            help="How many times slower than the baseline a timing may be before it is a regression.")
+    args = arg_parser.parse_args()
+
+    results = run(validate_parser(args.parser), args.repeat, args.imdb_latency, args.amdb_latency)
+    for section in ("pages_ms", "extractors_ms"):
+        for name, ms in results[section].items():
+            print(f"{section[:-3]:<11}{name:<64}{ms:>10.2f} ms")
+    for mode, ingest in results["ingest"].items():
+        print(f"{'ingest':<11}{mode:<64}{ingest['elapsed_ms']:>10.2f} ms  ({ingest['entities']} entities, "
+              f"{ingest['requests']} requests, {ingest['mutations']} mutations)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for metric, before, after in regressions:
+            print(f"REGRESSION {metric}: {before:.2f} ms -> {after:.2f} ms ({after / before:.2f}x)")
+        sys.exit(1 if regressions else 0)
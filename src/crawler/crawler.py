@@ -0,0 +1,341 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import threading
+import time
+
+from src.crawler.journal import Journal
+from src.crawler.person_registry import PersonRegistry
+from src.crawler.pipeline import DEFAULT_QUEUE_SIZE, DEFAULT_REPORT_INTERVAL, Pipeline, Stage
+from src.instrumentation import tracing
+from src.model.title import Title
+from src.scraper import extractor
+from src.scraper.imdb_scraper import IMDbScraper
+from src.scraper.page import TitleDocument
+from src.services.amdb_service import AMDbService, PendingMutation
+
+DEFAULT_WORKERS = 4
+
+
+class CrawlStats:
+    """
+    A model class for the running totals of a crawl.
+    """
+
+    def __init__(self):
+        self.titles = 0
+        self.failed_titles = 0
+        self.skipped_titles = 0
+        self.entities = 0
+        self.requests = 0
+        self.people_lookups = 0
+        self.people_scraped = 0
+        self.dedup_ratio = 1.0
+        self.elapsed = 0.0
+
+    def entities_per_sec(self) -> float:
+        return self.entities / self.elapsed if self.elapsed else 0.0
+
+    def requests_per_sec(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return "CrawlStats(titles: {0}, failed: {1}, skipped: {2}, entities: {3} ({4:.2f}/sec), requests: {5} " \
+               "({6:.2f}/sec), people: {7} scraped for {8} credits (dedup ratio {9:.2f}), elapsed: {10:.1f}s)".format(
+                    self.titles, self.failed_titles, self.skipped_titles, self.entities, self.entities_per_sec(),
+                    self.requests, self.requests_per_sec(), self.people_scraped, self.people_lookups,
+                    self.dedup_ratio, self.elapsed)
+
+
+class ParsedTitle:
+    """
+    A model class for a title extracted from its pages, before anyone credited on it has been scraped.
+    """
+
+    def __init__(self, title: Title, relations: dict, person_ids: dict):
+        self.title = title
+        self.relations = relations
+        self.person_ids = person_ids
+
+
+class ScrapedTitle:
+    """
+    A model class for a title and everyone related to it, ready to be written to AMDb. Directors are (Person,
+    awards) tuples; writers, producers and cast are (Person, credit) tuples in credit order.
+    """
+
+    def __init__(self, title: Title, genres: list, directors: list, writers: list, producers: list, cast: list):
+        self.title = title
+        self.genres = genres
+        self.directors = directors
+        self.writers = writers
+        self.producers = producers
+        self.cast = cast
+
+
+class Crawler:
+    """
+    Crawls a batch of titles end to end: each title and its directors, writers, producers, genres, cast and the
+    directors' awards are scraped and written to AMDb. Titles are crawled concurrently by a pool of worker threads
+    that share one stateless scraper, and with it the scraper's pooled Fetcher, response cache and search index.
+    People are looked up by the IMDb name IDs linked from the title's pages through a PersonRegistry, so each person
+    is scraped once per run however many titles and roles they are credited with. With a Journal, titles completed
+    by an earlier run are skipped and every title is recorded in it once written.
+
+    Args:
+        scraper: The IMDbScraper shared by every worker.
+        amdb: The AMDbService every scraped entity is written to.
+        workers: The number of titles crawled at once.
+        registry: The PersonRegistry people are scraped through. One over 'scraper' is created if none is given.
+        journal: The Journal completed titles are recorded in, if any. It is usually shared with 'amdb'.
+    """
+    logger = logging.getLogger('Crawler')
+
+    def __init__(self, scraper: IMDbScraper, amdb: AMDbService, workers: int = DEFAULT_WORKERS,
+                 registry: PersonRegistry = None, journal: Journal = None):
+        self.scraper = scraper
+        self.amdb = amdb
+        self.workers = workers
+        self.registry = registry if registry is not None else PersonRegistry(scraper)
+        self.journal = journal
+        self.stats = CrawlStats()
+        self.__lock = threading.Lock()
+
+    def crawl(self, queries: list) -> CrawlStats:
+        """
+        Crawls every title in queries, logging progress as each title completes.
+
+        Args:
+            queries: The searched for titles.
+
+        Returns:
+            The CrawlStats of the whole batch.
+        """
+        start = time.perf_counter()
+        start_requests = self.scraper.fetcher.request_count
+        queries = self.__skip_completed(queries)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.crawl_title, query): query for query in queries}
+            for i, future in enumerate(as_completed(futures), start=1):
+                query = futures[future]
+                try:
+                    entities, seconds = future.result()
+                    self.logger.info(f"[{i}/{len(queries)}] {query}: {entities} entities in {seconds:.1f}s")
+                except Exception as e:
+                    with self.__lock:
+                        self.stats.failed_titles += 1
+                    self.logger.error(f"[{i}/{len(queries)}] {query}: failed: {e}", exc_info=True)
+        self.amdb.flush()
+        return self.__finish(start, start_requests)
+
+    def crawl_pipelined(self, queries: list, fetch_workers: int = None, parse_workers: int = 1,
+                        transform_workers: int = None, write_workers: int = 1, queue_size: int = DEFAULT_QUEUE_SIZE,
+                        report_interval: float = DEFAULT_REPORT_INTERVAL) -> CrawlStats:
+        """
+        Crawls every title in queries through a Pipeline of four stages, each with its own workers and a bounded
+        queue in front of it:
+
+            fetch: resolves the title and downloads its pages;
+            parse: extracts the title and its credits from the pages;
+            transform: scrapes everyone credited through the registry;
+            write: writes the title and everyone related to it to AMDb.
+
+        Scraping carries on while earlier titles are being written, until a slow AMDb backs the queues up.
+
+        Args:
+            queries: The searched for titles.
+            fetch_workers: The number of titles fetched at once. Defaults to the crawler's workers.
+            parse_workers: The number of titles parsed at once.
+            transform_workers: The number of titles whose people are scraped at once. Defaults to the crawler's
+                workers.
+            write_workers: The number of titles written to AMDb at once.
+            queue_size: The capacity of the queue in front of each stage.
+            report_interval: The number of seconds between queue depth and throughput reports.
+
+        Returns:
+            The CrawlStats of the whole batch.
+        """
+        start = time.perf_counter()
+        start_requests = self.scraper.fetcher.request_count
+        # Items are (query, value) tuples so the write stage knows which query it has completed.
+        pipeline = Pipeline([
+            Stage("fetch", self.__traced("fetch", lambda item: (item[0], self.fetch(item[1]))),
+                  fetch_workers or self.workers),
+            Stage("parse", self.__traced("parse", lambda item: (item[0], self.parse(item[1]))), parse_workers),
+            Stage("transform", self.__traced("transform", lambda item: (item[0], self.transform(item[1]))),
+                  transform_workers or self.workers),
+            Stage("write", self.__traced("write", lambda item: self.__write_title(*item)), write_workers),
+        ], queue_size=queue_size, report_interval=report_interval)
+        pipeline.run((query, query) for query in self.__skip_completed(queries))
+        self.amdb.flush()
+        self.stats.failed_titles += sum(s.failed for s in pipeline.stats)
+        return self.__finish(start, start_requests)
+
+    def crawl_title(self, query: str) -> (int, float):
+        """
+        Scrapes a title and everyone related to it and writes them all to AMDb.
+
+        Args:
+            query: The searched for title.
+
+        Returns:
+            The number of entities scraped and the number of seconds taken.
+        """
+        start = time.perf_counter()
+        with tracing.span("title", "title", entity=query):
+            entities = self.__write_title(query, self.transform(self.parse(self.fetch(query))))
+        return entities, time.perf_counter() - start
+
+    def fetch(self, query: str) -> TitleDocument:
+        """
+        Resolves a title and downloads its pages.
+        """
+        document = self.scraper.fetch_title(query)
+        for page in (document.main, document.full_credits):
+            page.content  # Reading the content downloads it.
+        return document
+
+    def parse(self, document: TitleDocument) -> ParsedTitle:
+        """
+        Extracts a title, its relations and the IMDb IDs of the people credited on it from its pages.
+        """
+        return ParsedTitle(extractor.get_title_contents(document), extractor.get_title_relation_contents(document),
+                           extractor.get_title_person_ids(document))
+
+    def transform(self, parsed: ParsedTitle) -> ScrapedTitle:
+        """
+        Scrapes everyone credited on a title, and the directors' awards. People who could not be scraped are left
+        out.
+        """
+        relations, ids = parsed.relations, parsed.person_ids
+        return ScrapedTitle(
+            title=parsed.title,
+            genres=relations["genres"],
+            directors=[s for s in (self.__scrape_person(d, ids, with_awards=True) for d in relations["directors"])
+                       if s is not None],
+            writers=self.__scrape_credits(relations["writers"], ids),
+            producers=self.__scrape_credits(relations["producers"], ids),
+            cast=self.__scrape_credits(relations["cast"], ids),
+        )
+
+    def write(self, scraped: ScrapedTitle) -> int:
+        """
+        Writes a scraped title and everyone related to it to AMDb.
+
+        Returns:
+            The number of entities written.
+        """
+        title = scraped.title
+        self.amdb.create_title(title)
+        entities = 1
+        entities += self.__ingest_directors(title, scraped.directors)
+        entities += self.__ingest_credits(title, scraped.writers, self.amdb.create_wrote_relation)
+        entities += self.__ingest_credits(title, scraped.producers, self.amdb.create_produced_relation)
+        for g in scraped.genres:
+            self.amdb.create_genre(g)
+            self.amdb.create_genre_relation(title=title, genre_name=g)
+        entities += self.__ingest_cast(title, scraped.cast)
+
+        with self.__lock:
+            self.stats.titles += 1
+            self.stats.entities += entities
+        return entities
+
+    def __write_title(self, query: str, scraped: ScrapedTitle) -> int:
+        entities = self.write(scraped)
+        if self.journal is not None:
+            self.journal.complete_title(query)
+        return entities
+
+    @staticmethod
+    def __traced(stage: str, function):
+        """
+        Wraps a pipeline stage's function so each item it handles is traced as a 'title' span. Stages run on their own
+        threads, so every stage of a title gets its own span.
+        """
+        def run(item):
+            with tracing.span("title", "title", entity=item[0], stage=stage):
+                return function(item)
+        return run
+
+    def __skip_completed(self, queries: list) -> list:
+        if self.journal is None:
+            return queries
+        remaining = [query for query in queries if not self.journal.is_title_completed(query)]
+        self.stats.skipped_titles += len(queries) - len(remaining)
+        if len(remaining) < len(queries):
+            self.logger.info(f"Skipping {len(queries) - len(remaining)} titles completed by an earlier run.")
+        return remaining
+
+    def __ingest_directors(self, title: Title, directors: list) -> int:
+        for director, director_relations in directors:
+            if self.__created(self.amdb.create_person(director)):
+                self.amdb.create_directed_relation(director, title)
+                for organisation, awards in director_relations.items():
+                    for award in awards:
+                        self.amdb.create_award(award.name, organisation)
+                        if award.outcome == "Winner":
+                            self.amdb.create_won_relation(director, award, organisation)
+                        elif award.outcome == "Nominee":
+                            self.amdb.create_nominated_relation(director, award, organisation)
+        return len(directors)
+
+    def __created(self, response) -> bool:
+        """
+        Checks whether a mutation succeeded. A queued PendingMutation is sent first, so relations are never queued
+        against a node whose creation failed.
+        """
+        if not isinstance(response, PendingMutation):
+            return response is not None
+        if not response.done:
+            self.amdb.flush()
+        return response.error is None
+
+    def __ingest_credits(self, title: Title, credits: list, create_relation) -> int:
+        for person, items in credits:
+            self.amdb.create_person(person=person)
+            create_relation(person=person, title=title, items=items)
+        return len(credits)
+
+    def __ingest_cast(self, title: Title, cast: list) -> int:
+        for billing, (person, chars) in enumerate(cast):
+            self.amdb.create_person(person=person)
+            self.amdb.create_acted_in_relation(person=person, title=title, characters=chars, billing=billing)
+        return len(cast)
+
+    def __scrape_credits(self, credits: dict, person_ids: dict) -> list:
+        """
+        Returns:
+            A (Person, credit) tuple for each name in credits that could be scraped, in order.
+        """
+        scraped = []
+        for name, credit in credits.items():
+            person = self.__scrape_person(name, person_ids)
+            if person is not None:
+                scraped.append((person[0], credit))
+        return scraped
+
+    def __finish(self, start: float, start_requests: int) -> CrawlStats:
+        self.stats.elapsed = time.perf_counter() - start
+        self.stats.requests = self.scraper.fetcher.request_count - start_requests
+        self.stats.people_lookups = self.registry.lookups
+        self.stats.people_scraped = self.registry.scraped
+        self.stats.dedup_ratio = self.registry.dedup_ratio()
+        self.logger.info(f"Crawl finished: {self.stats}")
+        return self.stats
+
+    def __scrape_person(self, name: str, person_ids: dict, with_awards: bool = False):
+        """
+        Gets a person, and their awards only if asked for so that the awards page is not fetched needlessly, from
+        the registry.
+
+        Returns:
+            A (Person, awards) tuple, where awards is None unless with_awards is set, or None if scraping failed.
+        """
+        try:
+            imdb_id = person_ids.get(name)
+            with tracing.span("person", "person", entity=name, imdb_id=imdb_id or ""):
+                person = self.registry.get(name, imdb_id)
+                return person, self.registry.get_awards(name, imdb_id) if with_awards else None
+        except Exception as e:
+            self.logger.error(f"Could not scrape person for {name}: {e}")
+            return None
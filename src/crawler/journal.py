@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+TITLE_COMPLETED = "title"
+MUTATION_PENDING = "pending"
+MUTATION_CONFIRMED = "confirmed"
+
+
+def get_mutation_key(operation_name: str, variables: dict) -> str:
+    """
+    Returns:
+        A stable key for a mutation: the SHA-1 of its operation name and its variables in canonical JSON, so the
+        same mutation gets the same key in every run.
+    """
+    canonical = json.dumps([operation_name, variables], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class Journal:
+    """
+    An append-only write-ahead journal of a crawl, so a crawl that dies part way through can be resumed without
+    scraping or writing anything twice. Every AMDb mutation is recorded as pending before it is sent and confirmed,
+    with its response, once it succeeds; every title is recorded once all of its mutations have been sent or
+    queued. Records are appended to a JSON Lines file and the whole file is read back on construction, ignoring a
+    final line cut short by a crash.
+
+    Args:
+        path: The path of the JSON Lines file backing the journal. The journal is kept in memory only if None.
+    """
+    logger = logging.getLogger('Journal')
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.__completed_titles = set()
+        self.__pending = {}
+        self.__confirmed = {}
+        self.__lock = threading.Lock()
+        self.__file = None
+        if path is not None and os.path.exists(path):
+            self.__load(path)
+            self.logger.info(f"Loaded {len(self.__completed_titles)} completed titles, {len(self.__confirmed)} "
+                             f"confirmed and {len(self.__pending)} pending mutations from {path}")
+        if path is not None:
+            self.__file = open(path, "a", encoding="utf-8")
+            if self.__file.tell() > 0 and not self.__ends_with_newline(path):
+                self.__file.write("\n")
+
+    def close(self):
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+
+    def is_title_completed(self, query: str) -> bool:
+        return query in self.__completed_titles
+
+    def complete_title(self, query: str):
+        """
+        Records that a title, and everything related to it, has been written.
+        """
+        with self.__lock:
+            self.__completed_titles.add(query)
+            self.__append({"type": TITLE_COMPLETED, "query": query})
+
+    def get_confirmed(self, key: str):
+        """
+        Args:
+            key: The key of a mutation, see 'get_mutation_key'.
+
+        Returns:
+            A (True, response) tuple if the mutation has been confirmed, else (False, None).
+        """
+        with self.__lock:
+            if key in self.__confirmed:
+                return True, self.__confirmed[key]
+            return False, None
+
+    def record_pending(self, key: str, operation_name: str, variables: dict):
+        """
+        Records a mutation that is about to be sent, unless it is already pending or confirmed.
+        """
+        with self.__lock:
+            if key in self.__pending or key in self.__confirmed:
+                return
+            self.__pending[key] = (operation_name, variables)
+            self.__append({"type": MUTATION_PENDING, "key": key, "operation": operation_name,
+                           "variables": variables})
+
+    def record_confirmed(self, key: str, response):
+        """
+        Records that a mutation succeeded, with its response.
+        """
+        with self.__lock:
+            self.__pending.pop(key, None)
+            self.__confirmed[key] = response
+            self.__append({"type": MUTATION_CONFIRMED, "key": key, "response": response})
+
+    def pending(self) -> list:
+        """
+        Returns:
+            A (key, operation_name, variables) tuple for every mutation recorded as pending but never confirmed, in
+            the order they were first recorded.
+        """
+        with self.__lock:
+            return [(key, operation_name, variables) for key, (operation_name, variables) in self.__pending.items()]
+
+    def __append(self, record: dict):
+        if self.__file is not None:
+            self.__file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            self.__file.flush()
+
+    @staticmethod
+    def __ends_with_newline(path: str) -> bool:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def __load(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.logger.warning(f"Skipping a truncated record in {path}")
+                    continue
+                if record["type"] == TITLE_COMPLETED:
+                    self.__completed_titles.add(record["query"])
+                elif record["type"] == MUTATION_PENDING and record["key"] not in self.__confirmed:
+                    self.__pending[record["key"]] = (record["operation"], record["variables"])
+                elif record["type"] == MUTATION_CONFIRMED:
+                    self.__pending.pop(record["key"], None)
+                    self.__confirmed[record["key"]] = record.get("response")
@@ -0,0 +1,99 @@
+from concurrent.futures import Future
+import logging
+import threading
+
+from src.model.person import Person
+from src.scraper import extractor
+from src.scraper.imdb_scraper import IMDbScraper
+
+
+class PersonRegistry:
+    """
+    Scrapes each person at most once per run. People are keyed by IMDb name ID so the same person credited as
+    director, writer and producer, or on many titles, is shared rather than scraped again. Concurrent requests for a
+    person wait for the one scrape already in flight. Failed scrapes are remembered too so they are not retried.
+
+    Args:
+        scraper: The IMDbScraper people are scraped with.
+
+    Attributes:
+        lookups: The number of times a person was asked for.
+        scraped: The number of distinct people actually scraped.
+    """
+    logger = logging.getLogger('PersonRegistry')
+
+    def __init__(self, scraper: IMDbScraper):
+        self.scraper = scraper
+        self.lookups = 0
+        self.scraped = 0
+        self.__people = {}
+        self.__awards = {}
+        self.__lock = threading.Lock()
+
+    def get(self, name: str, imdb_id: str = None) -> Person:
+        """
+        Returns the Person for an IMDb name ID, scraping them if this is the first request for that ID.
+
+        Args:
+            name: The person's name, searched for if imdb_id is not given.
+            imdb_id: The person's IMDb name ID e.g. 'nm0000288'.
+
+        Returns:
+            The scraped Person. Raises whatever the scrape raised if it failed.
+        """
+        imdb_id = imdb_id or self.__resolve_id(name)
+        return self.__once(self.__people, imdb_id, lambda: self.__scrape_person(imdb_id), count=True)
+
+    def get_awards(self, name: str, imdb_id: str = None) -> dict:
+        """
+        Returns a person's awards, scraping their awards page if this is the first request for them.
+
+        Args:
+            name: The person's name, searched for if imdb_id is not given.
+            imdb_id: The person's IMDb name ID e.g. 'nm0000288'.
+
+        Returns:
+            A dict of the person's awards as returned by 'extractor.get_person_relation_contents'.
+        """
+        imdb_id = imdb_id or self.__resolve_id(name)
+        return self.__once(self.__awards, imdb_id, lambda: extractor.get_person_relation_contents(
+            self.scraper.fetch_person_by_id(imdb_id)))
+
+    def dedup_ratio(self) -> float:
+        """
+        Returns:
+            The number of lookups per person actually scraped, 1.0 meaning no duplicates were avoided.
+        """
+        return self.lookups / self.scraped if self.scraped else 1.0
+
+    def __resolve_id(self, name: str) -> str:
+        url = self.scraper.resolve_first_result_url(name)
+        match = extractor.NAME_ID_PATTERN.search(url)
+        if match is None:
+            raise Exception(f"The first result for {name} is not an IMDb name page: {url}")
+        return match.group(1)
+
+    def __scrape_person(self, imdb_id: str) -> Person:
+        with self.__lock:
+            self.scraped += 1
+        return extractor.get_person_contents(self.scraper.fetch_person_by_id(imdb_id))
+
+    def __once(self, results: dict, imdb_id: str, scrape, count: bool = False):
+        """
+        Returns the result of 'scrape' for imdb_id, running it only for the first caller and making any concurrent
+        callers wait for that result.
+        """
+        with self.__lock:
+            if count:
+                self.lookups += 1
+            future = results.get(imdb_id)
+            owner = future is None
+            if owner:
+                future = Future()
+                results[imdb_id] = future
+        if owner:
+            try:
+                future.set_result(scrape())
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
@@ -0,0 +1,173 @@
+"""
+A staged producer/consumer pipeline. Each Stage runs its function on a pool of its own worker threads and hands its
+results to the next stage through a bounded queue, so a slow stage fills the queue in front of it and blocks the
+stages upstream of it rather than letting work pile up in memory.
+"""
+from queue import Queue
+import logging
+import threading
+import time
+
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_REPORT_INTERVAL = 10.0
+
+
+class _EndOfInput:
+    pass
+
+
+END_OF_INPUT = _EndOfInput()
+
+
+class Stage:
+    """
+    A step of a Pipeline.
+
+    Args:
+        name: The name of the stage, used in progress reports.
+        function: Called with each input item, returning the item passed on to the next stage.
+        workers: The number of threads running the function at once.
+    """
+
+    def __init__(self, name: str, function, workers: int = 1):
+        if workers < 1:
+            raise ValueError(f"Stage {name} needs at least one worker, not {workers}.")
+        self.name = name
+        self.function = function
+        self.workers = workers
+
+
+class StageStats:
+    """
+    A model class for the running totals of a stage.
+    """
+
+    def __init__(self, name: str, queue: Queue):
+        self.name = name
+        self.queue = queue
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.__lock = threading.Lock()
+
+    def record(self, seconds: float, failed: bool = False):
+        with self.__lock:
+            self.busy += seconds
+            if failed:
+                self.failed += 1
+            else:
+                self.processed += 1
+
+    def depth(self) -> int:
+        """
+        Returns:
+            The number of items waiting in the queue in front of the stage.
+        """
+        return self.queue.qsize()
+
+    def per_sec(self, elapsed: float) -> float:
+        return self.processed / elapsed if elapsed else 0.0
+
+    def __str__(self):
+        return "{0}: {1} done, {2} failed, queue {3}/{4}".format(
+            self.name, self.processed, self.failed, self.depth(), self.queue.maxsize)
+
+
+class Pipeline:
+    """
+    Runs items through a sequence of stages. An item that raises in a stage is logged, counted as failed and
+    dropped; the rest of the items carry on. While running, the depth of every queue and the throughput of every
+    stage are logged each report interval.
+
+    Args:
+        stages: The Stages, in order.
+        queue_size: The capacity of the queue in front of each stage.
+        report_interval: The number of seconds between progress reports. Reporting is off if None.
+        on_result: Called with each item leaving the last stage, from that stage's worker threads.
+    """
+    logger = logging.getLogger('Pipeline')
+
+    def __init__(self, stages: list, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 report_interval: float = DEFAULT_REPORT_INTERVAL, on_result=None):
+        if not stages:
+            raise ValueError("A Pipeline needs at least one stage.")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.report_interval = report_interval
+        self.on_result = on_result
+        self.stats = []
+        self.elapsed = 0.0
+        self.__start = None
+
+    def run(self, items) -> list:
+        """
+        Runs every item through every stage, blocking until all of them have left the pipeline.
+
+        Args:
+            items: An iterable of inputs to the first stage. It is consumed lazily, as the first queue has room.
+
+        Returns:
+            The StageStats of every stage, in order.
+        """
+        queues = [Queue(maxsize=self.queue_size) for _ in self.stages] + [None]
+        self.stats = [StageStats(stage.name, queue) for stage, queue in zip(self.stages, queues)]
+        self.__start = time.perf_counter()
+        threads = []
+        for i, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for w in range(stage.workers):
+                thread = threading.Thread(target=self.__work, name=f"{stage.name}-{w}", daemon=True,
+                                          args=(stage, self.stats[i], queues[i], queues[i + 1], remaining, lock))
+                thread.start()
+                threads.append(thread)
+
+        finished = threading.Event()
+        if self.report_interval:
+            threading.Thread(target=self.__report_until, args=(finished,), name="pipeline-report", daemon=True).start()
+        for item in items:
+            queues[0].put(item)
+        queues[0].put(END_OF_INPUT)
+        for thread in threads:
+            thread.join()
+        finished.set()
+        self.elapsed = time.perf_counter() - self.__start
+        self.logger.info(f"Pipeline finished in {self.elapsed:.1f}s: {self.report()}")
+        return self.stats
+
+    def report(self) -> str:
+        """
+        Returns:
+            A one line summary of the queue depth and throughput of every stage.
+        """
+        elapsed = time.perf_counter() - self.__start if self.__start is not None else 0.0
+        return " | ".join(f"{s} ({s.per_sec(elapsed):.2f}/sec)" for s in self.stats)
+
+    def __work(self, stage: Stage, stats: StageStats, inbox: Queue, outbox: Queue, remaining: list, lock):
+        while True:
+            item = inbox.get()
+            if item is END_OF_INPUT:
+                # Pass the marker on to this stage's other workers, and downstream once they have all stopped.
+                inbox.put(END_OF_INPUT)
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last and outbox is not None:
+                    outbox.put(END_OF_INPUT)
+                return
+            start = time.perf_counter()
+            try:
+                result = stage.function(item)
+            except Exception as e:
+                stats.record(time.perf_counter() - start, failed=True)
+                self.logger.error(f"{stage.name} failed for {item}: {e}", exc_info=True)
+                continue
+            stats.record(time.perf_counter() - start)
+            if outbox is not None:
+                outbox.put(result)
+            elif self.on_result is not None:
+                self.on_result(result)
+
+    def __report_until(self, finished: threading.Event):
+        while not finished.wait(self.report_interval):
+            self.logger.info(self.report())
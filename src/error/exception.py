@@ -1,2 +1,6 @@
 class ParseError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class FetchError(Exception):
+    pass
@@ -0,0 +1,158 @@
+import asyncio
+
+import httpx
+from gql import Client
+from gql.transport.exceptions import TransportQueryError
+from gql.transport.httpx import HTTPXAsyncTransport
+
+from src.gql_client.batch import BATCH_OPERATION_NAME, merge_operations, record_outcomes, split_results
+from src.gql_client.documents import DocumentRegistry
+from src.gql_client.schema import SchemaCache, get_schema_options
+from src.instrumentation import metrics, tracing
+
+DEFAULT_MAX_IN_FLIGHT = 10
+DEFAULT_TIMEOUT = 30
+
+
+class AsyncGQLClient:
+    """
+    An asyncio counterpart to GQLClient. Every request is sent over one pooled keep-alive 'httpx.AsyncClient' and
+    the number of requests in flight is bounded by a semaphore, so writes can run concurrently with scraping instead
+    of blocking it. The session is opened on first use, or explicitly with 'connect' or 'async with'.
+
+    Args:
+        gql_endpoint: The URI of the GraphQL endpoint the user needs to query.
+        max_in_flight: The maximum number of requests in flight at any one time.
+        documents: The DocumentRegistry operations are looked up in. Defaults to one of 'src/resources/graphql'.
+        timeout: The timeout in seconds of each request.
+        schema_path: The path of a local SDL or introspection JSON schema file to validate against.
+        schema_cache: A SchemaCache to read the schema from, and to store it in once it has been introspected.
+        validate: Whether operations are validated against the schema. If False the schema is never fetched.
+
+    Attributes:
+        transport: An HTTPXAsyncTransport object from the 'gql' library.
+        client: A Client object from the 'gql' library.
+        schema_cache: The SchemaCache the introspected schema is stored in, if any.
+        documents: The DocumentRegistry operations are looked up in.
+        session: The connected session requests are executed on, or None before the first request.
+    """
+
+    def __init__(self, gql_endpoint, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, documents: DocumentRegistry = None,
+                 timeout: int = DEFAULT_TIMEOUT, schema_path: str = None, schema_cache: SchemaCache = None,
+                 validate: bool = True):
+        self.transport = HTTPXAsyncTransport(
+            url=gql_endpoint,
+            headers={
+                "Content-type": "application/json",
+            },
+            verify=False,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight),
+        )
+        self.client = Client(transport=self.transport,
+                             **get_schema_options(gql_endpoint, schema_path, schema_cache, validate))
+        self.gql_endpoint = gql_endpoint
+        self.schema_cache = schema_cache if self.client.fetch_schema_from_transport else None
+        self.documents = documents if documents is not None else DocumentRegistry()
+        self.session = None
+        self.max_in_flight = max_in_flight
+        self.__semaphore = None
+        self.__connect_lock = None
+        self.__loop = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """
+        The semaphore bounding the requests in flight, created inside the running event loop.
+        """
+        self.__bind_loop()
+        return self.__semaphore
+
+    def __bind_loop(self):
+        # asyncio primitives are bound to the loop they are created in, so they are created inside the running loop,
+        # and again for each new loop, rather than in __init__.
+        loop = asyncio.get_running_loop()
+        if self.__loop is not loop:
+            self.__semaphore = asyncio.Semaphore(self.max_in_flight)
+            self.__connect_lock = asyncio.Lock()
+            self.__loop = loop
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def connect(self):
+        """
+        Opens the session and its pooled connection, if that has not been done already.
+        """
+        self.__bind_loop()
+        async with self.__connect_lock:
+            if self.session is None:
+                self.session = await self.client.connect_async()
+                self.__cache_schema()
+        return self.session
+
+    async def close(self):
+        """
+        Closes the session and its pooled connection.
+        """
+        if self.session is not None:
+            await self.client.close_async()
+            self.session = None
+
+    async def execute(self, operation_name: str, variables: dict):
+        """
+        A coroutine to execute a named GraphQL query or mutation.
+
+        Args:
+            operation_name: The name of the query/mutation e.g. 'CreatePerson'.
+            variables: A map of variable names and values to be inserted into the query.
+
+        Returns:
+            The response object of GraphQL command request.
+        """
+        command = self.documents.get(operation_name)
+        session = await self.connect()
+        try:
+            async with self.semaphore:
+                with metrics.timer("amdb_request_seconds", operation=operation_name), \
+                        tracing.span(operation_name, "mutation"):
+                    return await session.execute(command, variable_values=variables)
+        except Exception:
+            metrics.inc("amdb_mutation_errors_total", operation=operation_name)
+            raise
+        finally:
+            metrics.inc("amdb_mutations_total", operation=operation_name)
+
+    async def execute_batch(self, operations: list) -> list:
+        """
+        A coroutine to execute many named GraphQL mutations as a single aliased multi-mutation request.
+
+        Args:
+            operations: A list of (operation_name, variables) tuples, one per mutation.
+
+        Returns:
+            A list with, for each mutation in order, either its result or the Exception it failed with.
+        """
+        document, variables = merge_operations([(self.documents.get(name), v) for name, v in operations])
+        session = await self.connect()
+        try:
+            async with self.semaphore:
+                with metrics.timer("amdb_request_seconds", operation=BATCH_OPERATION_NAME), \
+                        tracing.span(BATCH_OPERATION_NAME, "mutation", mutations=len(operations)):
+                    data = await session.execute(document, variable_values=variables)
+            outcomes = split_results(len(operations), data, [])
+        except TransportQueryError as e:
+            outcomes = split_results(len(operations), e.data, e.errors)
+        except Exception as e:
+            outcomes = [e] * len(operations)
+        record_outcomes(operations, outcomes)
+        return outcomes
+
+    def __cache_schema(self):
+        if self.schema_cache is not None and self.client.introspection is not None:
+            self.schema_cache.store(self.gql_endpoint, self.client.introspection)
+            self.schema_cache = None
@@ -0,0 +1,124 @@
+"""
+Merges many GraphQL mutations into a single aliased multi-mutation document so they can be sent in one request.
+
+Each operation's top-level field is aliased 'm<i>' and each of its variables is renamed '$m<i>_<name>', so that
+
+    mutation CreateGenre($name: String!) { createGenre(name: $name) { name } }
+
+becomes, as the first operation of a batch,
+
+    mutation Batch($m0_name: String!) { m0: createGenre(name: $m0_name) { name } ... }
+
+Top-level mutation fields are executed serially in document order, so a relation queued after the people it joins
+still sees them.
+"""
+from graphql import DocumentNode, FieldNode, NameNode, OperationDefinitionNode, OperationType, SelectionSetNode, \
+    VariableNode, Visitor, visit
+
+from src.instrumentation import metrics
+
+BATCH_OPERATION_NAME = "Batch"
+
+
+class _VariableRenamer(Visitor):
+
+    def __init__(self, prefix: str):
+        super().__init__()
+        self.prefix = prefix
+
+    def enter_variable(self, node, *_):
+        return VariableNode(name=NameNode(value=self.prefix + node.name.value))
+
+
+def get_alias(index: int) -> str:
+    return f"m{index}"
+
+
+def merge_operations(operations: list) -> (DocumentNode, dict):
+    """
+    Merges single-field mutation documents into one aliased multi-mutation document.
+
+    Args:
+        operations: A list of (DocumentNode, variables) tuples. Each document must hold a single mutation with a
+            single top-level field.
+
+    Returns:
+        The merged DocumentNode and its merged variables. The result of the ith operation is found under the
+        'get_alias(i)' key of the response data.
+    """
+    variable_definitions, selections, merged_variables = [], [], {}
+    for i, (document, variables) in enumerate(operations):
+        operation = _get_single_operation(document)
+        prefix = get_alias(i) + "_"
+        renamed = visit(operation, _VariableRenamer(prefix))
+        field = renamed.selection_set.selections[0]
+        variable_definitions.extend(renamed.variable_definitions)
+        selections.append(FieldNode(alias=NameNode(value=get_alias(i)), name=field.name, arguments=field.arguments,
+                                    directives=field.directives, selection_set=field.selection_set))
+        merged_variables.update({prefix + name: value for name, value in (variables or {}).items()})
+
+    merged = OperationDefinitionNode(
+        operation=OperationType.MUTATION,
+        name=NameNode(value=BATCH_OPERATION_NAME),
+        variable_definitions=tuple(variable_definitions),
+        directives=(),
+        selection_set=SelectionSetNode(selections=tuple(selections)),
+    )
+    return DocumentNode(definitions=(merged,)), merged_variables
+
+
+def split_results(count: int, data: dict, errors: list) -> list:
+    """
+    Maps the response to a merged document back onto the operations it was built from.
+
+    Args:
+        count: The number of merged operations.
+        data: The response data, which may be partial or None if there were errors.
+        errors: The response errors, each a dict with the 'path' of the field it came from where known.
+
+    Returns:
+        A list with, for each operation in order, either its result or an Exception describing its error.
+    """
+    data = data or {}
+    errors_by_alias, unplaced_errors = {}, []
+    for error in errors or []:
+        path = error.get("path") if isinstance(error, dict) else None
+        if path:
+            errors_by_alias.setdefault(path[0], []).append(error)
+        else:
+            unplaced_errors.append(error)
+
+    results = []
+    for i in range(count):
+        alias_errors = errors_by_alias.get(get_alias(i))
+        if alias_errors:
+            results.append(Exception(alias_errors[0].get("message", alias_errors[0])))
+        elif get_alias(i) in data:
+            results.append(data[get_alias(i)])
+        else:
+            results.append(Exception(unplaced_errors[0] if unplaced_errors else "No result returned for mutation."))
+    return results
+
+
+def record_outcomes(operations: list, outcomes: list):
+    """
+    Counts each mutation of a batch, and each that failed, in the 'amdb_mutation*' metrics.
+
+    Args:
+        operations: The batch's (operation_name, variables) tuples.
+        outcomes: The result or Exception of each operation, see 'split_results'.
+    """
+    if not metrics.is_enabled():
+        return
+    for (operation_name, _), outcome in zip(operations, outcomes):
+        metrics.inc("amdb_mutations_total", operation=operation_name)
+        if isinstance(outcome, Exception):
+            metrics.inc("amdb_mutation_errors_total", operation=operation_name)
+
+
+def _get_single_operation(document: DocumentNode) -> OperationDefinitionNode:
+    operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+    if len(operations) != 1 or operations[0].operation != OperationType.MUTATION \
+            or len(operations[0].selection_set.selections) != 1:
+        raise ValueError("Only documents holding a single mutation with a single top-level field can be batched.")
+    return operations[0]
@@ -1,21 +1,39 @@
-from gql import gql, Client
+import threading
+
+from gql import Client
+from gql.transport.exceptions import TransportQueryError
 from gql.transport.requests import RequestsHTTPTransport
 
+from src.gql_client.batch import BATCH_OPERATION_NAME, merge_operations, record_outcomes, split_results
+from src.gql_client.documents import DocumentRegistry
+from src.gql_client.schema import SchemaCache, get_schema_options
+from src.instrumentation import metrics, tracing
+
 
 class GQLClient():
     """
-    A small wrapper class to make executing GraphQL queries and mutations from files easier.
+    A small wrapper class to make executing GraphQL queries and mutations from files easier. Operations are looked
+    up by name in a DocumentRegistry, which parses each file once. Executions are serialised with a lock as the
+    underlying transport cannot be shared by concurrent requests.
 
     Args:
         gql_endpoint: The URI of the GraphQL endpoint the user needs to query.
+        documents: The DocumentRegistry operations are looked up in. Defaults to one of 'src/resources/graphql'.
+        schema_path: The path of a local SDL or introspection JSON schema file to validate against.
+        schema_cache: A SchemaCache to read the schema from, and to store it in once it has been introspected.
+        validate: Whether operations are validated against the schema. If False the schema is never fetched.
     
     Attributes:
         transport: A RequestsHTTPTransport object from the 'gql' library.
         client: A Client object from the 'gql' library.
+        schema_cache: The SchemaCache the introspected schema is stored in, if any.
+        documents: The DocumentRegistry operations are looked up in.
+        lock: The lock serialising executions across threads.
 
     """
 
-    def __init__(self, gql_endpoint):
+    def __init__(self, gql_endpoint, documents: DocumentRegistry = None, schema_path: str = None,
+                 schema_cache: SchemaCache = None, validate: bool = True):
         self.transport = RequestsHTTPTransport(
             url=gql_endpoint,
             use_json=True,
@@ -25,19 +43,63 @@ class GQLClient():
             verify=False,
             retries=3,
         )
-        self.client = Client(transport=self.transport, fetch_schema_from_transport=True)
+        self.client = Client(transport=self.transport,
+                             **get_schema_options(gql_endpoint, schema_path, schema_cache, validate))
+        self.gql_endpoint = gql_endpoint
+        self.schema_cache = schema_cache if self.client.fetch_schema_from_transport else None
+        self.documents = documents if documents is not None else DocumentRegistry()
+        self.lock = threading.Lock()
 
-    def execute(self, filepath: str, variables: dict):
+    def execute(self, operation_name: str, variables: dict):
         """
-        A method to execute a GraphQL query or mutation from a file.
+        A method to execute a named GraphQL query or mutation.
 
         Args:
-            filepath: The path to where a query/mutation is saved.
+            operation_name: The name of the query/mutation e.g. 'CreatePerson'.
             variables: A map of variable names and values to be inserted into the query.
 
         Returns:
             The response object of GraphQL command request.
         """
-        file = open(filepath, "r")
-        command = gql(file.read().rstrip())
-        return self.client.execute(command, variable_values=variables)
\ No newline at end of file
+        command = self.documents.get(operation_name)
+        try:
+            with self.lock, metrics.timer("amdb_request_seconds", operation=operation_name), \
+                    tracing.span(operation_name, "mutation"):
+                result = self.client.execute(command, variable_values=variables)
+                self.__cache_schema()
+        except Exception:
+            metrics.inc("amdb_mutation_errors_total", operation=operation_name)
+            raise
+        finally:
+            metrics.inc("amdb_mutations_total", operation=operation_name)
+        return result
+
+    def execute_batch(self, operations: list) -> list:
+        """
+        A method to execute many named GraphQL mutations as a single aliased multi-mutation request.
+
+        Args:
+            operations: A list of (operation_name, variables) tuples, one per mutation.
+
+        Returns:
+            A list with, for each mutation in order, either its result or the Exception it failed with.
+        """
+        documents = [(self.documents.get(name), variables) for name, variables in operations]
+        document, variables = merge_operations(documents)
+        try:
+            with self.lock, metrics.timer("amdb_request_seconds", operation=BATCH_OPERATION_NAME), \
+                    tracing.span(BATCH_OPERATION_NAME, "mutation", mutations=len(operations)):
+                data = self.client.execute(document, variable_values=variables)
+                self.__cache_schema()
+            outcomes = split_results(len(operations), data, [])
+        except TransportQueryError as e:
+            outcomes = split_results(len(operations), e.data, e.errors)
+        except Exception as e:
+            outcomes = [e] * len(operations)
+        record_outcomes(operations, outcomes)
+        return outcomes
+
+    def __cache_schema(self):
+        if self.schema_cache is not None and self.client.introspection is not None:
+            self.schema_cache.store(self.gql_endpoint, self.client.introspection)
+            self.schema_cache = None
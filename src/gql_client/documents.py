@@ -0,0 +1,84 @@
+import logging
+import os
+import threading
+
+from graphql import DocumentNode, OperationDefinitionNode, parse
+
+DEFAULT_DOCUMENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "resources", "graphql")
+DOCUMENT_EXTENSION = ".graphql"
+
+
+class DocumentRegistry:
+    """
+    Holds every GraphQL document in a directory, parsed once and looked up by operation name, so executing an
+    operation needs no file reads or re-parsing.
+
+    Args:
+        path: The directory of '.graphql' files to load.
+        preload: Whether to load every document now rather than on the first lookup.
+
+    Attributes:
+        path: The directory documents are loaded from.
+    """
+    logger = logging.getLogger('DocumentRegistry')
+
+    def __init__(self, path: str = DEFAULT_DOCUMENTS_PATH, preload: bool = True):
+        self.path = path
+        self.__documents = None
+        self.__lock = threading.Lock()
+        if preload:
+            self.load()
+
+    def load(self) -> dict:
+        """
+        Loads and parses every document in path, if that has not been done already.
+
+        Returns:
+            A map of operation name to parsed DocumentNode.
+
+        Raises:
+            ValueError: If two documents define the same operation name.
+        """
+        if self.__documents is not None:
+            return self.__documents
+        with self.__lock:
+            if self.__documents is None:
+                documents = {}
+                for filename in sorted(os.listdir(self.path)):
+                    if not filename.endswith(DOCUMENT_EXTENSION):
+                        continue
+                    with open(os.path.join(self.path, filename), "r", encoding="utf-8") as file:
+                        document = parse(file.read().rstrip())
+                    for name in self.__get_operation_names(document):
+                        if name in documents:
+                            raise ValueError(f"Operation {name} is defined more than once in {self.path}.")
+                        documents[name] = document
+                self.logger.info(f"Loaded {len(documents)} GraphQL operations from {self.path}.")
+                self.__documents = documents
+        return self.__documents
+
+    def get(self, operation_name: str) -> DocumentNode:
+        """
+        Args:
+            operation_name: The name of an operation e.g. 'CreatePerson'.
+
+        Returns:
+            The parsed document defining the operation.
+
+        Raises:
+            KeyError: If no loaded document defines the operation.
+        """
+        try:
+            return self.load()[operation_name]
+        except KeyError:
+            raise KeyError(f"No GraphQL operation named {operation_name} in {self.path}.") from None
+
+    def names(self) -> list:
+        return sorted(self.load())
+
+    def __contains__(self, operation_name: str) -> bool:
+        return operation_name in self.load()
+
+    @staticmethod
+    def __get_operation_names(document: DocumentNode) -> list:
+        return [d.name.value for d in document.definitions if isinstance(d, OperationDefinitionNode) and d.name]
@@ -0,0 +1,103 @@
+"""
+Ways for a GQLClient to get the AMDb schema without an introspection round trip on start up:
+
+    - a local schema file, either SDL ('.graphql'/'.graphqls') or an introspection result ('.json');
+    - a SchemaCache, an on-disk copy of a previously fetched introspection result, tagged with the endpoint and a
+      schema version so a stale copy is ignored;
+    - no schema at all, skipping client side validation.
+
+'get_schema_options' turns a choice of these into the keyword arguments of a 'gql.Client'.
+"""
+import json
+import logging
+import os
+
+SDL_EXTENSIONS = (".graphql", ".graphqls")
+
+
+def load_schema(path: str) -> dict:
+    """
+    Loads a schema file.
+
+    Args:
+        path: The path of an SDL file or of an introspection result in JSON, either bare or wrapped in 'data'.
+
+    Returns:
+        The 'gql.Client' keyword argument holding it, either 'schema' or 'introspection'.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(SDL_EXTENSIONS):
+            return {"schema": f.read()}
+        introspection = json.load(f)
+    return {"introspection": introspection.get("data", introspection)}
+
+
+class SchemaCache:
+    """
+    An on-disk copy of an introspected schema. An entry is only used if it was fetched from the same endpoint and
+    is tagged with the same version, so bumping the version forces the schema to be fetched again.
+
+    Args:
+        path: The path of the JSON cache file.
+        version: The expected schema version e.g. the AMDb release. Entries with any other version are ignored.
+    """
+    logger = logging.getLogger('SchemaCache')
+
+    def __init__(self, path: str, version: str = None):
+        self.path = path
+        self.version = version
+
+    def load(self, endpoint: str) -> dict:
+        """
+        Args:
+            endpoint: The URI of the GraphQL endpoint the schema belongs to.
+
+        Returns:
+            The cached introspection result, or None if there is none for this endpoint and version.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("endpoint") != endpoint or entry.get("version") != self.version:
+            self.logger.info(f"Ignoring cached schema for {entry.get('endpoint')} version {entry.get('version')}.")
+            return None
+        return entry.get("introspection")
+
+    def store(self, endpoint: str, introspection: dict):
+        """
+        Writes an introspection result to the cache, replacing any previous entry.
+
+        Args:
+            endpoint: The URI of the GraphQL endpoint the schema belongs to.
+            introspection: The introspection result.
+        """
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"endpoint": endpoint, "version": self.version, "introspection": introspection}, f)
+        os.replace(tmp_path, self.path)
+        self.logger.info(f"Cached schema for {endpoint} version {self.version} at {self.path}.")
+
+
+def get_schema_options(endpoint: str, schema_path: str = None, schema_cache: SchemaCache = None,
+                       validate: bool = True) -> dict:
+    """
+    Args:
+        endpoint: The URI of the GraphQL endpoint.
+        schema_path: The path of a local schema file, see 'load_schema'.
+        schema_cache: A SchemaCache to read the schema from.
+        validate: Whether documents are validated against the schema before they are sent.
+
+    Returns:
+        The schema related keyword arguments of a 'gql.Client'. The schema is only fetched from the transport if
+        validating and neither a schema file nor a cached schema is available.
+    """
+    if not validate:
+        return {"fetch_schema_from_transport": False}
+    if schema_path:
+        return dict(load_schema(schema_path), fetch_schema_from_transport=False)
+    introspection = schema_cache.load(endpoint) if schema_cache is not None else None
+    if introspection is not None:
+        return {"introspection": introspection, "fetch_schema_from_transport": False}
+    return {"fetch_schema_from_transport": True}
@@ -0,0 +1,336 @@
+"""
+Counters and latency histograms for the scraper and the AMDb client, exposed in the Prometheus text format and as an
+end-of-run summary.
+
+Metrics are off until 'enable' is called. While off, every recording function returns after a single flag check and
+'timer' hands back a shared no-op context manager, so instrumented hot paths cost next to nothing.
+
+    from src.instrumentation import metrics
+
+    with metrics.timer("imdb_parse_seconds", parser="lxml"):
+        ...
+    metrics.inc("imdb_requests_total", status=200)
+"""
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import bisect
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+# Every metric recorded anywhere, with its type and help text.
+DEFINITIONS = {
+    "imdb_requests_total": (COUNTER, "IMDb requests sent, by response status."),
+    "imdb_response_bytes_total": (COUNTER, "Bytes of IMDb response bodies received."),
+    "imdb_request_seconds": (HISTOGRAM, "Latency of IMDb requests."),
+    "imdb_cache_lookups_total": (COUNTER, "Response cache lookups by result: hit, miss, stale or revalidated."),
+    "imdb_parse_seconds": (HISTOGRAM, "Time spent parsing IMDb pages into soup objects, by parser."),
+    "imdb_parsed_bytes_total": (COUNTER, "Bytes of IMDb HTML parsed, by parser."),
+    "imdb_extractor_seconds": (HISTOGRAM, "Time spent in each extractor function."),
+    "amdb_mutations_total": (COUNTER, "AMDb mutations sent, by operation."),
+    "amdb_mutation_errors_total": (COUNTER, "AMDb mutations that failed, by operation."),
+    "amdb_request_seconds": (HISTOGRAM, "Latency of AMDb GraphQL requests, by operation."),
+}
+
+
+class Counter:
+    """
+    A monotonically increasing count per combination of label values.
+    """
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.values = {}
+        self.__lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, labels: tuple = ()):
+        with self.__lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def snapshot(self) -> list:
+        """
+        Returns:
+            A sorted list of (labels, value) tuples, copied under the lock so recording can carry on meanwhile.
+        """
+        with self.__lock:
+            return sorted(self.values.items())
+
+    def render(self) -> list:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in self.snapshot()]
+
+    def summarise(self) -> list:
+        return [f"{self.name}{_format_labels(labels)}: {_format_value(value)}" for labels, value in self.snapshot()]
+
+
+class Histogram:
+    """
+    A distribution of observed values per combination of label values, counted into cumulative buckets.
+    """
+
+    def __init__(self, name: str, help_text: str, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.values = {}
+        self.__lock = threading.Lock()
+
+    def observe(self, value: float, labels: tuple = ()):
+        with self.__lock:
+            counts, total = self.values.get(labels, (None, None))
+            if counts is None:
+                counts, total = [0] * (len(self.buckets) + 1), [0.0]
+                self.values[labels] = counts, total
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def snapshot(self) -> list:
+        """
+        Returns:
+            A sorted list of (labels, bucket counts, sum) tuples, copied under the lock so no histogram is read half
+            updated.
+        """
+        with self.__lock:
+            return sorted((labels, list(counts), total[0]) for labels, (counts, total) in self.values.items())
+
+    def quantile(self, q: float, labels: tuple = ()) -> float:
+        """
+        Returns:
+            The upper bound of the bucket the q-th quantile falls in, or None if nothing has been observed.
+        """
+        with self.__lock:
+            counts, _ = self.values.get(labels, (None, None))
+            counts = list(counts) if counts else None
+        return self.__quantile(q, counts)
+
+    def __quantile(self, q: float, counts: list) -> float:
+        if not counts or not sum(counts):
+            return None
+        rank, seen = q * sum(counts), 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+    def render(self) -> list:
+        lines = []
+        for labels, counts, total in self.snapshot():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+    def summarise(self) -> list:
+        lines = []
+        for labels, counts, total in self.snapshot():
+            count = sum(counts)
+            lines.append(f"{self.name}{_format_labels(labels)}: {count} in {total:.3f}s, "
+                         f"mean {total / count * 1000:.1f}ms, p50 <= {_format_bound(self.__quantile(0.5, counts))}, "
+                         f"p95 <= {_format_bound(self.__quantile(0.95, counts))}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds every metric, created on first use from DEFINITIONS.
+
+    Attributes:
+        enabled: Whether metrics are recorded at all.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.__metrics = {}
+        self.__lock = threading.Lock()
+
+    def get(self, name: str):
+        metric = self.__metrics.get(name)
+        if metric is None:
+            with self.__lock:
+                metric = self.__metrics.get(name)
+                if metric is None:
+                    kind, help_text = DEFINITIONS.get(name, (COUNTER, ""))
+                    metric = Histogram(name, help_text) if kind == HISTOGRAM else Counter(name, help_text)
+                    self.__metrics[name] = metric
+        return metric
+
+    def reset(self):
+        with self.__lock:
+            self.__metrics = {}
+
+    def render(self) -> str:
+        """
+        Returns:
+            Every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        for name, metric in self.__snapshot():
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {HISTOGRAM if isinstance(metric, Histogram) else COUNTER}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def summary(self) -> str:
+        """
+        Returns:
+            A human readable line per metric and label combination, for printing at the end of a run.
+        """
+        return "\n".join(line for _, metric in self.__snapshot() for line in metric.summarise())
+
+    def __snapshot(self) -> list:
+        with self.__lock:
+            return sorted(self.__metrics.items())
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Timer:
+
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: tuple):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        REGISTRY.get(self.name).observe(time.perf_counter() - self.start, self.labels)
+
+
+class _NullTimer:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def enable():
+    REGISTRY.enabled = True
+
+
+def disable():
+    REGISTRY.enabled = False
+
+
+def is_enabled() -> bool:
+    return REGISTRY.enabled
+
+
+def inc(name: str, amount: float = 1.0, **labels):
+    """
+    Adds amount to a counter, if metrics are enabled.
+    """
+    if REGISTRY.enabled:
+        REGISTRY.get(name).inc(amount, _to_key(labels))
+
+
+def observe(name: str, value: float, **labels):
+    """
+    Records a value in a histogram, if metrics are enabled.
+    """
+    if REGISTRY.enabled:
+        REGISTRY.get(name).observe(value, _to_key(labels))
+
+
+def timer(name: str, **labels):
+    """
+    Returns:
+        A context manager recording how long its block takes in a histogram, or a no-op one if metrics are disabled.
+    """
+    if REGISTRY.enabled:
+        return _Timer(name, _to_key(labels))
+    return _NULL_TIMER
+
+
+def timed(name: str, label: str):
+    """
+    A decorator recording how long each call of a function takes in a histogram, labelled with the function's name.
+
+    Args:
+        name: The histogram's name.
+        label: The name of the label the function's name is recorded under.
+    """
+    def decorator(function):
+        labels = ((label, function.__name__),)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                REGISTRY.get(name).observe(time.perf_counter() - start, labels)
+        return wrapper
+    return decorator
+
+
+def write_prometheus(path: str):
+    """
+    Writes every metric in the Prometheus text format e.g. for the node exporter's textfile collector.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(REGISTRY.render())
+
+
+def start_http_server(port: int, host: str = "") -> ThreadingHTTPServer:
+    """
+    Serves every metric in the Prometheus text format at '/metrics' from a background thread.
+
+    Returns:
+        The server, to be shut down with 'shutdown()'.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = REGISTRY.render().encode("utf-8")
+            self.send_response(200 if self.path.startswith("/metrics") else 404)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def _to_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items())) if labels else ()
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_bound(bound: float) -> str:
+    if bound is None:
+        return "-"
+    return "+Inf" if bound == float("inf") else f"{bound * 1000:g}ms"
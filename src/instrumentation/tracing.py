@@ -0,0 +1,318 @@
+"""
+Nested timing spans for finding out where a slow crawl spends its time. A span is opened around each unit of work,
+title, person, page fetch, parse, extractor and AMDb mutation, and becomes the parent of every span opened inside it,
+so a finished trace shows each title broken down into the pages, extractors and mutations it took.
+
+    from src.instrumentation import tracing
+
+    with tracing.span("title", "title", entity="The Dark Knight"):
+        ...
+
+The current span is held in a context variable, so spans nest across function calls and asyncio tasks; a span opened
+on a worker thread starts a new trace. Tracing is off until 'enable' is called, e.g. by 'src/main.py' when '--trace' or
+the IMDB_SCRAPER_TRACE environment variable is set, and while off 'span' hands back a shared no-op context manager.
+
+Traces are written in the Chrome trace event format, viewable in 'chrome://tracing' or Perfetto, or as OTLP JSON for
+OpenTelemetry tooling. One entity can also be run under cProfile, to see which functions its spans spend their time in.
+cProfile is deterministic, it hooks every function call rather than sampling, so the profiled entity runs slower than
+the rest of the crawl and its span durations are inflated.
+
+At most 'max_spans' finished spans are kept, later ones are counted as dropped, so tracing a long crawl cannot grow
+without bound. Tracing enabled only to profile an entity keeps no spans at all.
+"""
+import contextvars
+import cProfile
+from functools import wraps
+import json
+import logging
+import os
+import threading
+import time
+
+TRACE_ENV = "IMDB_SCRAPER_TRACE"
+OTLP_SUFFIX = ".otlp.json"
+SERVICE_NAME = "imdb-scraper"
+DEFAULT_MAX_SPANS = 1000000
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """
+    A model class for a single timed unit of work.
+
+    Attributes:
+        name: What the span times e.g. 'title' or 'get_title_cast'.
+        category: The kind of work e.g. 'fetch' or 'extractor'.
+        attributes: Details of the work e.g. the URL fetched.
+        trace_id: The hex ID shared by every span under the same root span.
+        span_id: The hex ID of the span.
+        parent_id: The span ID of the enclosing span, or None for a root span.
+        start: The start time in nanoseconds since the epoch.
+        end: The end time in nanoseconds since the epoch, or None while the span is open.
+        thread_id: The ID of the thread the span was opened on.
+        error: The exception the span's work failed with, if any.
+    """
+
+    __slots__ = ("name", "category", "attributes", "trace_id", "span_id", "parent_id", "start", "end", "thread_id",
+                 "error")
+
+    def __init__(self, name: str, category: str, attributes: dict, parent=None):
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = None
+        self.end = None
+        self.thread_id = threading.get_ident()
+        self.error = None
+
+    def duration(self) -> float:
+        """
+        Returns:
+            The number of seconds the span was open for.
+        """
+        return (self.end - self.start) / 1e9
+
+    def to_chrome_event(self, pid: int) -> dict:
+        args = dict(self.attributes, trace_id=self.trace_id, span_id=self.span_id)
+        if self.parent_id is not None:
+            args["parent_id"] = self.parent_id
+        if self.error is not None:
+            args["error"] = repr(self.error)
+        return {"name": self.name, "cat": self.category, "ph": "X", "ts": self.start / 1000,
+                "dur": (self.end - self.start) / 1000, "pid": pid, "tid": self.thread_id, "args": args}
+
+    def to_otlp_span(self) -> dict:
+        attributes = dict(self.attributes, category=self.category)
+        otlp = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": [{"key": k, "value": _to_otlp_value(v)} for k, v in attributes.items()],
+            "status": {"code": 2, "message": repr(self.error)} if self.error is not None else {"code": 1},
+        }
+        if self.parent_id is not None:
+            otlp["parentSpanId"] = self.parent_id
+        return otlp
+
+
+class Tracer:
+    """
+    Collects finished spans and runs the profiled entity, if any, under cProfile.
+
+    Args:
+        max_spans: The most finished spans kept.
+
+    Attributes:
+        enabled: Whether spans are recorded at all.
+        keep_spans: Whether finished spans are kept to be written out, rather than only timed for profiling.
+        spans: The first 'max_spans' finished spans, in the order they finished.
+        dropped: The number of finished spans not kept because 'max_spans' were already held.
+        profile_entity: The 'entity' attribute of the span to profile, see 'profile'.
+        profile_path: The path the profile's stats are written to.
+        profiled: Whether the profiled entity has been profiled yet. Only its first span is.
+    """
+    logger = logging.getLogger('Tracer')
+
+    def __init__(self, max_spans: int = DEFAULT_MAX_SPANS):
+        self.enabled = False
+        self.keep_spans = True
+        self.max_spans = max_spans
+        self.spans = []
+        self.dropped = 0
+        self.profile_entity = None
+        self.profile_path = None
+        self.profiled = False
+        self.__epoch_offset = time.time_ns() - time.perf_counter_ns()
+        self.__profiler = None
+        self.__lock = threading.Lock()
+
+    def now(self) -> int:
+        return time.perf_counter_ns() + self.__epoch_offset
+
+    def finish(self, span: Span):
+        if not self.keep_spans:
+            return
+        with self.__lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+                return
+            self.dropped += 1
+            if self.dropped == 1:
+                self.logger.warning(f"Holding {self.max_spans} spans already, dropping any more")
+
+    def start_profile(self, span: Span) -> bool:
+        """
+        Starts profiling the current thread if the span belongs to the profiled entity and nothing is profiled yet.
+
+        Returns:
+            Whether profiling was started.
+        """
+        if span.attributes.get("entity") != self.profile_entity:
+            return False
+        with self.__lock:
+            if self.profiled:
+                return False
+            self.profiled = True
+            self.__profiler = cProfile.Profile()
+        self.__profiler.enable()
+        return True
+
+    def stop_profile(self):
+        self.__profiler.disable()
+        self.__profiler.dump_stats(self.profile_path)
+        self.logger.info(f"Wrote the profile of {self.profile_entity} to {self.profile_path}")
+
+    def reset(self):
+        with self.__lock:
+            self.spans = []
+            self.dropped = 0
+            self.profiled = False
+
+
+TRACER = Tracer()
+
+
+class _SpanContext:
+
+    __slots__ = ("span", "token", "profiling")
+
+    def __init__(self, name: str, category: str, attributes: dict):
+        self.span = Span(name, category, attributes, _current_span.get())
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        self.profiling = TRACER.profile_entity is not None and TRACER.start_profile(self.span)
+        self.span.start = TRACER.now()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.end = TRACER.now()
+        self.span.error = exc
+        if self.profiling:
+            TRACER.stop_profile()
+        _current_span.reset(self.token)
+        TRACER.finish(self.span)
+
+
+class _NullSpanContext:
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NULL_SPAN = _NullSpanContext()
+
+
+def enable(keep_spans: bool = True):
+    """
+    Args:
+        keep_spans: Whether to keep finished spans to be written out. Pass False to only 'profile' an entity.
+    """
+    TRACER.enabled = True
+    TRACER.keep_spans = keep_spans
+
+
+def disable():
+    TRACER.enabled = False
+
+
+def is_enabled() -> bool:
+    return TRACER.enabled
+
+
+def profile(entity: str, path: str):
+    """
+    Runs the first span whose 'entity' attribute is entity, e.g. a title query or a person's name, and everything
+    inside it under cProfile, writing the stats to path for 'pstats'. Only the span's own thread is profiled. Tracing
+    must be enabled. cProfile times every call deterministically, so the entity's own spans run slower than usual.
+    """
+    TRACER.profile_entity = entity
+    TRACER.profile_path = path
+
+
+def span(name: str, category: str, **attributes):
+    """
+    Returns:
+        A context manager timing its block as a child span of the current span, or a no-op one if tracing is
+        disabled.
+    """
+    if TRACER.enabled:
+        return _SpanContext(name, category, attributes)
+    return _NULL_SPAN
+
+
+def traced(category: str):
+    """
+    A decorator tracing each call of a function as a span named after the function.
+    """
+    def decorator(function):
+        name = function.__name__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return function(*args, **kwargs)
+            with _SpanContext(name, category, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span() -> Span:
+    """
+    Returns:
+        The innermost open span, or None if there is none.
+    """
+    return _current_span.get()
+
+
+def write_chrome_trace(path: str):
+    """
+    Writes every finished span in the Chrome trace event format.
+    """
+    pid = os.getpid()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": [s.to_chrome_event(pid) for s in TRACER.spans], "displayTimeUnit": "ms"}, f)
+
+
+def write_otlp_json(path: str):
+    """
+    Writes every finished span as an OTLP JSON 'ExportTraceServiceRequest', as accepted by OpenTelemetry collectors.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": [s.to_otlp_span() for s in TRACER.spans]}],
+        }]}, f)
+
+
+def write_trace(path: str):
+    """
+    Writes every finished span as OTLP JSON if path ends in '.otlp.json', otherwise as a Chrome trace.
+    """
+    if TRACER.dropped:
+        TRACER.logger.warning(f"{TRACER.dropped} spans past the first {TRACER.max_spans} are missing from {path}")
+    if path.endswith(OTLP_SUFFIX):
+        write_otlp_json(path)
+    else:
+        write_chrome_trace(path)
+
+
+def _to_otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
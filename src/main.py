@@ -1,83 +1,181 @@
+import argparse
+import os
+import pstats
+import sys
+
+from src.crawler.crawler import Crawler, DEFAULT_WORKERS
+from src.crawler.journal import Journal
+from src.crawler.pipeline import DEFAULT_QUEUE_SIZE
 from src.gql_client.client import GQLClient
-from src.scraper.imdb_scraper import IMDbScraper
+from src.gql_client.schema import SchemaCache
+from src.instrumentation import metrics, tracing
+from src.scraper.cache import ResponseCache
+from src.scraper.fetcher import Fetcher
+from src.scraper.imdb_scraper import BASE_URL, IMDbScraper
+from src.scraper.parser import DEFAULT_PARSER
+from src.scraper.rate_limiter import RateLimiter
+from src.scraper.search_index import SearchIndex
 from src.services.amdb_service import AMDbService
+from src.services.bulk_loader import BulkLoader, DEFAULT_BATCH_SIZE
+from src.services.export_service import PARQUET_EXTENSION, ExportService, open_writer
 
 
-if __name__ == '__main__':
-    scraper = IMDbScraper()
-    client = GQLClient("http://localhost:8080/graphql")
-    amdb = AMDbService(client)
-
-    scraper.load_title_page("the dark knight")
-    title = scraper.get_title_contents()
-
-    amdb.create_title(title)
-
-    title_relations = scraper.get_title_relation_contents()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape IMDb titles and everyone credited on them into AMDb.")
+    parser.add_argument("titles", nargs="?", default="-",
+                        help="A file of titles to crawl, one per line, or '-' to read them from stdin.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="The number of titles crawled at once.")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Crawl through a staged pipeline so scraping overlaps with writing to AMDb.")
+    parser.add_argument("--fetch-workers", type=int,
+                        help="The number of titles fetched at once when crawling through a pipeline. Defaults to "
+                             "'--workers'.")
+    parser.add_argument("--parse-workers", type=int, default=1,
+                        help="The number of titles parsed at once when crawling through a pipeline.")
+    parser.add_argument("--transform-workers", type=int,
+                        help="The number of titles whose people are scraped at once when crawling through a pipeline. "
+                             "Defaults to '--workers'.")
+    parser.add_argument("--write-workers", type=int, default=1,
+                        help="The number of titles written to AMDb at once when crawling through a pipeline.")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="The capacity of the queue in front of each pipeline stage.")
+    parser.add_argument("--journal", help="The path of a write-ahead journal to resume an interrupted crawl from.")
+    parser.add_argument("--export", help="Export everything scraped to a JSON Lines ('.jsonl', '.jsonl.gz') file or "
+                                             "a '.parquet' directory instead of writing it to AMDb.")
+    parser.add_argument("--load", metavar="EXPORT",
+                        help="Bulk load an export into AMDb instead of crawling. Batches default to "
+                             f"{DEFAULT_BATCH_SIZE} mutations.")
+    parser.add_argument("--endpoint", default="http://localhost:8080/graphql", help="The AMDb GraphQL endpoint.")
+    parser.add_argument("--cache", help="The path of an on-disk HTTP response cache to use.")
+    parser.add_argument("--search-index", help="The path of a persistent search result index to use.")
+    parser.add_argument("--preload", help="A CSV/TSV of query to IMDb ID to preload into the search index.")
+    parser.add_argument("--schema", help="A local AMDb schema, as SDL or introspection JSON, to validate against.")
+    parser.add_argument("--schema-cache", help="The path of an on-disk copy of the introspected AMDb schema.")
+    parser.add_argument("--schema-version", help="The AMDb schema version a cached schema must have to be used.")
+    parser.add_argument("--no-validate", dest="validate", action="store_false",
+                        help="Send mutations without validating them, so the schema is never fetched.")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="The number of AMDb mutations sent per request. Batching is off if 1 or less.")
+    parser.add_argument("--rate-limit", type=float,
+                        help="Pace IMDb requests to at most this many per second, adapting concurrency to how IMDb "
+                             "responds.")
+    parser.add_argument("--parser", default=DEFAULT_PARSER, help="The HTML parser backend e.g. 'lxml'.")
+    parser.add_argument("--imdb-url", default=BASE_URL,
+                        help="The scheme and host IMDb pages are requested from e.g. a local replay server's.")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="Record fetch, parse and mutation metrics, print a summary at the end and write them to "
+                             "PATH in the Prometheus text format.")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Record metrics and serve them in the Prometheus text format at ':PORT/metrics'.")
+    parser.add_argument("--trace", metavar="PATH", default=os.environ.get(tracing.TRACE_ENV),
+                        help="Trace every title, person, fetch, parse, extractor and mutation and write the spans to "
+                             f"PATH, as OTLP JSON if it ends in '{tracing.OTLP_SUFFIX}' or else as a Chrome trace. "
+                             f"Defaults to ${tracing.TRACE_ENV}.")
+    parser.add_argument("--profile", metavar="ENTITY",
+                        help="Run the title query or person name ENTITY under cProfile, Python's deterministic "
+                             "profiler, and print where it spent its time. Every call is hooked so ENTITY runs slower "
+                             "than the rest of the crawl.")
+    parser.add_argument("--profile-output", default="crawl.prof",
+                        help="The path the '--profile' stats are written to, for 'pstats' or snakeviz.")
+    args = parser.parse_args(argv)
+    if args.export and args.journal and args.export.endswith(PARQUET_EXTENSION):
+        parser.error("--journal cannot resume a Parquet --export, export to JSON Lines instead.")
+    return args
 
-    # Create Director Relations
-    for d in title_relations["directors"]:
-        scraper.load_person_page(d)
-        director = scraper.get_person_contents()
-        director_relations = scraper.get_person_relation_contents()
 
-        response = amdb.create_person(director)
-        if response is not None:
-            amdb.create_directed_relation(director, title)
-            for organisation, awards in director_relations.items():
-                for award in awards:
-                    amdb.create_award(award.name, organisation)
-                    if award.outcome == "Winner":
-                        amdb.create_won_relation(director, award, organisation)
-                    elif award.outcome == "Nominee":
-                        amdb.create_nominated_relation(director, award, organisation)
+def read_titles(path: str) -> list:
+    """
+    Reads one title per line from a file, or from stdin if path is '-'. Blank lines and lines starting with '#' are
+    ignored.
+    """
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    finally:
+        if f is not sys.stdin:
+            f.close()
 
-    # Create Writer Relations
-    writers = {}
-    for k, v in title_relations["writers"].items():
-        scraper.load_person_page(k)
-        try:
-            writer = scraper.get_person_contents()
-            writers[writer] = v
-        except Exception as e:
-            continue
 
-    for writer, items in writers.items():
-        amdb.create_person(person=writer)
-        amdb.create_wrote_relation(person=writer, title=title, items=items)
+def report_profile(path: str):
+    """
+    Prints the functions the profiled entity spent the most time in, if it was profiled.
+    """
+    if tracing.TRACER.profiled:
+        print(f"Profile of {tracing.TRACER.profile_entity} ({path}):")
+        pstats.Stats(path).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(20)
 
-    # Create Producer Relations
-    producers = {}
-    for k, v in title_relations["producers"].items():
-        scraper.load_person_page(k)
-        try:
-            producer = scraper.get_person_contents()
-            producers[producer] = v
-        except Exception as e:
-            continue
 
-    for producer, items in producers.items():
-        amdb.create_person(person=producer)
-        amdb.create_produced_relation(person=producer, title=title, items=items)
+def report_metrics(path: str):
+    """
+    Prints the metrics summary and writes every metric to path, if metrics are enabled.
+    """
+    if not metrics.is_enabled():
+        return
+    print(f"Metrics:\n{metrics.REGISTRY.summary()}")
+    if path:
+        metrics.write_prometheus(path)
 
-    # Create Genre Relations
-    genres = title_relations["genres"]
-    for g in genres:
-        amdb.create_genre(g)
-        amdb.create_genre_relation(title=title, genre_name=g)
 
-    # Create Cast Relations
-    cast = {}
-    billing = 0
-    for actor, chars in title_relations["cast"].items():
-        scraper.load_person_page(actor)
-        try:
-            person = scraper.get_person_contents()
-            cast[person] = (chars, billing)
-            billing = billing + 1
-        except Exception as e:
-            continue
+if __name__ == '__main__':
+    args = parse_args()
+    if args.metrics or args.metrics_port:
+        metrics.enable()
+    if args.metrics_port:
+        metrics.start_http_server(args.metrics_port)
+    if args.trace or args.profile:
+        # Without '--trace' no spans are written, so none are kept.
+        tracing.enable(keep_spans=bool(args.trace))
+    if args.profile:
+        tracing.profile(args.profile, args.profile_output)
+    if args.load:
+        client = GQLClient(args.endpoint, schema_path=args.schema, validate=args.validate)
+        batch_size = args.batch_size if args.batch_size > 1 else DEFAULT_BATCH_SIZE
+        print(BulkLoader(client, batch_size=batch_size).load(args.load))
+        report_metrics(args.metrics)
+        if args.trace:
+            tracing.write_trace(args.trace)
+        sys.exit(0)
+    search_index = SearchIndex(args.search_index)
+    if args.preload:
+        search_index.preload(args.preload)
+    fetcher = Fetcher(pool_maxsize=max(args.workers, 10),
+                      cache=ResponseCache(args.cache) if args.cache else None,
+                      rate_limiter=RateLimiter(rate=args.rate_limit, burst=max(1, int(args.rate_limit)),
+                                               max_concurrency=max(args.workers, 10)) if args.rate_limit else None)
+    scraper = IMDbScraper(fetcher=fetcher, search_index=search_index, parser=args.parser,
+                          base_url=args.imdb_url)
+    journal = Journal(args.journal) if args.journal else None
+    if args.export:
+        # A resumed crawl skips the titles the journal has completed, so their records must be kept.
+        amdb = ExportService(open_writer(args.export, append=journal is not None))
+    else:
+        client = GQLClient(args.endpoint, schema_path=args.schema, validate=args.validate,
+                           schema_cache=SchemaCache(args.schema_cache, args.schema_version) if args.schema_cache
+                           else None)
+        amdb = AMDbService(client, batch_size=args.batch_size, journal=journal)
+        amdb.replay_pending()
 
-    for actor, items in cast.items():
-        amdb.create_person(person=actor)
-        amdb.create_acted_in_relation(person=actor, title=title, characters=items[0], billing=items[1])
+    crawler = Crawler(scraper, amdb, workers=args.workers, journal=journal)
+    if args.pipeline:
+        stats = crawler.crawl_pipelined(read_titles(args.titles), fetch_workers=args.fetch_workers,
+                                        parse_workers=args.parse_workers, transform_workers=args.transform_workers,
+                                        write_workers=args.write_workers, queue_size=args.queue_size)
+    else:
+        stats = crawler.crawl(read_titles(args.titles))
+    print(stats)
+    if fetcher.cache is not None:
+        print(f"Response cache: {fetcher.cache.stats()}")
+    print(f"Search index: {search_index.hits} hits, {search_index.misses} misses")
+    if fetcher.rate_limiter is not None:
+        print(f"Rate limiter: {fetcher.rate_limiter.stats()}")
+    if fetcher.cache is not None:
+        fetcher.cache.close()
+    fetcher.close()
+    report_metrics(args.metrics)
+    report_profile(args.profile_output)
+    if args.trace:
+        tracing.write_trace(args.trace)
+    if args.export:
+        amdb.close()
+    if journal is not None:
+        journal.close()
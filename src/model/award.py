@@ -9,15 +9,34 @@ class AwardOrganisation(Enum):
 
 class Award():
     """
-    A model class that stores the basic information to create an Award and Nominated/Won Relations for AMDb.
+    A model class that stores the basic information to create an Award and Nominated/Won Relations for AMDb. Awards
+    are equal, and hash alike, if they have the same name, outcome and year, and were given at the same IMDb event
+    (e.g. 'ev0000003', the Academy Awards) for the same IMDb title. Awards without those IDs are compared on all of
+    their fields.
     """
-    def __init__(self, name: str, outcome: str, year: int, title_name: str, title_released: int):
+    __slots__ = ("event_id", "name", "outcome", "year", "title_imdb_id", "title_name", "title_released")
+
+    def __init__(self, name: str, outcome: str, year: int, title_name: str, title_released: int,
+                 event_id: str = None, title_imdb_id: str = None):
+        self.event_id = event_id
         self.name = name
         self.outcome = outcome
         self.year = year
+        self.title_imdb_id = title_imdb_id
         self.title_name = title_name
         self.title_released = title_released
 
     def __str__(self):
         return "Award(name: {0}, year: {1}, outcome: {2}, title: {3} ({4}))".format(self.name, 
                                     self.year, self.outcome, self.title_name, self.title_released)
+
+    def __key(self) -> tuple:
+        if self.event_id and self.title_imdb_id:
+            return self.event_id, self.name, self.outcome, self.year, self.title_imdb_id
+        return None, self.name, self.outcome, self.year, self.title_name, self.title_released
+
+    def __eq__(self, other):
+        return isinstance(other, Award) and self.__key() == other.__key()
+
+    def __hash__(self):
+        return hash(self.__key())
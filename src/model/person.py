@@ -1,21 +1,23 @@
 from datetime import datetime
 
+DOB_FORMAT = "%d-%b-%Y"
+
 
 class Person:
     """
-    A model class that stores the basic information to create a Person for AMDb.
+    A model class that stores the basic information to create a Person for AMDb. People are equal, and hash alike,
+    if they have the same IMDb ID or, for people without one, the same name and date of birth.
     """
+    __slots__ = ("imdb_id", "name", "date_of_birth", "bio")
 
-    def __init__(self, name: str, date_of_birth: datetime, bio: str):
+    def __init__(self, name: str, date_of_birth: datetime, bio: str, imdb_id: str = None):
+        self.imdb_id = imdb_id
         self.name = name
         self.date_of_birth = date_of_birth
         self.bio = bio
 
     def __str__(self):
-        return "Person(name: " + self.name + \
-                ", date_of_birth: " + self.get_dob("%d-%b-%Y") + \
-                ", bio: " + self.bio + \
-                ")"
+        return "Person(name: {0}, date_of_birth: {1}, bio: {2})".format(self.name, self.get_dob(DOB_FORMAT), self.bio)
 
     def get_dob(self, date_format) -> str:
         """
@@ -34,4 +36,13 @@ class Person:
         """
         A method to represent a person object in a shorter string format.
         """
-        return "Person({0} - {1})".format(self.name, self.get_dob("%d-%b-%Y"))
+        return "Person({0} - {1})".format(self.name, self.get_dob(DOB_FORMAT))
+
+    def __key(self) -> tuple:
+        return (self.imdb_id,) if self.imdb_id else (None, self.name, self.date_of_birth)
+
+    def __eq__(self, other):
+        return isinstance(other, Person) and self.__key() == other.__key()
+
+    def __hash__(self):
+        return hash(self.__key())
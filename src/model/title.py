@@ -1,7 +1,14 @@
 class Title():
+    """
+    A model class that stores the basic information to create a Title for AMDb. Titles are equal, and hash alike,
+    if they have the same IMDb ID or, for titles without one, the same name and release year.
+    """
+    __slots__ = ("imdb_id", "name", "summary", "released", "certificate_rating", "title_length_in_mins", "storyline",
+                 "tagline")
 
     def __init__(self, name: str, summary: str, released: int, certificate_rating: str,
-                 title_length_in_mins: int, storyline: str, tagline: str):
+                 title_length_in_mins: int, storyline: str, tagline: str, imdb_id: str = None):
+        self.imdb_id = imdb_id
         self.name = name
         self.summary = summary
         self.released = released
@@ -11,17 +18,22 @@ class Title():
         self.tagline = tagline
 
     def __str__(self):
-        return "Title(name: " + self.name + \
-               ", summary: " + self.summary + \
-               ", released: " + str(self.released) + \
-               ", certificate_rating: " + self.certificate_rating + \
-               ", title_length_in_mins: " + str(self.title_length_in_mins) + \
-               ", storyline: " + self.storyline + \
-               ", tagline: " + self.tagline + \
-               ")"
+        return "Title(name: {0}, summary: {1}, released: {2}, certificate_rating: {3}, title_length_in_mins: {4}, " \
+               "storyline: {5}, tagline: {6})".format(self.name, self.summary, self.released,
+                                                      self.certificate_rating, self.title_length_in_mins,
+                                                      self.storyline, self.tagline)
 
     def __short_str__(self):
         """
         A method to represent a title object in a shorter string format.
         """
         return "Title({0} ({1}))".format(self.name, self.released)
+
+    def __key(self) -> tuple:
+        return (self.imdb_id,) if self.imdb_id else (None, self.name, self.released)
+
+    def __eq__(self, other):
+        return isinstance(other, Title) and self.__key() == other.__key()
+
+    def __hash__(self):
+        return hash(self.__key())
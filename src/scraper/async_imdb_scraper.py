@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import time
+
+import httpx
+
+from src.instrumentation import metrics, tracing
+from src.model.person import Person
+from src.model.title import Title
+from src.scraper import extractor
+from src.scraper.cache import ResponseCache
+from src.scraper.fetcher import ACCEPT_ENCODING, DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT, record_response
+from src.scraper.imdb_scraper import (AWARDS_SUFFIX, BASE_URL, BIO_SUFFIX, FULL_CREDITS_SUFFIX, NAME_SIGNATURE,
+                                      TITLE_SIGNATURE, build_search_url)
+from src.scraper.parser import DEFAULT_PARSER, validate_parser
+from src.scraper.rate_limiter import THROTTLED_STATUSES, RateLimiter
+from src.scraper.page import Page, PersonDocument, TitleDocument
+from src.scraper.search_index import SearchIndex, get_path_for_id
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class AsyncIMDbScraper:
+    """
+    An asyncio counterpart to IMDbScraper. Pages are downloaded concurrently over one shared 'httpx.AsyncClient'
+    with the number of in-flight requests bounded by a semaphore. Extraction uses the same 'src.scraper.extractor'
+    functions as IMDbScraper so both scrapers return identical results.
+
+    Args:
+        client: The 'httpx.AsyncClient' used for every request. A pooled client is created if none is given.
+        max_concurrency: The maximum number of requests in flight at any one time.
+        cache: A ResponseCache consulted before, and filled after, every request.
+        search_index: A SearchIndex of previously resolved queries, consulted before and filled after every search.
+        parser: The name of the parser backend used for every page, see 'src.scraper.parser'.
+        rate_limiter: A RateLimiter every request waits on, within the 'max_concurrency' bound. Throttled (429/503)
+            requests are retried once it lets them through again, up to 'DEFAULT_MAX_RETRIES' times.
+        base_url: The scheme and host every page is requested from e.g. a local replay server's.
+    """
+    logger = logging.getLogger('AsyncIMDbScraper')
+
+    def __init__(self, client: httpx.AsyncClient = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 cache: ResponseCache = None, search_index: SearchIndex = None, parser: str = DEFAULT_PARSER,
+                 rate_limiter: RateLimiter = None, base_url: str = BASE_URL):
+        if client is None:
+            client = httpx.AsyncClient(
+                headers={"Accept-Encoding": ACCEPT_ENCODING},
+                limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+                timeout=DEFAULT_TIMEOUT,
+            )
+        self.client = client
+        self.cache = cache
+        self.search_index = search_index
+        self.parser = validate_parser(parser)
+        self.rate_limiter = rate_limiter
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.__semaphore = None
+        self.__semaphore_loop = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """
+        The semaphore bounding the requests in flight. It is created inside the running event loop, and again for
+        each new loop, as asyncio primitives are bound to the loop they are first used in.
+        """
+        loop = asyncio.get_running_loop()
+        if self.__semaphore_loop is not loop:
+            self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.__semaphore_loop = loop
+        return self.__semaphore
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the underlying HTTP client and its pooled connections.
+        """
+        await self.client.aclose()
+
+    async def title(self, query: str) -> (Title, dict):
+        """
+        Scrapes the first IMDb title matching the query. The main and full credits pages are fetched concurrently.
+
+        Args:
+            query: The searched for title.
+
+        Returns:
+            A Title object and a dict of its relations, as returned by 'IMDbScraper.scrape_title'.
+        """
+        self.logger.info(f"Scraping title for {query}")
+        return await self.__title(await self.__resolve_first_result_url(query), query)
+
+    async def title_by_id(self, imdb_id: str) -> (Title, dict):
+        """
+        Scrapes an IMDb title by its ID without a search.
+
+        Args:
+            imdb_id: The IMDb title ID e.g. 'tt0468569'.
+
+        Returns:
+            A Title object and a dict of its relations, as returned by 'IMDbScraper.scrape_title'.
+        """
+        self.logger.info(f"Scraping title for {imdb_id}")
+        return await self.__title(self.base_url + get_path_for_id(imdb_id), imdb_id)
+
+    async def person(self, query: str) -> (Person, dict):
+        """
+        Scrapes the first IMDb person matching the query. The main, bio and awards pages are fetched concurrently.
+
+        Args:
+            query: The searched for person.
+
+        Returns:
+            A Person object and a dict of their awards, as returned by 'IMDbScraper.scrape_person'.
+        """
+        self.logger.info(f"Scraping person for {query}")
+        return await self.__person(await self.__resolve_first_result_url(query), query)
+
+    async def person_by_id(self, imdb_id: str) -> (Person, dict):
+        """
+        Scrapes an IMDb person by their ID without a search.
+
+        Args:
+            imdb_id: The IMDb name ID e.g. 'nm0000288'.
+
+        Returns:
+            A Person object and a dict of their awards, as returned by 'IMDbScraper.scrape_person'.
+        """
+        self.logger.info(f"Scraping person for {imdb_id}")
+        return await self.__person(self.base_url + get_path_for_id(imdb_id), imdb_id)
+
+    async def people(self, queries: list) -> dict:
+        """
+        Scrapes every person in queries concurrently. People that fail to scrape are logged and left out.
+
+        Args:
+            queries: A list of searched for people e.g. every name credited on a title.
+
+        Returns:
+            A dict of query (key) to the (Person, awards) tuple returned by 'person' (value).
+        """
+        results = await asyncio.gather(*[self.person(q) for q in queries], return_exceptions=True)
+        people = {}
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Could not scrape person for {query}: {result}")
+                continue
+            people[query] = result
+        return people
+
+    async def __title(self, url: str, query: str) -> (Title, dict):
+        if TITLE_SIGNATURE not in url:
+            raise Exception(f"{url} is not an IMDb title page. Cannot scrape title for {query}.")
+        main, full_credits = await self.__fetch_pages((url, None),
+                                                      (url + FULL_CREDITS_SUFFIX, extractor.FULL_CREDITS_REGION))
+        document = TitleDocument(url=url, main=main, full_credits=full_credits)
+        return await self.__extract(extractor.get_title_contents, extractor.get_title_relation_contents, document)
+
+    async def __person(self, url: str, query: str) -> (Person, dict):
+        if NAME_SIGNATURE not in url:
+            raise Exception(f"{url} is not an IMDb name page. Cannot scrape person for {query}.")
+        main, bio, awards = await self.__fetch_pages((url, None), (url + BIO_SUFFIX, extractor.BIO_REGION),
+                                                     (url + AWARDS_SUFFIX, extractor.AWARDS_REGION))
+        document = PersonDocument(url=url, main=main, bio=bio, awards=awards)
+        return await self.__extract(extractor.get_person_contents, extractor.get_person_relation_contents, document)
+
+    async def __resolve_first_result_url(self, query: str) -> str:
+        if self.search_index is not None:
+            path = self.search_index.get(query)
+            if path is not None:
+                return self.base_url + path
+        search_page, = await self.__fetch_pages((build_search_url(query, self.base_url), extractor.SEARCH_REGION))
+
+        def resolve():
+            path = extractor.get_first_result_path(search_page.soup)
+            if self.search_index is not None:
+                self.search_index.put(query, path)
+            return path
+        return self.base_url + await asyncio.get_running_loop().run_in_executor(None, resolve)
+
+    async def __fetch_pages(self, *pages) -> list:
+        """
+        Fetches every page concurrently, bounded by the scraper's semaphore.
+
+        Args:
+            pages: (url, region) tuples, where region is the Region declaring the parts of the page to parse.
+
+        Returns:
+            A list of Page objects in the same order as pages.
+        """
+        contents = await asyncio.gather(*[self.__fetch(url) for url, _ in pages])
+        return [Page(url, content=content, parser=self.parser, region=region)
+                for (url, region), content in zip(pages, contents)]
+
+    async def __fetch(self, url: str):
+        with tracing.span("fetch", "fetch", url=url):
+            return await self.__fetch_page(url)
+
+    async def __fetch_page(self, url: str):
+        # The cache does blocking SQLite I/O, so it is only ever touched from the default executor.
+        loop = asyncio.get_running_loop()
+        entry, fresh = await loop.run_in_executor(None, self.cache.lookup, url) if self.cache is not None \
+            else (None, False)
+        if fresh:
+            return entry.content
+        async with self.semaphore:
+            response = await self.__get(url, headers=entry.validators() if entry is not None else None)
+        if entry is not None and response.status_code == 304:
+            await loop.run_in_executor(None, self.cache.revalidated, url)
+            return entry.content
+        response.raise_for_status()
+        if self.cache is not None:
+            await loop.run_in_executor(None, lambda: self.cache.store(
+                url, response.content, etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")))
+        return response.content
+
+    async def __get(self, url: str, headers: dict = None) -> httpx.Response:
+        if self.rate_limiter is None:
+            return await self.__get_once(url, headers)
+        for attempt in range(DEFAULT_MAX_RETRIES + 1):
+            permit = await self.rate_limiter.acquire_async(url)
+            try:
+                response = await self.__get_once(url, headers)
+            except Exception:
+                permit.release()
+                raise
+            permit.release(response.status_code, response.headers)
+            if response.status_code not in THROTTLED_STATUSES:
+                break
+            self.logger.warning(f"{url} was throttled with a {response.status_code} (attempt {attempt + 1})")
+        return response
+
+    async def __get_once(self, url: str, headers: dict = None) -> httpx.Response:
+        if not metrics.is_enabled():
+            return await self.client.get(url, headers=headers)
+        start = time.perf_counter()
+        try:
+            response = await self.client.get(url, headers=headers)
+        except Exception:
+            metrics.inc("imdb_requests_total", status="error")
+            raise
+        record_response(response.status_code, len(response.content), time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    async def __extract(contents, relations, document):
+        """
+        Runs the blocking parse and extraction work in the default executor so it does not stall other fetches.
+        """
+        def run():
+            return contents(document), relations(document)
+        return await asyncio.get_running_loop().run_in_executor(None, run)
@@ -0,0 +1,195 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from src.instrumentation import metrics
+
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 100000
+# The number of access times held back before they are written without waiting for the next store or close.
+ACCESS_TIME_BATCH_SIZE = 1000
+
+
+class CacheEntry:
+    """
+    A model class for a single cached HTTP response.
+    """
+
+    def __init__(self, url: str, content: bytes, etag: str, last_modified: str, stored_at: float):
+        self.url = url
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def validators(self) -> dict:
+        """
+        Builds the conditional request headers needed to revalidate this entry.
+
+        Returns:
+            A dict of headers, empty if the response carried neither an ETag nor a Last-Modified header.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CachedResponse:
+    """
+    A minimal stand-in for 'requests.Response' returned when a page is served from the cache.
+    """
+
+    def __init__(self, url: str, content: bytes):
+        self.url = url
+        self.content = content
+        self.status_code = 200
+        self.headers = {}
+        self.from_cache = True
+
+    def raise_for_status(self):
+        pass
+
+
+class ResponseCache:
+    """
+    A persistent, SQLite backed cache of HTTP response bodies keyed by URL. Bodies are stored zlib compressed along
+    with their ETag and Last-Modified headers so stale entries can be revalidated with a conditional GET. Entries
+    older than 'ttl' are stale and the least recently used entries are evicted once the cache holds more than
+    'max_entries'.
+
+    Args:
+        path: The path of the SQLite database file. Its directory is created if needed.
+        ttl: The number of seconds an entry is served without revalidation.
+        max_entries: The maximum number of entries kept.
+
+    Attributes:
+        hits: The number of lookups served without touching the network.
+        misses: The number of lookups that needed a request, including revalidations.
+        revalidations: The number of misses answered with '304 Not Modified'.
+    """
+    logger = logging.getLogger('ResponseCache')
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.__lock = threading.Lock()
+        # The access time of every entry hit since the last write, so hits do not each pay for a commit.
+        self.__accessed = {}
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, "
+            "last_modified TEXT, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+        self.__connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self.__connection.commit()
+
+    def lookup(self, url: str) -> (CacheEntry, bool):
+        """
+        Looks up the cached response for a URL and records a hit or a miss. The hit's access time is held back and
+        written with the next store or close, or once ACCESS_TIME_BATCH_SIZE of them are pending.
+
+        Args:
+            url: The requested URL.
+
+        Returns:
+            The CacheEntry, or None if the URL is not cached, and whether that entry is fresh enough to be served
+            without revalidation.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                self.misses += 1
+                metrics.inc("imdb_cache_lookups_total", result="miss")
+                return None, False
+            self.__accessed[url] = time.time()
+            if len(self.__accessed) >= ACCESS_TIME_BATCH_SIZE:
+                self.__write_access_times()
+                self.__connection.commit()
+            entry = CacheEntry(url, zlib.decompress(row[0]), row[1], row[2], row[3])
+            fresh = entry.is_fresh(self.ttl)
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            metrics.inc("imdb_cache_lookups_total", result="hit" if fresh else "stale")
+            return entry, fresh
+
+    def store(self, url: str, content: bytes, etag: str = None, last_modified: str = None):
+        """
+        Stores a response body and its validators, evicting the least recently used entries if the cache is full.
+        """
+        now = time.time()
+        with self.__lock:
+            self.__accessed.pop(url, None)
+            self.__write_access_times()
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO responses (url, body, etag, last_modified, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (url, zlib.compress(content), etag, last_modified, now, now))
+            self.__evict()
+            self.__connection.commit()
+
+    def revalidated(self, url: str):
+        """
+        Marks an entry as fresh again after the server answered a conditional GET with '304 Not Modified'.
+        """
+        with self.__lock:
+            self.revalidations += 1
+            metrics.inc("imdb_cache_lookups_total", result="revalidated")
+            self.__connection.execute("UPDATE responses SET stored_at = ? WHERE url = ?", (time.time(), url))
+            self.__write_access_times()
+            self.__connection.commit()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            A dict of the cache's size and hit/miss counters.
+        """
+        with self.__lock:
+            size = self.__connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        """
+        Writes any held back access times and closes the database.
+        """
+        with self.__lock:
+            self.__write_access_times()
+            self.__connection.commit()
+            self.__connection.close()
+
+    def __write_access_times(self):
+        if self.__accessed:
+            self.__connection.executemany("UPDATE responses SET accessed_at = ? WHERE url = ?",
+                                          [(accessed_at, url) for url, accessed_at in self.__accessed.items()])
+            self.__accessed = {}
+
+    def __evict(self):
+        excess = self.__connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.logger.debug(f"Evicting {excess} least recently used responses.")
+            self.__connection.execute(
+                "DELETE FROM responses WHERE url IN (SELECT url FROM responses ORDER BY accessed_at LIMIT ?)",
+                (excess,))
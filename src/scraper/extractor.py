@@ -0,0 +1,629 @@
+"""
+Stateless extraction functions for IMDb pages. Every function reads only from the soup, Page or document it is given,
+so they are safe to call from many threads at once.
+
+The '*_REGION' constants declare the only parts of each page type the extractors read. Pages built with them parse
+just those parts, which is much cheaper than building the full tree. The title main page is read from too many places
+to be worth restricting.
+"""
+from datetime import datetime
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.error.exception import ParseError
+from src.instrumentation import metrics, tracing
+from src.model.award import Award, AwardOrganisation
+from src.model.person import Person
+from src.model.title import Title
+from src.scraper.page import PersonDocument, TitleDocument
+from src.scraper.parser import Region
+
+SEARCH_REGION = Region(strainer=SoupStrainer(class_="findList"))
+FULL_CREDITS_REGION = Region(strainer=SoupStrainer(id="fullcredits_content"),
+                             container_marker='id="fullcredits_content"',
+                             section_marker='class="dataHeaderWithBorder"',
+                             sections=("Directed by", "Writing Credits", "Produced by"))
+BIO_REGION = Region(strainer=SoupStrainer(class_="soda odd"))
+AWARDS_REGION = Region(strainer=SoupStrainer(class_="article listo"))
+
+NAME_ID_PATTERN = re.compile(r"/name/(nm\d+)/")
+TITLE_ID_PATTERN = re.compile(r"/title/(tt\d+)")
+EVENT_ID_PATTERN = re.compile(r"/event/(ev\d+)/")
+IMDB_ID_URL_PATTERN = re.compile(r"/(?:title|name)/((?:tt|nm)\d+)")
+
+
+def _instrumented(function):
+    """
+    Times an extractor in the 'imdb_extractor_seconds' metric and traces it as an 'extractor' span.
+    """
+    return tracing.traced("extractor")(metrics.timed("imdb_extractor_seconds", "extractor")(function))
+
+
+def get_title_contents(document: TitleDocument) -> Title:
+    """
+    Extracts the contents of a title.
+
+    Args:
+        document: The title's pages.
+
+    Returns:
+        A Title object containing all the scraped data.
+    """
+    soup = document.main.soup
+    return Title(
+        imdb_id=get_imdb_id(document.url),
+        name=get_title_name(soup),
+        summary=get_title_summary(soup),
+        released=get_title_release_year(soup),
+        certificate_rating=get_title_certificate_rating(soup),
+        title_length_in_mins=get_title_length_in_mins(soup),
+        storyline=get_title_storyline(soup),
+        tagline=get_title_tagline(soup)
+    )
+
+
+def get_title_relation_contents(document: TitleDocument) -> dict:
+    """
+    Extracts the contents regarding a title's relationships.
+
+    Args:
+        document: The title's pages.
+
+    Returns:
+        A dict object containing all the scraped data.
+    """
+    return {
+        "directors": get_title_directors(document.full_credits.soup),
+        "writers": get_title_writers(document.full_credits.soup),
+        "producers": get_title_producers(document.full_credits.soup),
+        "genres": get_title_genres(document.main.soup),
+        "cast": get_title_cast(document.main.soup)
+    }
+
+
+def get_imdb_id(url: str) -> str:
+    """
+    Extracts the IMDb title or name ID from the URL of any of its pages.
+
+    Returns:
+        The ID e.g. 'tt0468569' or 'nm0000288', or None if the URL is not of a title or person.
+    """
+    match = IMDB_ID_URL_PATTERN.search(url or "")
+    return match.group(1) if match else None
+
+
+def get_title_person_ids(document: TitleDocument) -> dict:
+    """
+    Extracts the IMDb name IDs of everyone credited as a director, writer, producer or main cast member of a title.
+
+    Args:
+        document: The title's pages.
+
+    Returns:
+        A dict of person name (key) to IMDb name ID (value) e.g. {'Christian Bale': 'nm0000288'}.
+    """
+    ids = {}
+    for anchor in document.full_credits.soup.find_all("a", href=NAME_ID_PATTERN):
+        if anchor.contents and anchor.contents[0].string:
+            ids.setdefault(anchor.contents[0].string.strip(), NAME_ID_PATTERN.search(anchor["href"]).group(1))
+    for member in document.main.soup.find(class_="cast_list").find_all('tr'):
+        cast_tds = member.find_all('td')
+        if len(cast_tds) > 1:
+            anchor = cast_tds[1].find('a', href=NAME_ID_PATTERN)
+            if anchor is not None and anchor.string:
+                name = anchor.string.replace("\n", "").strip()
+                ids.setdefault(name, NAME_ID_PATTERN.search(anchor["href"]).group(1))
+    return ids
+
+
+def get_person_contents(document: PersonDocument) -> Person:
+    """
+    Extracts the contents of a person.
+
+    Args:
+        document: The person's pages.
+
+    Returns:
+        A Person object containing all the scraped data.
+    """
+    return Person(name=get_person_name(document.main.soup), date_of_birth=get_person_dob(document.main.soup),
+                  bio=get_person_bio(document.bio.soup), imdb_id=get_imdb_id(document.url))
+
+
+def get_person_relation_contents(document: PersonDocument) -> dict:
+    """
+    Extracts the contents regarding a person's relationships.
+
+    Args:
+        document: The person's pages.
+
+    Returns:
+        A dict object containing all the scraped data.
+    """
+    return {
+        "Academy Awards": get_awards_for_organisation(document.awards.soup, AwardOrganisation.ACADEMY_AWARDS.value),
+        "Golden Globes": get_awards_for_organisation(document.awards.soup, AwardOrganisation.GOLDEN_GLOBES.value),
+        "BAFTA Awards": get_awards_for_organisation(document.awards.soup, AwardOrganisation.BAFTA_AWARDS.value),
+    }
+
+
+@_instrumented
+def get_first_result_path(soup: BeautifulSoup) -> str:
+    """
+    Extracts the path of the first result from an IMDb search results page.
+
+    Returns:
+        A string containing the path of the first result e.g. '/title/tt0468569/'.
+    """
+    search_results_table = soup.find(class_="findList")
+    first_result = search_results_table.find_all('a')[0]
+    result_suffix = first_result.get('href')
+    return result_suffix[:result_suffix.rfind('/')+1]
+
+
+@_instrumented
+def get_title_name(soup: BeautifulSoup) -> str:
+    """
+    Extracts the name from any given title page i.e. a Movie or TV show.
+
+    Returns:
+        A string containing the name of the title page.
+    """
+    headers = soup.find_all("h1")
+    return headers[0].contents[0].string.strip()
+
+
+@_instrumented
+def get_title_summary(soup: BeautifulSoup) -> str:
+    """
+    Extracts the summary from any given title page i.e. a Movie or TV show.
+
+    Returns:
+        A string containing the summary of the title page.
+    """
+    title_summary = soup.find(class_="summary_text")
+    summary_string = ""
+    for item in title_summary.contents:
+        summary_string += _remove_html_elements_from_string(item.string)
+    summary_string = ' '.join(summary_string.split())
+    return summary_string
+
+
+@_instrumented
+def get_title_release_year(soup: BeautifulSoup) -> int:
+    """
+    Extracts the release year from any given title page i.e. a Movie or TV show.
+
+    Returns:
+        A integer representing the release year of the title page.
+    """
+    title_year = soup.find(id="titleYear")
+    return int(title_year.find('a').text.strip())
+
+
+@_instrumented
+def get_title_certificate_rating(soup: BeautifulSoup) -> str:
+    """
+    Extracts the certificate rating from any given title page i.e. a Movie or TV show.
+
+    Returns:
+        A string containing the certificate rating of the title page.
+    """
+    subtext = soup.find(class_="subtext")
+    return str(subtext.contents[0]).replace("\n", "").strip()
+
+
+@_instrumented
+def get_title_length_in_mins(soup: BeautifulSoup) -> int:
+    """
+    Extracts the title length in minutes from any given title page i.e. a Movie or TV show.
+
+    Returns:
+        A integer representing the length of the title in minutes of the title page.
+    """
+    subtext = soup.find(class_="subtext")
+    film_length_str = subtext.find('time').text.strip()
+    return _parse_title_length(film_length_str)
+
+
+@_instrumented
+def get_title_storyline(soup: BeautifulSoup) -> str:
+    """
+    Extracts the storyline from any given title page i.e. a Movie or TV show.
+
+    Returns:
+        A string containing the storyline of the title page.
+    """
+    storyline = soup.find(class_="inline canwrap")
+    storyline_raw = _remove_html_elements_from_string(storyline.contents[1].text)
+    storyline_clean = storyline_raw.strip().replace("\n", " ")
+    return storyline_clean
+
+
+@_instrumented
+def get_title_tagline(soup: BeautifulSoup) -> str:
+    """
+    Extracts the tagline from any given title page i.e. a Movie or TV show.
+
+    Returns:
+        A string containing the tagline of the title page.
+    """
+    txt_block_tags = soup.find_all("div", {"class": "txt-block"})
+    raw_tagline = _remove_html_elements_from_string(txt_block_tags[0].text)
+    start = raw_tagline.find("Taglines:") + len("Taglines:")
+    end = raw_tagline.find("See more")
+    tagline_clean = raw_tagline[start:end].strip()
+    return tagline_clean
+
+
+@_instrumented
+def get_title_genres(soup: BeautifulSoup) -> list:
+    """
+    Extracts the list of genres from any given title page i.e. a Movie or TV show.
+
+    Returns:
+        A list of genres relating to the title page.
+    """
+    subtext = soup.find_all(class_="see-more inline canwrap")[1]
+    potential_genres = subtext.find_all('a')
+    genres = []
+    for pg in potential_genres:
+        if 'genre' in pg['href']:
+            genres.append(pg.text.strip())
+    return genres
+
+
+@_instrumented
+def get_title_cast(soup: BeautifulSoup) -> dict:
+    """
+    Extracts the main cast from any given title page i.e. a Movie or TV show.
+
+    Returns:
+        A dict containing the cast of the title page. The keys are actors names and the values are the character(s)
+        they played in the title.
+    """
+    cast_list_table = soup.find(class_="cast_list")
+    cast_trs = cast_list_table.find_all('tr')
+
+    cast_map = {}
+    for member in cast_trs:
+        cast_tds = member.find_all('td')
+        if _main_cast_obtained(cast_tds):
+            break
+        if len(cast_tds) > 1:
+            actor_name, character = _extract_actor_and_character(cast_tds)
+            cast_map[actor_name] = character
+    return cast_map
+
+
+@_instrumented
+def get_title_directors(soup: BeautifulSoup) -> list:
+    """
+    Extracts the director(s) from any given IMDb title (Movie or TV show) full credits page.
+
+    Returns:
+        A list of strings containing the director(s) name(s).
+    """
+    director_credits = _get_table_for(soup, block="fullcredits_content", header="Directed by")
+    director_anchors = director_credits.find_all("a")
+
+    return [x.contents[0].string.strip() for x in director_anchors]
+
+
+@_instrumented
+def get_title_writers(soup: BeautifulSoup) -> dict:
+    """
+    Extracts the writer(s) from any given IMDb title (Movie or TV show) full credits page.
+
+    Returns:
+        A dict of writer name (key) to a list of their writing credits (value).
+    """
+    writer_credits = _get_table_for(soup, block="fullcredits_content", header="Writing Credits")
+
+    writer_name_anchors = writer_credits.find_all("a")
+    writer_role_tags = writer_credits.find_all(class_="credit")
+
+    writer_names = [x.contents[0].string.strip() for x in writer_name_anchors]
+    writer_roles = [_extract_role(x.contents[0].string) for x in writer_role_tags]
+
+    return _zip_names_and_roles(writer_names, writer_roles)
+
+
+@_instrumented
+def get_title_producers(soup: BeautifulSoup) -> dict:
+    """
+    Extracts the producer(s) from any given IMDb title (Movie or TV show) full credits page.
+
+    Returns:
+        A dict of producer name (key) to a list of their producing credits (value).
+    """
+    producer_credits = _get_table_for(soup, block="fullcredits_content", header="Produced by")
+
+    producer_name_anchors = producer_credits.find_all("a")
+    producer_role_tags = producer_credits.find_all(class_="credit")
+
+    producer_names = [x.contents[0].string.strip() for x in producer_name_anchors]
+    producer_roles = [x.contents[0].string.strip() for x in producer_role_tags]
+
+    return _zip_names_and_roles(producer_names, producer_roles)
+
+
+@_instrumented
+def get_person_name(soup: BeautifulSoup) -> str:
+    """
+    Extracts a person's name from any given IMDb name main page.
+
+    Returns:
+        A string containing the name of the person.
+    """
+    headers = soup.find_all("h1")
+    item_prop = headers[0].find(class_="itemprop")
+    return item_prop.contents[0].string.strip()
+
+
+@_instrumented
+def get_person_dob(soup: BeautifulSoup) -> datetime:
+    """
+    Extracts a person's date of birth from any given IMDb name main page.
+
+    Returns:
+        A datetime object containing the date of birth of the person.
+    """
+    date_info = soup.find("time")
+    if date_info is None:
+        raise ParseError("Could not extract person date of birth.")
+    dob_str = date_info["datetime"]
+    year, month, day = dob_str.split("-")
+    return datetime(year=int(year), month=int(month), day=int(day))
+
+
+@_instrumented
+def get_person_bio(soup: BeautifulSoup) -> str:
+    """
+    Extracts a person's bio from any given IMDb name bio page.
+
+    Returns:
+        A str containing the bio of the person.
+    """
+    bio_block = soup.find(class_="soda odd")
+    raw_bio = bio_block.find("p").contents
+    bio_list = [str(x) for x in raw_bio]
+    bio = "".join(bio_list)
+    bio = bio.replace("<br>", "\n").replace("<br/>", "\n").replace("</br>", "\n").strip()
+    bio = _remove_html_elements_from_string(bio)
+    return bio
+
+
+@_instrumented
+def get_awards_for_organisation(soup: BeautifulSoup, organisation: str) -> list:
+    """
+    Extracts a person's awards for a given organisation e.g. Academy Awards from any given IMDb name awards page.
+
+    Returns:
+        A list of 'Award' objects.
+    """
+    awards = []
+    awards_table = _get_table_for(soup, block="article listo", header=organisation)
+    award_items = awards_table.find_all("tr")
+    ay_marker, ao_marker, event_marker = 0, "", None
+    for i in range(0, len(award_items)):
+        award_name = award_items[i].find(class_="award_description").contents[0].string.strip()
+        if award_name is None or award_name == "":
+            award_name = award_items[i].find(class_="award_category").contents[0].string.strip()
+        award_year, ay_marker = _set_award_year(award_items[i], ay_marker)
+        award_outcome, ao_marker = _set_award_outcome(award_items[i], ao_marker)
+        event_anchor = award_items[i].find("a", href=EVENT_ID_PATTERN)
+        if event_anchor is not None:
+            event_marker = EVENT_ID_PATTERN.search(event_anchor["href"]).group(1)
+        award_title_row = award_items[i].find("a", href=re.compile("title"))
+        if award_title_row is None:
+            continue
+        award_title_name = award_title_row.contents[0].string.strip()
+        award_title_release = int(
+            award_items[i].find(class_="title_year").contents[0].string.strip().replace('(', '').replace(')', ''))
+        title_id = TITLE_ID_PATTERN.search(award_title_row["href"])
+        awards.append(Award(name=award_name, outcome=award_outcome, year=award_year, title_name=award_title_name,
+                            title_released=award_title_release, event_id=event_marker,
+                            title_imdb_id=title_id.group(1) if title_id else None))
+    return awards
+
+
+def _get_table_for(soup: BeautifulSoup, block: str, header: str):
+    """
+    Extracts a block from the HTML loaded into the soup object as defined by its 'id' or 'class' and then extracts a
+    table pertaining to a particular header on the IMDb page.
+
+    Args:
+        soup: The parsed page.
+        block: The html block the table of interested is located in.
+        header: The header of the table.
+
+    Returns:
+        A soup ResultSet containing the table desired.
+    """
+    if "credit" in block:
+        table_block = soup.find(id=block)
+    elif "article listo" in block:
+        table_block = soup.find(class_=block)
+    for i in range(0, len(table_block.contents)):
+        if header in str(table_block.contents[i]):
+            return table_block.contents[i + 2]
+
+    raise Exception("Could not find table for header: " + header)
+
+
+def _set_award_year(award_item, ay_marker) -> (int, int):
+    """
+    A function to help with the parsing of award information. An award year marker ('ay_marker') is kept in the event
+    a person is up for multiple awards in the same year and parsing of the table does not follow the typical row by
+    row format.
+
+    Args:
+        award_item: The soup item representing a row on the awards table.
+        ay_marker: A year marker to use as a fallback for year assignment in the event of multiple award
+            win/nominations in one year.
+
+    Returns:
+        The parsed award year and the award year marker.
+    """
+    try:
+        award_year = int(award_item.find("a", href=re.compile("event")).contents[0].string.strip())
+        ay_marker = award_year
+    except:
+        if ay_marker != 0:
+            award_year = ay_marker
+        else:
+            raise ParseError("Unable to parse award year")
+    return award_year, ay_marker
+
+
+def _set_award_outcome(award_item, ao_marker) -> (str, str):
+    """
+    A function to help with the parsing of award information. An award outcome marker ('ao_marker') is kept in the
+    event a person is up for multiple awards in the same year and parsing of the table does not follow the typical
+    row by row format.
+
+    Args:
+        award_item: The soup item representing a row on the awards table.
+        ao_marker: An outcome marker to use as a fallback for outcome assignment in the event of multiple award
+            win/nominations in one year.
+
+    Returns:
+        The parsed award outcome and the award outcome marker.
+    """
+    try:
+        award_outcome = award_item.find(class_="award_outcome").contents[1].contents[0].string.strip()
+        ao_marker = award_outcome
+    except:
+        if ao_marker != "":
+            award_outcome = ao_marker
+        else:
+            raise ParseError("Unable to parse award outcome")
+    return award_outcome, ao_marker
+
+
+def _main_cast_obtained(cast_td) -> bool:
+    """
+    A function to determine when to stop parsing the cast. This will prevent a bloated database as only the most
+    relevant cast will be stored.
+
+    Args:
+        cast_td: An HTML <td> object containing a cast member or a string denoting where the rest of the cast will be
+            listed alphabetically from here on in.
+
+    Returns:
+        A bool to determine whether all of the main cast has been scraped yet or not.
+    """
+    if len(cast_td) == 1:
+        try:
+            if "Rest of cast listed alphabetically:" in cast_td[0].contents[0].strip():
+                return True
+        except Exception as e:
+            pass
+    return False
+
+
+def _extract_actor_and_character(cast_td) -> (str, list):
+    """
+    A function that extracts an actor name and character list from an IMDb cast table row.
+
+    Args:
+        cast_td: An HTML <td> object containing a cast member and their portrayed character(s) for a particular
+        title.
+
+    Returns:
+        The actor name in a string and a list of strings of portrayed characters.
+    """
+    actor_name = cast_td[1].find('a').string.replace("\n", "").strip()
+    try:
+        character = [c.string.strip() for c in cast_td[3].find_all('a')]
+    except:
+        character = [cast_td[3].contents[0].strip()]
+    return actor_name, character
+
+
+def _extract_role(string: str) -> str:
+    """
+    Extracts the role of a person from it's parentheses.
+
+    Args:
+        string: The role of a person wrapped in parentheses e.g. (producer)
+
+    Returns:
+        The role of a person free from it's parentheses e.g. producer
+    """
+    start = string.find('(')
+    end = string.find(')')
+    return string[start+1:end]
+
+
+def _zip_names_and_roles(names: list, roles: list) -> dict:
+    """
+    Given a lists people names and roles, they are zipped to form a dict of names (key) and lists of roles (value).
+    The ith name in names has their role in the ith index of roles. Given the same name in names, a list of roles
+    with length > 1 will be formed.
+
+    Args:
+        names: A list of people names.
+        roles: A list of people roles.
+
+    Returns:
+        A zipped dict of names (key) to list of roles (value).
+    """
+    writer_map = {}
+    len_wn, len_wr = len(names), len(roles)
+    if len_wn != len_wr:
+        raise ValueError("Length of writer names: {0} is not equal to length of writer roles: {1}".format(
+            len_wn, len_wr))
+    for i in range(0, len_wn):
+        name, role = names[i], roles[i]
+        if writer_map.get(name):
+            writer_map[name].append(role)
+        else:
+            writer_map[name] = [role]
+
+    return writer_map
+
+
+def _parse_title_length(title_length: str) -> int:
+    """
+    A private function to parse the film length string obtained from an IMDB title page and represent it as an
+    integer of film length in minutes.
+
+    Args:
+        title_length: A string representing title length in format '1h 23min'
+
+    Returns:
+        An integer representing the title length in minutes.
+    """
+    hrs_and_mins = title_length.split(' ')
+    hrs, mins = ("", "")
+    for i in range(0, len(hrs_and_mins)):
+        if "h" in hrs_and_mins[i]:
+            hrs = hrs_and_mins[i].replace("h", "")
+        elif "min" in hrs_and_mins[i]:
+            mins = hrs_and_mins[i].replace("min", "")
+    hrs_int = int(hrs) if hrs else 0
+    mins_int = int(mins) if mins else 0
+
+    return (hrs_int * 60) + mins_int
+
+
+def _remove_html_elements_from_string(string: str):
+    """
+    A private function that removes all html tags from a given string.
+
+    Args:
+        string: The string that requires the removal of HTML tags.
+
+    Returns:
+        A new HTML tag-free string.
+    """
+    start = string.find('<')
+    end = string.find('>')
+    while start != -1 and end != -1:
+        string = string[:start] + string[end + 1:]
+        start = string.find('<')
+        end = string.find('>')
+    return string
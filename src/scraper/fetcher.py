@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.instrumentation import metrics, tracing
+from src.scraper.cache import CachedResponse, ResponseCache
+from src.scraper.rate_limiter import THROTTLED_STATUSES, RateLimiter
+
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 3
+
+
+class Fetcher:
+    """
+    Fetches IMDb pages over a pooled 'requests.Session' so TCP/TLS connections are kept alive and reused between
+    requests rather than being re-established for every page.
+
+    Args:
+        pool_connections: The number of per-host connection pools to cache.
+        pool_maxsize: The maximum number of connections kept alive per host.
+        pool_block: Whether to block when a host has no free connection rather than opening an extra, unpooled one.
+            Setting this to True turns 'pool_maxsize' into a hard per-host connection limit.
+        timeout: The number of seconds to wait for a response before giving up.
+        headers: Extra headers to send with every request.
+        cache: A ResponseCache consulted before, and filled after, every request.
+        rate_limiter: A RateLimiter every request waits on. Throttled (429/503) requests are retried once it lets
+            them through again, up to 'max_retries' times.
+        max_retries: The number of times a throttled request is retried when there is a rate limiter.
+
+    Attributes:
+        session: The underlying 'requests.Session'.
+        request_count: The number of requests sent by this fetcher, not counting pages served from the cache.
+    """
+    logger = logging.getLogger('Fetcher')
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 pool_block: bool = False, timeout: float = DEFAULT_TIMEOUT, headers: dict = None,
+                 cache: ResponseCache = None, rate_limiter: RateLimiter = None,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.request_count = 0
+        self.__count_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+        if headers:
+            self.session.headers.update(headers)
+
+    def get(self, url: str) -> requests.Response:
+        """
+        Sends a GET request for the given URL over the pooled session. When a cache is configured a fresh cached
+        page is returned without a request and a stale one is revalidated with a conditional GET.
+
+        Args:
+            url: The URL to fetch.
+
+        Returns:
+            The 'requests.Response' for the URL, or a CachedResponse if it was served from the cache.
+        """
+        with tracing.span("fetch", "fetch", url=url):
+            return self.__get(url)
+
+    def __get(self, url: str):
+        if self.cache is None:
+            return self.__send(url)
+
+        entry, fresh = self.cache.lookup(url)
+        if fresh:
+            self.logger.debug(f"Cache hit for {url}")
+            return CachedResponse(url, entry.content)
+
+        response = self.__send(url, headers=entry.validators() if entry is not None else None)
+        if entry is not None and response.status_code == 304:
+            self.cache.revalidated(url)
+            return CachedResponse(url, entry.content)
+        if response.status_code == 200:
+            self.cache.store(url, response.content, etag=response.headers.get("ETag"),
+                             last_modified=response.headers.get("Last-Modified"))
+        return response
+
+    def __send(self, url: str, headers: dict = None) -> requests.Response:
+        if self.rate_limiter is None:
+            return self.__send_once(url, headers)
+        for attempt in range(self.max_retries + 1):
+            permit = self.rate_limiter.acquire(url)
+            try:
+                response = self.__send_once(url, headers)
+            except Exception:
+                permit.release()
+                raise
+            permit.release(response.status_code, response.headers)
+            if response.status_code not in THROTTLED_STATUSES:
+                break
+            self.logger.warning(f"{url} was throttled with a {response.status_code} (attempt {attempt + 1})")
+        return response
+
+    def __send_once(self, url: str, headers: dict = None) -> requests.Response:
+        self.logger.debug(f"GET {url}")
+        with self.__count_lock:
+            self.request_count += 1
+        if not metrics.is_enabled():
+            return self.session.get(url, headers=headers, timeout=self.timeout)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except Exception:
+            metrics.inc("imdb_requests_total", status="error")
+            raise
+        record_response(response.status_code, len(response.content), time.perf_counter() - start)
+        return response
+
+    def close(self):
+        """
+        Closes the session and every pooled connection it holds.
+        """
+        self.session.close()
+
+
+def record_response(status: int, size: int, seconds: float):
+    """
+    Records a response in the 'imdb_request*' and 'imdb_response_bytes_total' metrics.
+    """
+    metrics.inc("imdb_requests_total", status=status)
+    metrics.inc("imdb_response_bytes_total", size)
+    metrics.observe("imdb_request_seconds", seconds)
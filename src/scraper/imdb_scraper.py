@@ -1,11 +1,13 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import logging
-import re
 
+from src.scraper import extractor
+from src.scraper.fetcher import Fetcher
+from src.scraper.parser import DEFAULT_PARSER, Region, validate_parser
+from src.scraper.page import Page, PersonDocument, TitleDocument
+from src.scraper.search_index import SearchIndex, get_path_for_id
 from src.model.person import Person
-from src.model.award import Award, AwardOrganisation
+from src.model.award import AwardOrganisation
 from src.model.title import Title
 from src.error.exception import ParseError
 
@@ -23,17 +25,193 @@ logging.basicConfig(format='%(asctime)s %(levelname)s %(process)d --- %(name)s %
                     level=logging.INFO)
 
 
+def build_search_url(query: str, base_url: str = BASE_URL) -> str:
+    """
+    Constructs an IMDB search URL for the given query string.
+
+    Args:
+        query: The name of the item to search IMDB for e.g. 'Leonardo DiCaprio' or 'Inception'
+        base_url: The scheme and host of the IMDb site to search.
+
+    Returns:
+        The IMDb search URL for the query.
+    """
+    query_word_list = query.lower().split(' ')
+    part_search_term = ""
+    for tw in query_word_list[:-1]:
+        part_search_term = part_search_term + tw + "+"
+    return base_url + SEARCH_PREFIX + part_search_term + query_word_list[-1] + SEARCH_SUFFIX
+
+
 class IMDbScraper:
+    """
+    Scrapes IMDb title and name pages.
+
+    The scraper offers two APIs. The stateful API ('load_*_page' followed by the 'get_*' getters) works on whichever
+    page was loaded last and so an instance must not be shared between threads while it is in use. The stateless API
+    ('fetch_title', 'fetch_person', 'scrape_title', 'scrape_person') keeps nothing on the instance and returns
+    documents to be read with the functions in 'src.scraper.extractor', so one scraper and its pooled Fetcher can be
+    shared by a whole thread pool.
+
+    Args:
+        fetcher: The Fetcher used for every HTTP request. A default pooled Fetcher is created if none is given.
+        search_index: A SearchIndex of previously resolved queries, consulted before and filled after every search.
+        parser: The name of the parser backend used for every page, see 'src.scraper.parser'.
+        base_url: The scheme and host every page is requested from e.g. a local replay server's, see
+            'benchmark.replay_server'.
+    """
     logger = logging.getLogger('IMDbScraper')
 
-    def __init__(self):
+    def __init__(self, fetcher: Fetcher = None, search_index: SearchIndex = None, parser: str = DEFAULT_PARSER,
+                 base_url: str = BASE_URL):
+        self.fetcher = fetcher if fetcher is not None else Fetcher()
+        self.parser = validate_parser(parser)
+        self.base_url = base_url.rstrip("/")
+        self.search_index = search_index
         self.soup = None
+        self.pages = {}
+        self.query = ""
         self.search_page_url = ""
         self.first_result_url = ""
         self.full_credits_url = ""
         self.awards_url = ""
         self.bio_url = ""
 
+    def resolve_first_result_url(self, query: str) -> str:
+        """
+        Searches IMDb for the query and returns the URL of the first result. The search is skipped if the query is
+        already in the scraper's search index.
+
+        Args:
+            query: The searched for title or person.
+
+        Returns:
+            The URL of the first search result's main page.
+        """
+        return self.base_url + self.__resolve_first_result_path(
+            query, lambda url: self.__new_page(url, extractor.SEARCH_REGION))
+
+    def fetch_title(self, query: str) -> TitleDocument:
+        """
+        Resolves the first IMDb title matching the query. The title's pages are downloaded when first read.
+
+        Args:
+            query: The searched for title.
+
+        Returns:
+            A TitleDocument to be read with the 'src.scraper.extractor' functions.
+        """
+        return self.get_title_document(self.resolve_first_result_url(query))
+
+    def fetch_person(self, query: str) -> PersonDocument:
+        """
+        Resolves the first IMDb person matching the query. The person's pages are downloaded when first read.
+
+        Args:
+            query: The searched for person.
+
+        Returns:
+            A PersonDocument to be read with the 'src.scraper.extractor' functions.
+        """
+        return self.get_person_document(self.resolve_first_result_url(query))
+
+    def fetch_title_by_id(self, imdb_id: str) -> TitleDocument:
+        """
+        Builds the document for an IMDb title ID directly, without a search.
+
+        Args:
+            imdb_id: The IMDb title ID e.g. 'tt0468569'.
+
+        Returns:
+            A TitleDocument to be read with the 'src.scraper.extractor' functions.
+        """
+        return self.get_title_document(self.base_url + get_path_for_id(imdb_id))
+
+    def fetch_person_by_id(self, imdb_id: str) -> PersonDocument:
+        """
+        Builds the document for an IMDb name ID directly, without a search.
+
+        Args:
+            imdb_id: The IMDb name ID e.g. 'nm0000288'.
+
+        Returns:
+            A PersonDocument to be read with the 'src.scraper.extractor' functions.
+        """
+        return self.get_person_document(self.base_url + get_path_for_id(imdb_id))
+
+    def get_title_document(self, url: str) -> TitleDocument:
+        """
+        Builds the TitleDocument for an IMDb title main page URL.
+
+        Args:
+            url: The URL of the title's main page e.g. 'https://www.imdb.com/title/tt0468569/'.
+        """
+        if TITLE_SIGNATURE not in url:
+            raise Exception(f"{url} is not an IMDb title page. Cannot create a TitleDocument.")
+        return TitleDocument(url=url, main=self.__new_page(url),
+                             full_credits=self.__new_page(url + FULL_CREDITS_SUFFIX, extractor.FULL_CREDITS_REGION))
+
+    def get_person_document(self, url: str) -> PersonDocument:
+        """
+        Builds the PersonDocument for an IMDb name main page URL.
+
+        Args:
+            url: The URL of the person's main page e.g. 'https://www.imdb.com/name/nm0000288/'.
+        """
+        if NAME_SIGNATURE not in url:
+            raise Exception(f"{url} is not an IMDb name page. Cannot create a PersonDocument.")
+        return PersonDocument(url=url, main=self.__new_page(url),
+                              bio=self.__new_page(url + BIO_SUFFIX, extractor.BIO_REGION),
+                              awards=self.__new_page(url + AWARDS_SUFFIX, extractor.AWARDS_REGION))
+
+    def scrape_title(self, query: str) -> (Title, dict):
+        """
+        Scrapes the first IMDb title matching the query without touching any instance state.
+
+        Args:
+            query: The searched for title.
+
+        Returns:
+            A Title object and a dict of its relations.
+        """
+        return self.__scrape_title_document(self.fetch_title(query))
+
+    def scrape_title_by_id(self, imdb_id: str) -> (Title, dict):
+        """
+        Scrapes an IMDb title by its ID without a search and without touching any instance state.
+
+        Args:
+            imdb_id: The IMDb title ID e.g. 'tt0468569'.
+
+        Returns:
+            A Title object and a dict of its relations.
+        """
+        return self.__scrape_title_document(self.fetch_title_by_id(imdb_id))
+
+    def scrape_person(self, query: str) -> (Person, dict):
+        """
+        Scrapes the first IMDb person matching the query without touching any instance state.
+
+        Args:
+            query: The searched for person.
+
+        Returns:
+            A Person object and a dict of their awards.
+        """
+        return self.__scrape_person_document(self.fetch_person(query))
+
+    def scrape_person_by_id(self, imdb_id: str) -> (Person, dict):
+        """
+        Scrapes an IMDb person by their ID without a search and without touching any instance state.
+
+        Args:
+            imdb_id: The IMDb name ID e.g. 'nm0000288'.
+
+        Returns:
+            A Person object and a dict of their awards.
+        """
+        return self.__scrape_person_document(self.fetch_person_by_id(imdb_id))
+
     def load_title_page(self, query):
         """
         Loads the first IMDb title page based on query into 'soup' object and initialises the necessary URLs for
@@ -61,6 +239,37 @@ class IMDbScraper:
         self.set_bio_url()
         self.full_credits_url = ""
 
+    def load_title_by_id(self, imdb_id: str):
+        """
+        Loads the IMDb title page for an ID into 'soup' object without searching for it and initialises the
+        necessary URLs for scraping the page of the desired content.
+
+        Args:
+            imdb_id: The IMDb title ID e.g. 'tt0468569'.
+        """
+        self.logger.info(f"Loading title page for {imdb_id}")
+        if not imdb_id.startswith("tt"):
+            raise ValueError(f"{imdb_id} is not an IMDb title ID.")
+        self.__initialise_soup_and_urls_for_id(imdb_id)
+        self.set_full_credits_url()
+        self.awards_url = ""
+
+    def load_person_by_id(self, imdb_id: str):
+        """
+        Loads the IMDb name page for an ID into 'soup' object without searching for it and initialises the
+        necessary URLs for scraping the page of the desired content.
+
+        Args:
+            imdb_id: The IMDb name ID e.g. 'nm0000288'.
+        """
+        self.logger.info(f"Loading person page for {imdb_id}")
+        if not imdb_id.startswith("nm"):
+            raise ValueError(f"{imdb_id} is not an IMDb name ID.")
+        self.__initialise_soup_and_urls_for_id(imdb_id)
+        self.set_awards_url()
+        self.set_bio_url()
+        self.full_credits_url = ""
+
     def get_title_contents(self) -> Title:
         """
         Scrapes an IMDb title page for contents.
@@ -70,6 +279,7 @@ class IMDbScraper:
         """
         self.logger.info(f"Getting title contents from {self.first_result_url}")
         return Title(
+            imdb_id=extractor.get_imdb_id(self.first_result_url),
             name=self.get_title_name(),
             summary=self.get_title_summary(),
             released=self.get_title_release_year(),
@@ -87,7 +297,8 @@ class IMDbScraper:
             A Person object containing all the scraped data.
         """
         self.logger.info(f"Getting person contents from {self.first_result_url}")
-        return Person(name=self.get_person_name(), date_of_birth=self.get_person_dob(), bio=self.get_person_bio())
+        return Person(name=self.get_person_name(), date_of_birth=self.get_person_dob(), bio=self.get_person_bio(),
+                      imdb_id=extractor.get_imdb_id(self.first_result_url))
 
     def get_title_relation_contents(self) -> dict:
         """
@@ -127,12 +338,8 @@ class IMDbScraper:
         Args:
             query: The name of the item to search IMDB for e.g. 'Leonardo DiCaprio' or 'Inception'
         """
-        query_word_list = query.lower().split(' ')
-        part_search_term = ""
-        for tw in query_word_list[:-1]:
-            part_search_term = part_search_term + tw + "+"
-        search_url = BASE_URL + SEARCH_PREFIX + part_search_term + query_word_list[-1] + SEARCH_SUFFIX
-        self.search_page_url = search_url
+        self.query = query
+        self.search_page_url = build_search_url(query, self.base_url)
 
     def set_first_result_url(self):
         """
@@ -141,15 +348,11 @@ class IMDbScraper:
         if SEARCH_SUFFIX not in self.search_page_url:
             raise Exception("An IMDb search page is not loaded. Cannot create first_result_url.")
 
-        search_results = requests.get(self.search_page_url)
-        self.soup = BeautifulSoup(search_results.content, 'html.parser')
-
-        search_results_table = self.soup.find(class_="findList")
-        first_result = search_results_table.find_all('a')[0]
-        result_suffix = first_result.get('href')
-        result_suffix = result_suffix[:result_suffix.rfind('/')+1]
-        first_result_url = BASE_URL + result_suffix
-        self.first_result_url = first_result_url
+        def load_search_page(url):
+            page = self.__load_page(url, extractor.SEARCH_REGION)
+            self.soup = page.soup
+            return page
+        self.first_result_url = self.base_url + self.__resolve_first_result_path(self.query, load_search_page)
 
     def set_full_credits_url(self):
         """
@@ -185,8 +388,7 @@ class IMDbScraper:
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title name.")
         self.__load_soup_with_first_result_page()
-        headers = self.soup.find_all("h1")
-        return headers[0].contents[0].string.strip()
+        return extractor.get_title_name(self.soup)
 
     def get_title_summary(self) -> str:
         """
@@ -198,12 +400,7 @@ class IMDbScraper:
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title summary.")
         self.__load_soup_with_first_result_page()
-        title_summary = self.soup.find(class_="summary_text")
-        summary_string = ""
-        for item in title_summary.contents:
-            summary_string += self.__remove_html_elements_from_string(item.string)
-        summary_string = ' '.join(summary_string.split())
-        return summary_string
+        return extractor.get_title_summary(self.soup)
 
     def get_title_release_year(self) -> int:
         """
@@ -215,8 +412,7 @@ class IMDbScraper:
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title release year.")
         self.__load_soup_with_first_result_page()
-        title_year = self.soup.find(id="titleYear")
-        return int(title_year.find('a').text.strip())
+        return extractor.get_title_release_year(self.soup)
 
     def get_title_certificate_rating(self) -> str:
         """
@@ -228,8 +424,7 @@ class IMDbScraper:
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title certificate rating.")
         self.__load_soup_with_first_result_page()
-        subtext = self.soup.find(class_="subtext")
-        return str(subtext.contents[0]).replace("\n", "").strip()
+        return extractor.get_title_certificate_rating(self.soup)
 
     def get_title_length_in_mins(self) -> int:
         """
@@ -241,9 +436,7 @@ class IMDbScraper:
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title length in minutes.")
         self.__load_soup_with_first_result_page()
-        subtext = self.soup.find(class_="subtext")
-        film_length_str = subtext.find('time').text.strip()
-        return self.__parse_title_length(film_length_str)
+        return extractor.get_title_length_in_mins(self.soup)
 
     def get_title_storyline(self) -> str:
         """
@@ -255,10 +448,7 @@ class IMDbScraper:
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title storyline.")
         self.__load_soup_with_first_result_page()
-        storyline = self.soup.find(class_="inline canwrap")
-        storyline_raw = self.__remove_html_elements_from_string(storyline.contents[1].text)
-        storyline_clean = storyline_raw.strip().replace("\n", " ")
-        return storyline_clean
+        return extractor.get_title_storyline(self.soup)
 
     def get_title_tagline(self) -> str:
         """
@@ -270,12 +460,7 @@ class IMDbScraper:
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title tagline.")
         self.__load_soup_with_first_result_page()
-        txt_block_tags = self.soup.findAll("div", {"class": "txt-block"})
-        raw_tagline = self.__remove_html_elements_from_string(txt_block_tags[0].text)
-        start = raw_tagline.find("Taglines:") + len("Taglines:")
-        end = raw_tagline.find("See more")
-        tagline_clean = raw_tagline[start:end].strip()
-        return tagline_clean
+        return extractor.get_title_tagline(self.soup)
 
     def get_title_genres(self) -> list:
         """
@@ -287,13 +472,7 @@ class IMDbScraper:
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title genres.")
         self.__load_soup_with_first_result_page()
-        subtext = self.soup.find_all(class_="see-more inline canwrap")[1]
-        potential_genres = subtext.find_all('a')
-        genres = []
-        for pg in potential_genres:
-            if 'genre' in pg['href']:
-                genres.append(pg.text.strip())
-        return genres
+        return extractor.get_title_genres(self.soup)
 
     def get_title_cast(self) -> dict:
         """
@@ -305,19 +484,8 @@ class IMDbScraper:
         """
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title cast.")
-
-        cast_list_table = self.soup.find(class_="cast_list")
-        cast_trs = cast_list_table.find_all('tr')
-
-        cast_map = {}
-        for member in cast_trs:
-            cast_tds = member.find_all('td')
-            if self.__main_cast_obtained(cast_tds):
-                break
-            if len(cast_tds) > 1:
-                actor_name, character = self.__extract_actor_and_character(cast_tds)
-                cast_map[actor_name] = character
-        return cast_map
+        self.__load_soup_with_first_result_page()
+        return extractor.get_title_cast(self.soup)
 
     def get_title_directors(self) -> list:
         """
@@ -329,11 +497,7 @@ class IMDbScraper:
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title director(s).")
         self.__load_soup_with_full_credits_page()
-
-        director_credits = self.__get_table_for(block="fullcredits_content", header="Directed by")
-        director_anchors = director_credits.find_all("a")
-
-        return [x.contents[0].string.strip() for x in director_anchors]
+        return extractor.get_title_directors(self.soup)
 
     def get_title_writers(self) -> dict:
         """
@@ -344,17 +508,8 @@ class IMDbScraper:
         """
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title writer(s).")
-
         self.__load_soup_with_full_credits_page()
-        writer_credits = self.__get_table_for(block="fullcredits_content", header="Writing Credits")
-
-        writer_name_anchors = writer_credits.find_all("a")
-        writer_role_tags = writer_credits.find_all(class_="credit")
-
-        writer_names = [x.contents[0].string.strip() for x in writer_name_anchors]
-        writer_roles = [self.__extract_role(x.contents[0].string) for x in writer_role_tags]
-
-        return self.__zip_names_and_roles(writer_names, writer_roles)
+        return extractor.get_title_writers(self.soup)
 
     def get_title_producers(self) -> dict:
         """
@@ -366,15 +521,7 @@ class IMDbScraper:
         if TITLE_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb title page is not loaded. Cannot extract title producer(s).")
         self.__load_soup_with_full_credits_page()
-        producer_credits = self.__get_table_for(block="fullcredits_content", header="Produced by")
-
-        producer_name_anchors = producer_credits.find_all("a")
-        producer_role_tags = producer_credits.find_all(class_="credit")
-
-        producer_names = [x.contents[0].string.strip() for x in producer_name_anchors]
-        producer_roles = [x.contents[0].string.strip() for x in producer_role_tags]
-
-        return self.__zip_names_and_roles(producer_names, producer_roles)
+        return extractor.get_title_producers(self.soup)
 
     def get_person_name(self) -> str:
         """
@@ -386,9 +533,7 @@ class IMDbScraper:
         if NAME_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb name page is not loaded. Cannot extract person name.")
         self.__load_soup_with_first_result_page()
-        headers = self.soup.find_all("h1")
-        item_prop = headers[0].find(class_="itemprop")
-        return item_prop.contents[0].string.strip()
+        return extractor.get_person_name(self.soup)
 
     def get_person_dob(self) -> datetime:
         """
@@ -400,13 +545,11 @@ class IMDbScraper:
         if NAME_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb name page is not loaded. Cannot extract person date of birth.")
         self.__load_soup_with_first_result_page()
-        date_info = self.soup.find("time")
-        if date_info is None:
+        try:
+            return extractor.get_person_dob(self.soup)
+        except ParseError:
             self.logger.error(f"Could not extract person date of birth from {self.first_result_url}.")
-            raise ParseError("Could not extract person date of birth.")
-        dob_str = date_info["datetime"]
-        year, month, day = dob_str.split("-")
-        return datetime(year=int(year), month=int(month), day=int(day))
+            raise
 
     def get_person_bio(self) -> str:
         """
@@ -418,13 +561,7 @@ class IMDbScraper:
         if NAME_SIGNATURE not in self.first_result_url:
             raise Exception("An IMDb name page is not loaded. Cannot extract person date of birth.")
         self.__load_soup_with_bio_page()
-        bio_block = self.soup.find(class_="soda odd")
-        raw_bio = bio_block.find("p").contents
-        bio_list = [str(x) for x in raw_bio]
-        bio = "".join(bio_list)
-        bio = bio.replace("<br>", "\n").replace("<br/>", "\n").replace("</br>", "\n").strip()
-        bio = self.__remove_html_elements_from_string(bio)
-        return bio
+        return extractor.get_person_bio(self.soup)
 
     def get_awards_for_organisation(self, organisation: str) -> list:
         """
@@ -436,25 +573,7 @@ class IMDbScraper:
         if NAME_SIGNATURE not in self.awards_url:
             raise Exception("An IMDb name awards page is not loaded. Cannot extract {0}.".format(organisation))
         self.__load_soup_with_awards_page()
-        awards = []
-        awards_table = self.__get_table_for(block="article listo", header=organisation)
-        award_items = awards_table.find_all("tr")
-        ay_marker, ao_marker = 0, ""
-        for i in range(0, len(award_items)):
-            award_name = award_items[i].find(class_="award_description").contents[0].string.strip()
-            if award_name is None or award_name == "":
-                award_name = award_items[i].find(class_="award_category").contents[0].string.strip()
-            award_year, ay_marker = self.__set_award_year(award_items[i], ay_marker)
-            award_outcome, ao_marker = self.__set_award_outcome(award_items[i], ao_marker)
-            award_title_row = award_items[i].find("a", href=re.compile("title"))
-            if award_title_row is None:
-                continue
-            award_title_name = award_title_row.contents[0].string.strip()
-            award_title_release = int(
-                award_items[i].find(class_="title_year").contents[0].string.strip().replace('(', '').replace(')', ''))
-            awards.append(Award(name=award_name, outcome=award_outcome, year=award_year, title_name=award_title_name,
-                                title_released=award_title_release))
-        return awards
+        return extractor.get_awards_for_organisation(self.soup, organisation)
 
     def __initialise_soup_and_urls(self, query: str):
         """
@@ -463,228 +582,83 @@ class IMDbScraper:
         Args:
             query: The search term used to generate the IMDb URLs.
         """
+        self.pages = {}
         self.set_search_url(query)
         self.set_first_result_url()
         self.__load_soup_with_first_result_page()
 
+    def __initialise_soup_and_urls_for_id(self, imdb_id: str):
+        """
+        Sets the first result url straight from an IMDb ID and loads the soup object with its HTML.
+
+        Args:
+            imdb_id: The IMDb ID used to generate the IMDb URLs.
+        """
+        self.pages = {}
+        self.query = imdb_id
+        self.search_page_url = ""
+        self.first_result_url = self.base_url + get_path_for_id(imdb_id)
+        self.__load_soup_with_first_result_page()
+
+    def __scrape_title_document(self, document: TitleDocument) -> (Title, dict):
+        self.logger.info(f"Scraping title contents from {document.url}")
+        return extractor.get_title_contents(document), extractor.get_title_relation_contents(document)
+
+    def __scrape_person_document(self, document: PersonDocument) -> (Person, dict):
+        self.logger.info(f"Scraping person contents from {document.url}")
+        return extractor.get_person_contents(document), extractor.get_person_relation_contents(document)
+
+    def __resolve_first_result_path(self, query: str, load_search_page) -> str:
+        """
+        Returns the first result path for a query from the search index, or from the search page loaded by
+        'load_search_page' if the query is not indexed yet.
+        """
+        if self.search_index is not None:
+            path = self.search_index.get(query)
+            if path is not None:
+                return path
+        path = extractor.get_first_result_path(load_search_page(build_search_url(query, self.base_url)).soup)
+        if self.search_index is not None:
+            self.search_index.put(query, path)
+        return path
+
     def __load_soup_with_first_result_page(self):
         if (NAME_SIGNATURE not in self.first_result_url) and (TITLE_SIGNATURE not in self.first_result_url):
             raise Exception("An IMDb name or title page is not loaded. Cannot load soup with first_result_url.")
-        first_result_page = requests.get(self.first_result_url)
-        self.soup = BeautifulSoup(first_result_page.content, 'html.parser')
+        self.soup = self.__load_page(self.first_result_url).soup
 
     def __load_soup_with_bio_page(self):
         if NAME_SIGNATURE not in self.awards_url:
             raise Exception("An IMDb name page is not loaded. Cannot load soup with bio_url.")
-        bio_page = requests.get(self.bio_url)
-        self.soup = BeautifulSoup(bio_page.content, 'html.parser')
+        self.soup = self.__load_page(self.bio_url, extractor.BIO_REGION).soup
 
     def __load_soup_with_full_credits_page(self):
         if TITLE_SIGNATURE not in self.full_credits_url:
             raise Exception("An IMDb title page is not loaded. Cannot load soup with full_credits_url.")
-        full_credits_page = requests.get(self.full_credits_url)
-        self.soup = BeautifulSoup(full_credits_page.content, 'html.parser')
+        self.soup = self.__load_page(self.full_credits_url, extractor.FULL_CREDITS_REGION).soup
 
     def __load_soup_with_awards_page(self):
         if NAME_SIGNATURE not in self.awards_url:
             raise Exception("An IMDb name page is not loaded. Cannot load soup with awards_url.")
-        awards_page = requests.get(self.awards_url)
-        self.soup = BeautifulSoup(awards_page.content, 'html.parser')
-
-    def __get_table_for(self, block: str, header: str):
-        """
-        Extracts a block from the HTML loaded into the soup object as defined by its 'id' or 'class' and then
-        extracts a table pertaining to a particular header on the IMDb page.
-
-        Args:
-            block: The html block the table of interested is located in.
-            header: The header of the table.
-
-        Returns:
-            A soup ResultSet containing the table desired.
-        """
-        if "credit" in block:
-            table_block = self.soup.find(id=block)
-        elif "article listo" in block:
-            table_block = self.soup.find(class_=block)
-        for i in range(0, len(table_block.contents)):
-            if header in str(table_block.contents[i]):
-                return table_block.contents[i + 2]
+        self.soup = self.__load_page(self.awards_url, extractor.AWARDS_REGION).soup
 
-        raise Exception("Could not find table for header: " + header)
+    def __new_page(self, url: str, region: Region = None) -> Page:
+        return Page(url, fetcher=self.fetcher, parser=self.parser, region=region)
 
-    @staticmethod
-    def __set_award_year(award_item, ay_marker) -> (int, int):
+    def __load_page(self, url: str, region: Region = None) -> Page:
         """
-        A method to help with the parsing of award information. An award year marker ('ay_marker') is kept in the
-        event a person is up for multiple awards in the same year and parsing of the table does not follow the
-        typical row by row format.
+        Returns the page for the given URL, fetching it only if it has not already been fetched since the last
+        'load_*_page' call.
 
         Args:
-            award_item: The soup item representing a row on the awards table.
-            ay_marker: A year marker to use as a fallback for year assignment in the event of multiple award
-                win/nominations in one year.
+            url: The URL of the IMDb page.
+            region: The Region declaring the parts of the page to parse, see 'src.scraper.extractor'.
 
         Returns:
-            The parsed award year and the award year marker.
+            A Page object holding the HTML of the requested URL.
         """
-        try:
-            award_year = int(award_item.find("a", href=re.compile("event")).contents[0].string.strip())
-            ay_marker = award_year
-        except:
-            if ay_marker != 0:
-                award_year = ay_marker
-            else:
-                raise ParseError("Unable to parse award year")
-        return award_year, ay_marker
-
-    @staticmethod
-    def __set_award_outcome(award_item, ao_marker) -> (str, str):
-        """
-        A method to help with the parsing of award information. An award outcome marker ('ao_marker') is kept in the
-        event a person is up for multiple awards in the same year and parsing of the table does not follow the
-        typical row by row format.
-
-        Args:
-            award_item: The soup item representing a row on the awards table.
-            ay_marker: An outcome marker to use as a fallback for outcome assignment in the event of multiple award
-                win/nominations in one year.
-
-        Returns:
-            The parsed award outcome and the award outcome marker.
-        """
-        try:
-            award_outcome = award_item.find(class_="award_outcome").contents[1].contents[0].string.strip()
-            ao_marker = award_outcome
-        except:
-            if ao_marker != "":
-                award_outcome = ao_marker
-            else:
-                raise ParseError("Unable to parse award outcome")
-        return award_outcome, ao_marker
-
-    @staticmethod
-    def __main_cast_obtained(cast_td) -> bool:
-        """
-        A method to determine when to stop parsing the cast. This will prevent a bloated database as only the most
-        relevant cast will be stored.
-
-        Args:
-            cast_tds: An HTML <td> object containing a cast member or a string denoting where the rest of the cast
-                will be listed alphabetically from here on in.
-
-        Returns:
-            A bool to determine whether all of the main cast has been scraped yet or not.
-        """
-        if len(cast_td) == 1:
-            try:
-                if "Rest of cast listed alphabetically:" in cast_td[0].contents[0].strip():
-                    return True
-            except Exception as e:
-                pass
-        return False
-
-    @staticmethod
-    def __extract_actor_and_character(cast_td) -> (str, list):
-        """
-        A method that extracts an actor name and character list from an IMDb cast table row.
-
-        Args:
-            cast_td: An HTML <td> object containing a cast member and their portrayed character(s) for a particular
-            title.
-
-        Returns:
-            The actor name in a string and a list of strings of portrayed characters.
-        """
-        actor_name = cast_td[1].find('a').string.replace("\n", "").strip()
-        try:
-            character = [c.string.strip() for c in cast_td[3].find_all('a')]
-        except:
-            character = [cast_td[3].contents[0].strip()]
-        return actor_name, character
-
-    @staticmethod
-    def __extract_role(string: str) -> str:
-        """
-        Extracts the role of a person from it's parentheses.
-
-        Args:
-            string: The role of a person wrapped in parentheses e.g. (producer)
-
-        Returns:
-            The role of a person free from it's parentheses e.g. producer
-        """
-        start = string.find('(')
-        end = string.find(')')
-        return string[start+1:end]
-
-    @staticmethod
-    def __zip_names_and_roles(names: list, roles: list) -> dict:
-        """
-        Given a lists people names and roles, they are zipped to form a dict of names (key) and lists of roles (value).
-        The ith name in names has their role in the ith index of roles. Given the same name in names, a list of roles
-        with length > 1 will be formed.
-
-        Args:
-            names: A list of people names.
-            roles: A list of people roles.
-
-        Returns:
-            A zipped dict of names (key) to list of roles (value).
-        """
-        writer_map = {}
-        len_wn, len_wr = len(names), len(roles)
-        if len_wn != len_wr:
-            raise ValueError("Length of writer names: {0} is not equal to length of writer roles: {1}".format(
-                len_wn, len_wr))
-        for i in range(0, len_wn):
-            name, role = names[i], roles[i]
-            if writer_map.get(name):
-                writer_map[name].append(role)
-            else:
-                writer_map[name] = [role]
-
-        return writer_map
-
-    @staticmethod
-    def __parse_title_length(title_length: str) -> int:
-        """
-        A private function to parse the film length string obtained from an IMDB title page and
-        represent it as an integer of film length in minutes.
-
-        Args:
-            title_length: A string representing title length in format '1h 23min'
-
-        Returns:
-            An integer representing the title length in minutes.
-        """
-        hrs_and_mins = title_length.split(' ')
-        hrs, mins = ("", "")
-        for i in range(0, len(hrs_and_mins)):
-            if "h" in hrs_and_mins[i]:
-                hrs = hrs_and_mins[i].replace("h", "")
-            elif "min" in hrs_and_mins[i]:
-                mins = hrs_and_mins[i].replace("min", "")
-        hrs_int = int(hrs) if hrs else 0
-        mins_int = int(mins) if mins else 0
-
-        return (hrs_int * 60) + mins_int
-
-    @staticmethod
-    def __remove_html_elements_from_string(string: str):
-        """
-        A private function that removes all html tags from a given string.
-
-        Args:
-            string: The string that requires the removal of HTML tags.
-
-        Returns:
-            A new HTML tag-free string.
-        """
-        start = string.find('<')
-        end = string.find('>')
-        while start != -1 and end != -1:
-            string = string[:start] + string[end + 1:]
-            start = string.find('<')
-            end = string.find('>')
-        return string
+        page = self.pages.get(url)
+        if page is None:
+            page = self.__new_page(url, region)
+            self.pages[url] = page
+        return page
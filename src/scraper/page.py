@@ -0,0 +1,95 @@
+import threading
+
+from bs4 import BeautifulSoup
+
+from src.error.exception import FetchError
+from src.scraper.parser import DEFAULT_PARSER, Region, parse
+
+
+class Page:
+    """
+    A model class for a single IMDb page. The HTML is only fetched the first time it is needed and only parsed into
+    a soup object the first time that is needed, after which both are reused. Loading is guarded by a lock so one
+    Page can be shared between threads.
+
+    Args:
+        url: The URL of the page.
+        content: The raw HTML of the page, if it has already been downloaded.
+        fetcher: The Fetcher used to download the page when no content is given.
+        parser: The name of the parser backend used to build the soup object.
+        region: The Region declaring the only parts of the page the extractors read, see 'src.scraper.extractor'.
+            The whole page is parsed if None.
+    """
+
+    def __init__(self, url: str, content=None, fetcher=None, parser: str = DEFAULT_PARSER,
+                 region: Region = None):
+        if content is None and fetcher is None:
+            raise ValueError("A Page needs either its content or a fetcher to download it with.")
+        self.url = url
+        self.fetcher = fetcher
+        self.parser = parser
+        self.region = region
+        self.__content = content
+        self.__soup = None
+        self.__lock = threading.Lock()
+
+    @property
+    def content(self):
+        """
+        The raw HTML of the page, downloaded on first access. Raises a FetchError if the page could not be
+        downloaded, e.g. a 404 or a 429/503 that outlasted the Fetcher's retries.
+        """
+        if self.__content is None:
+            with self.__lock:
+                if self.__content is None:
+                    response = self.fetcher.get(self.url)
+                    if response.status_code != 200:
+                        raise FetchError(f"GET {self.url} failed with a {response.status_code}.")
+                    self.__content = response.content
+        return self.__content
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """
+        The parsed HTML of the page, built on first access.
+        """
+        if self.__soup is None:
+            content = self.content
+            with self.__lock:
+                if self.__soup is None:
+                    self.__soup = parse(content, self.parser, self.region)
+        return self.__soup
+
+
+class TitleDocument:
+    """
+    The set of IMDb pages that make up a title.
+
+    Args:
+        url: The URL of the title's main page.
+        main: The title's main page.
+        full_credits: The title's full credits page.
+    """
+
+    def __init__(self, url: str, main: Page, full_credits: Page):
+        self.url = url
+        self.main = main
+        self.full_credits = full_credits
+
+
+class PersonDocument:
+    """
+    The set of IMDb pages that make up a person.
+
+    Args:
+        url: The URL of the person's main page.
+        main: The person's main page.
+        bio: The person's bio page.
+        awards: The person's awards page.
+    """
+
+    def __init__(self, url: str, main: Page, bio: Page, awards: Page):
+        self.url = url
+        self.main = main
+        self.bio = bio
+        self.awards = awards
@@ -0,0 +1,231 @@
+"""
+Per-host pacing for page fetches. Every host gets a token bucket, capping its request rate, and an adaptive
+concurrency limit that follows AIMD (additive increase, multiplicative decrease): each request that comes back
+quickly raises the limit by roughly one per round trip, while a throttling response (429/503) halves it and a response
+much slower than the host's usual latency trims it. Slow responses still pull the usual latency towards them, more
+gently than fast ones, so a host that gets slower for good, or serves much larger pages than the first one fetched, is
+soon judged against its new latency instead of being trimmed down to the minimum. A 'Retry-After' header pauses the host for as long as it asks.
+The result is that a crawl settles at the highest request rate the host will sustain without hand-tuned sleeps.
+"""
+import asyncio
+from email.utils import parsedate_to_datetime
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+THROTTLED_STATUSES = (429, 503)
+
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 10
+DEFAULT_INITIAL_CONCURRENCY = 4
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_BACKOFF = 1.0
+DEFAULT_LATENCY_TOLERANCE = 3.0
+
+# The most a host waits between polls for a free slot when there is no better estimate.
+POLL_INTERVAL = 0.05
+# The weight of each new latency sample in the smoothed baseline.
+LATENCY_SMOOTHING = 0.1
+# The weight of a sample slower than the baseline's tolerance, lower so one slow page barely moves the baseline.
+SLOW_LATENCY_SMOOTHING = 0.05
+
+
+def parse_retry_after(value: str, now: float = None) -> float:
+    """
+    Args:
+        value: A 'Retry-After' header, either a number of seconds or an HTTP date.
+        now: The current time as a UNIX timestamp. Defaults to 'time.time()'.
+
+    Returns:
+        The number of seconds to wait, or None if the header is missing or malformed.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - (now if now is not None else time.time()))
+    except (TypeError, ValueError):
+        return None
+
+
+class HostLimiter:
+    """
+    The token bucket and AIMD concurrency limit of a single host. All times are 'time.monotonic()' seconds.
+
+    Args:
+        rate: The sustained number of requests per second.
+        burst: The number of requests that can be sent back to back after an idle spell.
+        initial_concurrency: The number of requests allowed in flight to begin with.
+        min_concurrency: The lowest the concurrency limit is lowered to.
+        max_concurrency: The highest the concurrency limit is raised to.
+        backoff: The number of seconds the host is paused for after a throttling response without a 'Retry-After'.
+        latency_tolerance: How many times slower than the smoothed baseline a response must be to count as a sign of
+            overload.
+
+    Attributes:
+        limit: The current concurrency limit. Fractional, so it can grow by less than one request at a time.
+        in_flight: The number of requests currently in flight.
+        paused_until: The time until which no request may be sent.
+        baseline_latency: The smoothed latency of successful responses, slow ones weighted less.
+        throttled: The number of throttling responses seen.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 initial_concurrency: int = DEFAULT_INITIAL_CONCURRENCY,
+                 min_concurrency: int = DEFAULT_MIN_CONCURRENCY, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 backoff: float = DEFAULT_BACKOFF, latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE):
+        self.rate = rate
+        self.burst = burst
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(max(min_concurrency, min(initial_concurrency, max_concurrency)))
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.baseline_latency = None
+        self.throttled = 0
+        self.__tokens = float(burst)
+        self.__refilled_at = time.monotonic()
+        self.__decreased_at = 0.0
+        self.__lock = threading.Lock()
+
+    def try_acquire(self, now: float = None) -> float:
+        """
+        Takes a slot and a token if both are free.
+
+        Returns:
+            0 if the request may be sent now, otherwise the number of seconds to wait before trying again.
+        """
+        now = time.monotonic() if now is None else now
+        with self.__lock:
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.in_flight >= int(self.limit):
+                return POLL_INTERVAL
+            self.__refill(now)
+            if self.__tokens < 1:
+                return (1 - self.__tokens) / self.rate
+            self.__tokens -= 1
+            self.in_flight += 1
+            return 0.0
+
+    def release(self, latency: float, status: int = None, retry_after: float = None, now: float = None):
+        """
+        Frees the slot of a finished request and adjusts the concurrency limit by how it went.
+
+        Args:
+            latency: The number of seconds the request took.
+            status: The response status code, or None if the request failed without one.
+            retry_after: The number of seconds the host asked to be left alone for, if any.
+        """
+        now = time.monotonic() if now is None else now
+        with self.__lock:
+            self.in_flight -= 1
+            if status in THROTTLED_STATUSES:
+                self.throttled += 1
+                self.paused_until = max(self.paused_until,
+                                        now + (retry_after if retry_after is not None else self.backoff))
+                self.__decrease(now, 0.5)
+            elif status is None:
+                self.__decrease(now, 0.5)
+            elif self.baseline_latency is not None and latency > self.baseline_latency * self.latency_tolerance:
+                self.__decrease(now, 0.9)
+                self.__smooth(latency, SLOW_LATENCY_SMOOTHING)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                self.__smooth(latency, LATENCY_SMOOTHING)
+
+    def __smooth(self, latency: float, weight: float):
+        self.baseline_latency = latency if self.baseline_latency is None else \
+            (1 - weight) * self.baseline_latency + weight * latency
+
+    def __decrease(self, now: float, factor: float):
+        # Requests in flight when the host became overloaded all report it; only the first of a round trip counts.
+        if now - self.__decreased_at < (self.baseline_latency or 0.0):
+            return
+        self.__decreased_at = now
+        self.limit = max(self.min_concurrency, self.limit * factor)
+
+    def __refill(self, now: float):
+        self.__tokens = min(self.burst, self.__tokens + max(0.0, now - self.__refilled_at) * self.rate)
+        self.__refilled_at = max(now, self.__refilled_at)
+
+
+class Permit:
+    """
+    A slot to send one request to a host, returned to its RateLimiter with 'release'.
+    """
+
+    def __init__(self, host: HostLimiter):
+        self.host = host
+        self.started = time.monotonic()
+
+    def release(self, status: int = None, headers: dict = None):
+        """
+        Args:
+            status: The response status code, or None if the request failed without one.
+            headers: The response headers, read for 'Retry-After'.
+        """
+        retry_after = parse_retry_after(headers.get("Retry-After")) if headers else None
+        self.host.release(time.monotonic() - self.started, status, retry_after)
+
+
+class RateLimiter:
+    """
+    Paces requests per host, see the module docstring. Shared by every thread of a Fetcher, or every task of an
+    AsyncIMDbScraper; blocking and asyncio callers can share one limiter.
+
+    Args:
+        host_options: Keyword arguments of the HostLimiter created for each new host, e.g. 'rate' or
+            'max_concurrency'.
+    """
+    logger = logging.getLogger('RateLimiter')
+
+    def __init__(self, **host_options):
+        self.host_options = host_options
+        self.__hosts = {}
+        self.__lock = threading.Lock()
+
+    def get_host(self, url: str) -> HostLimiter:
+        host = urlsplit(url).netloc
+        with self.__lock:
+            if host not in self.__hosts:
+                self.__hosts[host] = HostLimiter(**self.host_options)
+            return self.__hosts[host]
+
+    def acquire(self, url: str) -> Permit:
+        """
+        Blocks until a request may be sent to the URL's host.
+        """
+        host = self.get_host(url)
+        while True:
+            wait = host.try_acquire()
+            if not wait:
+                return Permit(host)
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str) -> Permit:
+        """
+        Waits, without blocking the event loop, until a request may be sent to the URL's host.
+        """
+        host = self.get_host(url)
+        while True:
+            wait = host.try_acquire()
+            if not wait:
+                return Permit(host)
+            await asyncio.sleep(wait)
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            A dict of host to its current concurrency limit, baseline latency and throttling responses seen.
+        """
+        with self.__lock:
+            return {name: {"limit": round(h.limit, 2), "baseline_latency": h.baseline_latency,
+                           "throttled": h.throttled} for name, h in self.__hosts.items()}
@@ -0,0 +1,164 @@
+import csv
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+
+IMDB_ID_PATTERN = re.compile(r"^(tt|nm)\d+$")
+IMDB_PATH_PATTERN = re.compile(r"/(title/tt|name/nm)\d+/")
+
+
+def normalise_query(query: str) -> str:
+    """
+    Normalises a search query so that queries differing only in case, whitespace or diacritics share one key e.g.
+    '  Penélope  CRUZ ' and 'penelope cruz'.
+
+    Args:
+        query: The raw search query.
+
+    Returns:
+        The normalised query.
+    """
+    decomposed = unicodedata.normalize("NFKD", query)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def get_path_for_id(imdb_id: str) -> str:
+    """
+    Builds the IMDb main page path for a title or name ID.
+
+    Args:
+        imdb_id: An IMDb ID e.g. 'tt0468569' or 'nm0000288'.
+
+    Returns:
+        The page path e.g. '/title/tt0468569/'.
+    """
+    if not IMDB_ID_PATTERN.match(imdb_id):
+        raise ValueError(f"{imdb_id} is not an IMDb title (tt) or name (nm) ID.")
+    return ("/title/" if imdb_id.startswith("tt") else "/name/") + imdb_id + "/"
+
+
+class SearchIndex:
+    """
+    A persistent index of search query to the path of IMDb's first result for it, so repeat lookups skip the search
+    page entirely. Queries are keyed by 'normalise_query'. Entries are appended to a JSON Lines file as they are
+    learnt and the whole file is read back on construction.
+
+    Args:
+        path: The path of the JSON Lines file backing the index. The index is kept in memory only if None.
+
+    Attributes:
+        hits: The number of lookups answered by the index.
+        misses: The number of lookups that needed a search.
+    """
+    logger = logging.getLogger('SearchIndex')
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.__entries = {}
+        self.__lock = threading.Lock()
+        # Set when the file ends part way through an entry, so the next append starts on a fresh line.
+        self.__truncated = False
+        if path is not None and os.path.exists(path):
+            self.__load(path)
+            self.logger.info(f"Loaded {len(self.__entries)} search results from {path}")
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, query: str) -> str:
+        """
+        Looks up the first result path for a query.
+
+        Args:
+            query: The search query.
+
+        Returns:
+            The first result path e.g. '/name/nm0000288/', or None if the query has not been resolved before.
+        """
+        path = self.__entries.get(normalise_query(query))
+        with self.__lock:
+            if path is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return path
+
+    def put(self, query: str, path: str):
+        """
+        Records the first result path for a query.
+
+        Args:
+            query: The search query.
+            path: The first result path e.g. '/name/nm0000288/'.
+        """
+        self.put_all([(query, path)])
+
+    def put_all(self, entries: list):
+        """
+        Records many (query, path) pairs with a single write to the backing file.
+        """
+        lines = []
+        with self.__lock:
+            for query, path in entries:
+                key = normalise_query(query)
+                if self.__entries.get(key) != path:
+                    self.__entries[key] = path
+                    lines.append(json.dumps({"query": key, "path": path}, ensure_ascii=False) + "\n")
+            if self.path is not None and lines:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    if self.__truncated:
+                        f.write("\n")
+                        self.__truncated = False
+                    f.writelines(lines)
+
+    def __load(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Only the last entry can be cut short, by a crash part way through 'put_all'.
+                    self.logger.warning(f"Skipping a truncated entry in {path}")
+                    self.__truncated = not line.endswith("\n")
+                    continue
+                self.__entries[entry["query"]] = entry["path"]
+
+    def preload(self, filepath: str) -> int:
+        """
+        Bulk loads known query to IMDb ID mappings so that those queries never cost a search round trip. The file is
+        a two column CSV or TSV of query and either an IMDb ID ('nm0000288'), a page path or a full page URL.
+
+        Args:
+            filepath: The path of the file to load.
+
+        Returns:
+            The number of entries loaded.
+        """
+        with open(filepath, "r", encoding="utf-8", newline="") as f:
+            sample = f.read(4096)
+            f.seek(0)
+            delimiter = "\t" if "\t" in sample else ","
+            entries = []
+            for row in csv.reader(f, delimiter=delimiter):
+                if len(row) < 2 or not row[0].strip():
+                    continue
+                target = row[1].strip()
+                if IMDB_ID_PATTERN.match(target):
+                    entries.append((row[0], get_path_for_id(target)))
+                    continue
+                match = IMDB_PATH_PATTERN.search(target)
+                if match is None:
+                    self.logger.warning(f"Skipping {row[0]}: {target} is not an IMDb ID or page URL.")
+                    continue
+                entries.append((row[0], match.group(0)))
+        self.put_all(entries)
+        self.logger.info(f"Preloaded {len(entries)} search results from {filepath}")
+        return len(entries)
@@ -1,7 +1,7 @@
-import os
-import sys
 import logging
+import threading
 
+from src.crawler.journal import Journal, get_mutation_key
 from src.model.person import Person
 from src.model.title import Title
 from src.model.award import Award
@@ -11,136 +11,269 @@ logging.basicConfig(format='%(asctime)s %(levelname)s %(process)d --- %(name)s %
                     level=logging.INFO)
 
 
+def get_acted_in_relation_variables(person: Person, title: Title, characters: list, billing: int) -> dict:
+    return dict(get_credit_variables(person, title), characters=characters, billing=billing)
+
+
+def get_award_variables(name: str, organisation: str) -> dict:
+    return {
+        "name": name,
+        "organisation": organisation
+    }
+
+
+def get_award_relation_variables(person: Person, award: Award, organisation: str, year_key: str) -> dict:
+    """
+    Returns:
+        The variables of a NominatedRelation or WonRelation, with the award's year under year_key.
+    """
+    return {
+        "personName": person.name,
+        "personDOB": person.get_dob("%d-%b-%Y"),
+        "awardName": award.name,
+        "awardOrganisation": organisation,
+        year_key: award.year,
+        "titleName": award.title_name,
+        "titleReleased": award.title_released
+    }
+
+
+def get_credit_variables(person: Person, title: Title) -> dict:
+    """
+    Returns:
+        The variables identifying the person and title of a DirectedRelation, and of the other credit relations.
+    """
+    return {
+        "personName": person.name,
+        "personDOB": person.get_dob("%d-%b-%Y"),
+        "titleName": title.name,
+        "titleReleased": title.released
+    }
+
+
+def get_genre_variables(name: str) -> dict:
+    return {
+        "name": name
+    }
+
+
+def get_genre_relation_variables(title: Title, genre_name: str) -> dict:
+    return {
+        "titleName": title.name,
+        "titleReleased": title.released,
+        "genreName": genre_name
+    }
+
+
+def get_items_relation_variables(person: Person, title: Title, items: list) -> dict:
+    """
+    Returns:
+        The variables of a ProducedRelation or WroteRelation.
+    """
+    return dict(get_credit_variables(person, title), items=items)
+
+
+def get_person_variables(person: Person) -> dict:
+    return {
+        "name": person.name,
+        "dateOfBirth": person.get_dob("%Y-%m-%d"),
+        "bio": person.bio
+    }
+
+
+def get_title_variables(title: Title) -> dict:
+    return {
+        "name": title.name,
+        "summary": title.summary,
+        "released": title.released,
+        "certificateRating": title.certificate_rating,
+        "titleLengthInMins": title.title_length_in_mins,
+        "storyline": title.storyline,
+        "tagline": title.tagline
+    }
+
+
+class PendingMutation:
+    """
+    A mutation queued by an AMDbService in batching mode. Its result, or error, is filled in when the batch it
+    belongs to is sent.
+    """
+
+    def __init__(self, operation_name: str, variables: dict):
+        self.operation_name = operation_name
+        self.variables = variables
+        self.done = False
+        self.result = None
+        self.error = None
+
+    def resolve(self, outcome):
+        if isinstance(outcome, Exception):
+            self.error = outcome
+        else:
+            self.result = outcome
+        self.done = True
+
+
 class AMDbService:
+    """
+    Creates AMDb entities and relations through GraphQL mutations.
+
+    By default every 'create_*' call sends its own request and returns its response. With a 'batch_size' greater
+    than one the calls are queued instead and sent 'batch_size' at a time as a single aliased multi-mutation
+    request; each call then returns a PendingMutation that holds its own result or error once its batch is sent.
+    Call 'flush' to send a final partial batch.
+
+    With a Journal every mutation is recorded as pending before it is sent and as confirmed once it succeeds. A
+    mutation the journal has already confirmed is not sent again; its recorded response is returned instead. Call
+    'replay_pending' to resend the mutations a previous run recorded but never confirmed.
+
+    Args:
+        client: The GQLClient mutations are executed with.
+        batch_size: The number of mutations sent per request. Batching is off if 1 or less.
+        journal: The Journal mutations are recorded in, if any.
+    """
     logger = logging.getLogger('AMDbService')
 
-    def __init__(self, client):
-        self.GRAPH_QL_PATH = os.path.join(sys.path[0], "resources/graphql/")
+    def __init__(self, client, batch_size: int = 1, journal: Journal = None):
         self.client = client
+        self.batch_size = batch_size
+        self.journal = journal
+        self.__pending = []
+        self.__lock = threading.Lock()
+
+    def flush(self) -> list:
+        """
+        Sends every queued mutation as one batch.
+
+        Returns:
+            The PendingMutations that were sent, each resolved with its result or error.
+        """
+        with self.__lock:
+            batch, self.__pending = self.__pending, []
+            if not batch:
+                return batch
+            self.logger.info(f"Sending a batch of {len(batch)} mutations.")
+            outcomes = self.client.execute_batch([(m.operation_name, m.variables) for m in batch])
+            for mutation, outcome in zip(batch, outcomes):
+                mutation.resolve(outcome)
+                if mutation.error is not None:
+                    self.logger.error(f"{mutation.operation_name} failed with variables {mutation.variables}: "
+                                      f"{mutation.error}")
+                elif self.journal is not None:
+                    self.journal.record_confirmed(get_mutation_key(mutation.operation_name, mutation.variables),
+                                                  mutation.result)
+        return batch
+
+    def replay_pending(self) -> int:
+        """
+        Resends every mutation the journal recorded as pending but never confirmed, e.g. because the run sending it
+        died, and waits for any batch they are queued in to be sent.
+
+        Returns:
+            The number of mutations replayed.
+        """
+        pending = self.journal.pending() if self.journal is not None else []
+        if pending:
+            self.logger.info(f"Replaying {len(pending)} pending mutations.")
+        for _, operation_name, variables in pending:
+            self.__send_graphql_request(operation_name, variables)
+        self.flush()
+        return len(pending)
 
     def create_acted_in_relation(self, person: Person, title: Title, characters: list, billing: int):
         self.logger.info(f"Creating ActedInRelation between {person.__short_str__()} and {title.__short_str__()}, "
                          f"characters: {characters}, billing: {billing}.")
-        variables = {
-            "personName": person.name,
-            "personDOB": person.get_dob("%d-%b-%Y"),
-            "titleName": title.name,
-            "titleReleased": title.released,
-            "characters": characters,
-            "billing": billing
-        }
-        return self.__execute_graphql_request(filename="createActedInRelation.graphql", variables=variables)
+        variables = get_acted_in_relation_variables(person, title, characters, billing)
+        return self._execute_graphql_request(operation_name="CreateActedInRelation", variables=variables)
 
     def create_award(self, name: str, organisation: str):
         self.logger.info(f"Creating Award with name: {name} and organisation: {organisation}.")
-        variables = {
-            "name": name,
-            "organisation": organisation
-        }
-        return self.__execute_graphql_request(filename="createAward.graphql", variables=variables)
+        variables = get_award_variables(name, organisation)
+        return self._execute_graphql_request(operation_name="CreateAward", variables=variables)
 
     def create_directed_relation(self, person: Person, title: Title):
         self.logger.info(f"Creating DirectedRelation between {person.__short_str__()} and {title.__short_str__()}.")
-        variables = {
-            "personName": person.name,
-            "personDOB": person.get_dob("%d-%b-%Y"),
-            "titleName": title.name,
-            "titleReleased": title.released
-        }
-        return self.__execute_graphql_request(filename="createDirectedRelation.graphql", variables=variables)
+        variables = get_credit_variables(person, title)
+        return self._execute_graphql_request(operation_name="CreateDirectedRelation", variables=variables)
 
     def create_genre(self, name: str):
         self.logger.info(f"Creating Genre with name: {name}.")
-        variables = {
-            "name": name
-        }
-        return self.__execute_graphql_request(filename="createGenre.graphql", variables=variables)
+        variables = get_genre_variables(name)
+        return self._execute_graphql_request(operation_name="CreateGenre", variables=variables)
 
     def create_genre_relation(self, title: Title, genre_name: str):
         self.logger.info(f"Creating GenreRelation between {title.__short_str__()} and Genre({genre_name}).")
-        variables = {
-            "titleName": title.name,
-            "titleReleased": title.released,
-            "genreName": genre_name
-        }
-        return self.__execute_graphql_request(filename="createGenreRelation.graphql", variables=variables)
+        variables = get_genre_relation_variables(title, genre_name)
+        return self._execute_graphql_request(operation_name="CreateGenreRelation", variables=variables)
 
     def create_nominated_relation(self, person: Person, award: Award, organisation: str):
         self.logger.info(
             f"Creating NominatedRelation between {person.__short_str__()} and Award({award.name}, {organisation}).")
-        variables = {
-            "personName": person.name,
-            "personDOB": person.get_dob("%d-%b-%Y"),
-            "awardName": award.name,
-            "awardOrganisation": organisation,
-            "nominationYear": award.year,
-            "titleName": award.title_name,
-            "titleReleased": award.title_released
-        }
-        return self.__execute_graphql_request(filename="createNominatedRelation.graphql", variables=variables)
+        variables = get_award_relation_variables(person, award, organisation, "nominationYear")
+        return self._execute_graphql_request(operation_name="CreateNominatedRelation", variables=variables)
 
     def create_person(self, person: Person):
         self.logger.info(f"Creating {person.__short_str__()}.")
-        variables = {
-            "name": person.name,
-            "dateOfBirth": person.get_dob("%Y-%m-%d"),
-            "bio": person.bio
-        }
-        return self.__execute_graphql_request(filename="createPerson.graphql", variables=variables)
+        variables = get_person_variables(person)
+        return self._execute_graphql_request(operation_name="CreatePerson", variables=variables)
 
     def create_produced_relation(self, person: Person, title: Title, items: list):
         self.logger.info(
             f"Creating ProducedRelation between {person.__short_str__()} and {title.__short_str__()}, items: {items}.")
-        variables = {
-            "personName": person.name,
-            "personDOB": person.get_dob("%d-%b-%Y"),
-            "titleName": title.name,
-            "titleReleased": title.released,
-            "items": items
-        }
-        return self.__execute_graphql_request(filename="createProducedRelation.graphql", variables=variables)
+        variables = get_items_relation_variables(person, title, items)
+        return self._execute_graphql_request(operation_name="CreateProducedRelation", variables=variables)
 
     def create_title(self, title: Title):
         self.logger.info(f"Creating {title.__short_str__()}")
-        variables = {
-            "name": title.name,
-            "summary": title.summary,
-            "released": title.released,
-            "certificateRating": title.certificate_rating,
-            "titleLengthInMins": title.title_length_in_mins,
-            "storyline": title.storyline,
-            "tagline": title.tagline
-        }
-        return self.__execute_graphql_request(filename="createTitle.graphql", variables=variables)
+        variables = get_title_variables(title)
+        return self._execute_graphql_request(operation_name="CreateTitle", variables=variables)
 
     def create_won_relation(self, person: Person, award: Award, organisation: str):
         self.logger.info(
             f"Creating WonRelation between {person.__short_str__()} and Award({award.name}, {organisation}).")
-        variables = {
-            "personName": person.name,
-            "personDOB": person.get_dob("%d-%b-%Y"),
-            "awardName": award.name,
-            "awardOrganisation": organisation,
-            "wonYear": award.year,
-            "titleName": award.title_name,
-            "titleReleased": award.title_released
-        }
-        return self.__execute_graphql_request(filename="createWonRelation.graphql", variables=variables)
+        variables = get_award_relation_variables(person, award, organisation, "wonYear")
+        return self._execute_graphql_request(operation_name="CreateWonRelation", variables=variables)
 
     def create_wrote_relation(self, person: Person, title: Title, items: list):
         self.logger.info(
             f"Creating WroteRelation between {person.__short_str__()} and {title.__short_str__()}, items: {items}.")
-        variables = {
-            "personName": person.name,
-            "personDOB": person.get_dob("%d-%b-%Y"),
-            "titleName": title.name,
-            "titleReleased": title.released,
-            "items": items
-        }
-        return self.__execute_graphql_request(filename="createWroteRelation.graphql", variables=variables)
-
-    def __execute_graphql_request(self, filename: str, variables: dict):
+        variables = get_items_relation_variables(person, title, items)
+        return self._execute_graphql_request(operation_name="CreateWroteRelation", variables=variables)
+
+    def _execute_graphql_request(self, operation_name: str, variables: dict):
+        if self.journal is not None:
+            key = get_mutation_key(operation_name, variables)
+            confirmed, response = self.journal.get_confirmed(key)
+            if confirmed:
+                self.logger.info(f"Skipping {operation_name}, already confirmed in the journal.")
+                return self.__resolved(operation_name, variables, response)
+            self.journal.record_pending(key, operation_name, variables)
+        return self.__send_graphql_request(operation_name, variables)
+
+    def __send_graphql_request(self, operation_name: str, variables: dict):
+        if self.batch_size > 1:
+            return self.__queue_graphql_request(operation_name, variables)
         try:
-            return self.client.execute(filepath=self.GRAPH_QL_PATH + filename, variables=variables)
+            response = self.client.execute(operation_name=operation_name, variables=variables)
         except Exception as e:
             self.logger.error(e, exc_info=True)
+            return None
+        if self.journal is not None:
+            self.journal.record_confirmed(get_mutation_key(operation_name, variables), response)
+        return response
+
+    def __resolved(self, operation_name: str, variables: dict, response):
+        if self.batch_size <= 1:
+            return response
+        mutation = PendingMutation(operation_name, variables)
+        mutation.resolve(response)
+        return mutation
+
+    def __queue_graphql_request(self, operation_name: str, variables: dict) -> PendingMutation:
+        mutation = PendingMutation(operation_name, variables)
+        with self.__lock:
+            self.__pending.append(mutation)
+            full = len(self.__pending) >= self.batch_size
+        if full:
+            self.flush()
+        return mutation
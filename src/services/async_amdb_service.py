@@ -0,0 +1,135 @@
+import asyncio
+import logging
+
+from src.crawler.journal import Journal, get_mutation_key
+from src.gql_client.async_client import AsyncGQLClient
+from src.model.award import Award
+from src.model.person import Person
+from src.model.title import Title
+from src.services.amdb_service import get_acted_in_relation_variables, get_award_relation_variables, \
+    get_award_variables, get_credit_variables, get_genre_relation_variables, get_genre_variables, \
+    get_items_relation_variables, get_person_variables, get_title_variables
+
+
+class AsyncAMDbService:
+    """
+    An asyncio counterpart to AMDbService, wrapping an AsyncGQLClient. It has the same 'create_*' methods, taking the
+    same arguments and sending the same variables, but each is a coroutine resolving to its response, so writes can be
+    scheduled alongside scraping instead of alternating with it. Failed requests are logged and resolve to None, as with AMDbService.
+
+    It is not a drop-in for AMDbService: mutations are never batched, as concurrent requests take the place of
+    batches, and 'replay_pending' is a coroutine.
+
+    Args:
+        client: The AsyncGQLClient mutations are executed with.
+        journal: The Journal mutations are recorded in, if any, as with AMDbService.
+    """
+    logger = logging.getLogger('AsyncAMDbService')
+
+    def __init__(self, client: AsyncGQLClient, journal: Journal = None):
+        self.client = client
+        self.journal = journal
+
+    async def create_acted_in_relation(self, person: Person, title: Title, characters: list, billing: int):
+        self.logger.info(f"Creating ActedInRelation between {person.__short_str__()} and {title.__short_str__()}, "
+                         f"characters: {characters}, billing: {billing}.")
+        variables = get_acted_in_relation_variables(person, title, characters, billing)
+        return await self.execute("CreateActedInRelation", variables)
+
+    async def create_award(self, name: str, organisation: str):
+        self.logger.info(f"Creating Award with name: {name} and organisation: {organisation}.")
+        return await self.execute("CreateAward", get_award_variables(name, organisation))
+
+    async def create_directed_relation(self, person: Person, title: Title):
+        self.logger.info(f"Creating DirectedRelation between {person.__short_str__()} and {title.__short_str__()}.")
+        return await self.execute("CreateDirectedRelation", get_credit_variables(person, title))
+
+    async def create_genre(self, name: str):
+        self.logger.info(f"Creating Genre with name: {name}.")
+        return await self.execute("CreateGenre", get_genre_variables(name))
+
+    async def create_genre_relation(self, title: Title, genre_name: str):
+        self.logger.info(f"Creating GenreRelation between {title.__short_str__()} and Genre({genre_name}).")
+        return await self.execute("CreateGenreRelation", get_genre_relation_variables(title, genre_name))
+
+    async def create_nominated_relation(self, person: Person, award: Award, organisation: str):
+        self.logger.info(
+            f"Creating NominatedRelation between {person.__short_str__()} and Award({award.name}, {organisation}).")
+        variables = get_award_relation_variables(person, award, organisation, "nominationYear")
+        return await self.execute("CreateNominatedRelation", variables)
+
+    async def create_person(self, person: Person):
+        self.logger.info(f"Creating {person.__short_str__()}.")
+        return await self.execute("CreatePerson", get_person_variables(person))
+
+    async def create_produced_relation(self, person: Person, title: Title, items: list):
+        self.logger.info(
+            f"Creating ProducedRelation between {person.__short_str__()} and {title.__short_str__()}, items: {items}.")
+        return await self.execute("CreateProducedRelation", get_items_relation_variables(person, title, items))
+
+    async def create_title(self, title: Title):
+        self.logger.info(f"Creating {title.__short_str__()}")
+        return await self.execute("CreateTitle", get_title_variables(title))
+
+    async def create_won_relation(self, person: Person, award: Award, organisation: str):
+        self.logger.info(
+            f"Creating WonRelation between {person.__short_str__()} and Award({award.name}, {organisation}).")
+        variables = get_award_relation_variables(person, award, organisation, "wonYear")
+        return await self.execute("CreateWonRelation", variables)
+
+    async def create_wrote_relation(self, person: Person, title: Title, items: list):
+        self.logger.info(
+            f"Creating WroteRelation between {person.__short_str__()} and {title.__short_str__()}, items: {items}.")
+        return await self.execute("CreateWroteRelation", get_items_relation_variables(person, title, items))
+
+    async def create_all(self, *mutations) -> list:
+        """
+        Runs many 'create_*' awaitables concurrently, bounded by the client's in-flight limit.
+
+        Args:
+            mutations: The coroutines returned by 'create_*' calls.
+
+        Returns:
+            Their responses, in order.
+        """
+        return await asyncio.gather(*mutations)
+
+    async def replay_pending(self) -> int:
+        """
+        Resends, concurrently, every mutation the journal recorded as pending but never confirmed.
+
+        Returns:
+            The number of mutations replayed.
+        """
+        pending = self.journal.pending() if self.journal is not None else []
+        if pending:
+            self.logger.info(f"Replaying {len(pending)} pending mutations.")
+        await asyncio.gather(*[self.__send(operation_name, variables) for _, operation_name, variables in pending])
+        return len(pending)
+
+    async def execute(self, operation_name: str, variables: dict):
+        """
+        Sends a named mutation, unless the journal has already confirmed it, in which case its recorded response is
+        returned.
+
+        Returns:
+            The response, or None if the request failed.
+        """
+        if self.journal is not None:
+            key = get_mutation_key(operation_name, variables)
+            confirmed, response = self.journal.get_confirmed(key)
+            if confirmed:
+                self.logger.info(f"Skipping {operation_name}, already confirmed in the journal.")
+                return response
+            self.journal.record_pending(key, operation_name, variables)
+        return await self.__send(operation_name, variables)
+
+    async def __send(self, operation_name: str, variables: dict):
+        try:
+            response = await self.client.execute(operation_name=operation_name, variables=variables)
+        except Exception as e:
+            self.logger.error(e, exc_info=True)
+            return None
+        if self.journal is not None:
+            self.journal.record_confirmed(get_mutation_key(operation_name, variables), response)
+        return response
@@ -0,0 +1,75 @@
+import logging
+
+from src.crawler.journal import get_mutation_key
+from src.services.export_service import read_records
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class LoadStats:
+    """
+    A model class for the totals of a bulk load.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.duplicates = 0
+        self.sent = 0
+        self.failed = 0
+        self.requests = 0
+
+    def __str__(self):
+        return f"LoadStats(records: {self.records}, duplicates: {self.duplicates}, sent: {self.sent}, " \
+               f"failed: {self.failed}, requests: {self.requests})"
+
+
+class BulkLoader:
+    """
+    Loads an export written by ExportService into AMDb. Records are streamed from the file, duplicates e.g. a person
+    credited on many titles are dropped, and the rest are sent 'batch_size' at a time as aliased multi-mutation
+    requests.
+
+    Args:
+        client: The GQLClient mutations are executed with.
+        batch_size: The number of mutations sent per request.
+    """
+    logger = logging.getLogger('BulkLoader')
+
+    def __init__(self, client, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.client = client
+        self.batch_size = batch_size
+
+    def load(self, path: str) -> LoadStats:
+        """
+        Args:
+            path: The export, see 'src.services.export_service.read_records'.
+
+        Returns:
+            The LoadStats of the load.
+        """
+        stats, seen, batch = LoadStats(), set(), []
+        for operation_name, variables in read_records(path):
+            stats.records += 1
+            key = get_mutation_key(operation_name, variables)
+            if key in seen:
+                stats.duplicates += 1
+                continue
+            seen.add(key)
+            batch.append((operation_name, variables))
+            if len(batch) >= self.batch_size:
+                self.__send(batch, stats)
+                batch = []
+        if batch:
+            self.__send(batch, stats)
+        self.logger.info(f"Loaded {path}: {stats}")
+        return stats
+
+    def __send(self, batch: list, stats: LoadStats):
+        outcomes = self.client.execute_batch(batch)
+        stats.requests += 1
+        for (operation_name, variables), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                stats.failed += 1
+                self.logger.error(f"{operation_name} failed with variables {variables}: {outcome}")
+            else:
+                stats.sent += 1
@@ -0,0 +1,214 @@
+import gzip
+import json
+import logging
+import os
+import threading
+
+from graphql import ListTypeNode, NonNullTypeNode, OperationDefinitionNode
+
+from src.gql_client.documents import DocumentRegistry
+from src.services.amdb_service import AMDbService
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+DEFAULT_ROW_GROUP_SIZE = 10000
+PARQUET_EXTENSION = ".parquet"
+
+# Entities are loaded before the relations between them.
+LOAD_ORDER = ("CreateTitle", "CreatePerson", "CreateGenre", "CreateAward")
+
+
+class JsonLinesWriter:
+    """
+    Writes export records to a JSON Lines file, gzip compressed if the path ends in '.gz'.
+
+    Args:
+        path: The path of the file.
+        append: Whether to add to an existing file, e.g. when resuming a journaled crawl, rather than overwrite it.
+    """
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        mode = "a" if append else "w"
+        if path.endswith(".gz"):
+            self.__file = gzip.open(path, mode + "t", encoding="utf-8")
+        else:
+            self.__file = open(path, mode, encoding="utf-8")
+            if append and self.__file.tell() > 0 and not _ends_with_newline(path):
+                # The last record of a crashed run was cut short; start on a fresh line so this run's are intact.
+                self.__file.write("\n")
+
+    def write(self, operation_name: str, variables: dict):
+        self.__file.write(json.dumps({"operation": operation_name, "variables": variables}, ensure_ascii=False,
+                                     default=str) + "\n")
+
+    def flush(self):
+        self.__file.flush()
+
+    def close(self):
+        self.__file.close()
+
+
+class ParquetWriter:
+    """
+    Writes export records to a directory of Parquet files, one per operation e.g. 'CreatePerson.parquet', with a
+    column per variable. Column types come from the variable definitions of the operation's GraphQL document.
+    Records are buffered and written a row group at a time, so memory use is bounded by the row group size.
+
+    Args:
+        directory: The directory the files are written to. It is created if missing.
+        documents: The DocumentRegistry the operations are defined in.
+        row_group_size: The number of records buffered per operation before they are written.
+    """
+
+    def __init__(self, directory: str, documents: DocumentRegistry = None,
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        if pyarrow is None:
+            raise ImportError("Exporting to Parquet needs the 'pyarrow' package, try 'pip install pyarrow'.")
+        os.makedirs(directory, exist_ok=True)
+        self.path = directory
+        self.documents = documents if documents is not None else DocumentRegistry()
+        self.row_group_size = row_group_size
+        self.__buffers = {}
+        self.__writers = {}
+
+    def write(self, operation_name: str, variables: dict):
+        buffer = self.__buffers.setdefault(operation_name, [])
+        buffer.append(variables)
+        if len(buffer) >= self.row_group_size:
+            self.__write_row_group(operation_name)
+
+    def flush(self):
+        for operation_name in list(self.__buffers):
+            self.__write_row_group(operation_name)
+
+    def close(self):
+        self.flush()
+        for writer in self.__writers.values():
+            writer.close()
+        self.__writers = {}
+
+    def __write_row_group(self, operation_name: str):
+        rows, self.__buffers[operation_name] = self.__buffers[operation_name], []
+        if not rows:
+            return
+        writer = self.__writers.get(operation_name)
+        if writer is None:
+            writer = pyarrow.parquet.ParquetWriter(os.path.join(self.path, operation_name + PARQUET_EXTENSION),
+                                                   get_arrow_schema(self.documents, operation_name))
+            self.__writers[operation_name] = writer
+        writer.write_table(pyarrow.Table.from_pylist(rows, schema=writer.schema))
+
+
+def get_arrow_schema(documents: DocumentRegistry, operation_name: str):
+    """
+    Returns:
+        A 'pyarrow.Schema' with a field for each variable of an operation, typed from its GraphQL type.
+    """
+    operation = next(d for d in documents.get(operation_name).definitions
+                     if isinstance(d, OperationDefinitionNode) and d.name.value == operation_name)
+    return pyarrow.schema([(v.variable.name.value, _get_arrow_type(v.type)) for v in operation.variable_definitions])
+
+
+def _get_arrow_type(type_node):
+    if isinstance(type_node, NonNullTypeNode):
+        return _get_arrow_type(type_node.type)
+    if isinstance(type_node, ListTypeNode):
+        return pyarrow.list_(_get_arrow_type(type_node.type))
+    return {"Int": pyarrow.int64(), "Float": pyarrow.float64(), "Boolean": pyarrow.bool_()}.get(
+        type_node.name.value, pyarrow.string())
+
+
+def open_writer(path: str, append: bool = False):
+    """
+    Args:
+        path: The path of the export.
+        append: Whether to add to an existing export rather than overwrite it. Only JSON Lines exports can be
+            appended to.
+
+    Returns:
+        A ParquetWriter if path ends in '.parquet', else a JsonLinesWriter.
+    """
+    if path.endswith(PARQUET_EXTENSION):
+        if append:
+            raise ValueError("Parquet exports cannot be appended to, export to JSON Lines instead.")
+        return ParquetWriter(path)
+    return JsonLinesWriter(path, append=append)
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def read_records(path: str):
+    """
+    Reads back the records of an export, one at a time. Parquet exports are read an operation at a time, entities
+    before relations, as their files do not keep the order the records were written in.
+
+    Args:
+        path: A JSON Lines file, optionally gzip compressed, or a directory of Parquet files.
+
+    Returns:
+        A generator of (operation_name, variables) tuples.
+    """
+    if os.path.isdir(path):
+        if pyarrow is None:
+            raise ImportError("Reading a Parquet export needs the 'pyarrow' package, try 'pip install pyarrow'.")
+        names = sorted(f[:-len(PARQUET_EXTENSION)] for f in os.listdir(path) if f.endswith(PARQUET_EXTENSION))
+        names.sort(key=lambda n: LOAD_ORDER.index(n) if n in LOAD_ORDER else len(LOAD_ORDER))
+        for operation_name in names:
+            parquet_file = pyarrow.parquet.ParquetFile(os.path.join(path, operation_name + PARQUET_EXTENSION))
+            for batch in parquet_file.iter_batches():
+                for variables in batch.to_pylist():
+                    yield operation_name, variables
+        return
+    with (gzip.open(path, "rt", encoding="utf-8") if path.endswith(".gz") else open(path, "r", encoding="utf-8")) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                ExportService.logger.warning(f"Skipping a truncated record in {path}")
+                continue
+            yield record["operation"], record["variables"]
+
+
+class ExportService(AMDbService):
+    """
+    A stand in for AMDbService that streams every entity and relation to a file instead of writing it to AMDb. Each
+    record is the operation AMDbService would have sent and its variables, so an export can be loaded into AMDb
+    later, any number of times, with a BulkLoader.
+
+    Args:
+        writer: The JsonLinesWriter or ParquetWriter records are written to, see 'open_writer'.
+    """
+    logger = logging.getLogger('ExportService')
+
+    def __init__(self, writer):
+        super().__init__(client=None)
+        self.writer = writer
+        self.records = 0
+        self.__lock = threading.Lock()
+
+    def flush(self) -> list:
+        with self.__lock:
+            self.writer.flush()
+        return []
+
+    def close(self):
+        with self.__lock:
+            self.writer.close()
+        self.logger.info(f"Exported {self.records} records to {self.writer.path}")
+
+    def _execute_graphql_request(self, operation_name: str, variables: dict):
+        with self.__lock:
+            self.writer.write(operation_name, variables)
+            self.records += 1
+        return variables
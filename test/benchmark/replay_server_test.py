@@ -0,0 +1,59 @@
+from src.crawler.crawler import Crawler
+from src.scraper import extractor
+from src.scraper.cache import ResponseCache
+from src.scraper.fetcher import Fetcher
+from src.scraper.imdb_scraper import IMDbScraper
+from src.scraper.rate_limiter import RateLimiter
+
+from benchmark.fixtures import StubAMDbService, get_title_queries
+from benchmark.replay_server import ReplayServer, get_route_key
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def server():
+    with ReplayServer() as replay:
+        yield replay
+
+
+def test_get_route_key_ignores_click_tracking():
+    assert (get_route_key("https://www.imdb.com/find?q=the+dark+knight&ref_=nv_sr_sm") == "/find?q=the+dark+knight")
+    assert (get_route_key("/title/tt0468569/fullcredits?ref_=tt_ql_1") == "/title/tt0468569/fullcredits")
+
+
+def test_pages_are_served_under_the_imdb_url_scheme(server):
+    fetcher = Fetcher()
+    scraper = IMDbScraper(fetcher=fetcher, base_url=server.base_url)
+    document = scraper.fetch_title("The Dark Knight")
+    assert (document.url == server.base_url + "/title/tt0468569/")
+    assert (extractor.get_title_contents(document).name == "The Dark Knight")
+    assert (fetcher.get(server.base_url + "/title/tt0000000/").status_code == 404)
+    fetcher.close()
+
+
+def test_stale_pages_are_revalidated_with_an_etag(server, tmp_path):
+    fetcher = Fetcher(cache=ResponseCache(str(tmp_path / "cache.db"), ttl=0))
+    url = server.base_url + "/title/tt0468569/"
+    first, second = fetcher.get(url), fetcher.get(url)
+    assert (first.content == second.content and fetcher.cache.revalidations == 1)
+    fetcher.close()
+
+
+def test_injected_errors_are_retried_through_the_rate_limiter():
+    with ReplayServer(error_rate=1.0, error_status=429, retry_after=0) as replay:
+        fetcher = Fetcher(rate_limiter=RateLimiter(), max_retries=2)
+        assert (fetcher.get(replay.base_url + "/title/tt0468569/").status_code == 429)
+        assert (replay.status_counts == {429: 3})
+        fetcher.close()
+
+
+def test_crawl_throughput_over_the_network():
+    with ReplayServer(latency=0.005, jitter=0.002, seed=1) as replay:
+        fetcher = Fetcher()
+        crawler = Crawler(IMDbScraper(fetcher=fetcher, base_url=replay.base_url), StubAMDbService(), workers=4)
+        stats = crawler.crawl(get_title_queries())
+        fetcher.close()
+    assert (stats.titles == len(get_title_queries()) and stats.failed_titles == 0)
+    assert (replay.request_count == fetcher.request_count == stats.requests)
+    assert (stats.requests_per_sec() > 0)
@@ -0,0 +1,21 @@
+from benchmark.suite import compare
+
+
+def _results(parse_ms: float, extractor_ms: float, ingest_ms: float) -> dict:
+    return {"pages_ms": {"title_main": parse_ms}, "extractors_ms": {"get_title_name": extractor_ms},
+            "ingest": {"sequential": {"elapsed_ms": ingest_ms}}}
+
+
+def test_compare_flags_timings_slower_than_the_tolerance():
+    regressions = compare(_results(13.0, 2.0, 200.0), _results(10.0, 1.0, 100.0), tolerance=1.25)
+    assert (regressions == [("extractors.get_title_name", 1.0, 2.0), ("ingest.sequential", 100.0, 200.0),
+                            ("pages.title_main", 10.0, 13.0)])
+
+
+def test_compare_allows_timings_within_the_tolerance():
+    assert (compare(_results(12.0, 0.5, 125.0), _results(10.0, 1.0, 100.0), tolerance=1.25) == [])
+
+
+def test_compare_skips_timings_missing_from_the_baseline():
+    baseline = {"pages_ms": {"title_main": 0.0}}
+    assert (compare(_results(10.0, 5.0, 100.0), baseline, tolerance=1.25) == [])
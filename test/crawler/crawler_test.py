@@ -0,0 +1,119 @@
+from src.crawler.crawler import Crawler, ScrapedTitle
+from src.crawler.journal import Journal
+from src.model.award import Award
+from src.model.person import Person
+from src.model.title import Title
+from src.scraper.imdb_scraper import IMDbScraper
+from src.services.amdb_service import AMDbService
+
+from datetime import datetime
+import json
+import mock
+import os
+import pytest
+import sys
+
+IMDB_PAGES_PATH = os.path.join(sys.path[0], "test/resources/imdb_pages/")
+EXPECTED_RESULTS_PATH = os.path.join(sys.path[0], "test/resources/expected_results/")
+
+FIXTURES = {
+    "titles.json": {"The Dark Knight": "title/the_dark_knight", "The Wolf of Wall Street": "title/wolf_of_wall_st"},
+    "names.json": {"Christian Bale": "name/christian_bale", "Leonardo DiCaprio": "name/leonardo_dicaprio"},
+}
+PAGES = {"search_uri": "search", "main_uri": "main", "credits_uri": "credits", "awards_uri": "awards",
+         "bio_uri": "bio"}
+
+
+def _mock_response(status=200, content=""):
+    mock_resp = mock.Mock()
+    mock_resp.status_code = status
+    mock_resp.content = content
+    return mock_resp
+
+
+@pytest.fixture
+def routes():
+    routes = {}
+    for filename, fixtures in FIXTURES.items():
+        with open(EXPECTED_RESULTS_PATH + filename) as json_file:
+            expected = json.load(json_file)
+        for query, prefix in fixtures.items():
+            for uri, page in PAGES.items():
+                if uri in expected[query]:
+                    with open(IMDB_PAGES_PATH + prefix + "_" + page + ".htm", "rb") as f:
+                        routes[expected[query][uri]] = _mock_response(content=f.read())
+    return routes
+
+
+@mock.patch('requests.Session.get')
+def test_crawl(mock_request_get, routes):
+    mock_request_get.side_effect = lambda url, **kwargs: routes.get(url, _mock_response(404))
+    amdb = mock.Mock()
+    crawler = Crawler(IMDbScraper(), amdb, workers=2)
+
+    stats = crawler.crawl(["The Dark Knight", "The Wolf of Wall Street", "Not A Film"])
+
+    assert (stats.titles == 2)
+    assert (stats.failed_titles == 1)
+    # Both titles, Christian Bale as cast and Leonardo DiCaprio as both cast and producer.
+    assert (stats.entities == 5)
+    assert (stats.requests == mock_request_get.call_count)
+    assert (amdb.create_title.call_count == 2)
+    created = sorted(c.kwargs["person"].name for c in amdb.create_acted_in_relation.call_args_list)
+    assert (created == ["Christian Bale", "Leonardo DiCaprio"])
+    # Leonardo DiCaprio is looked up by ID as both cast and producer but only scraped once, without any search.
+    requested = [c.args[0] for c in mock_request_get.call_args_list]
+    assert (requested.count("https://www.imdb.com/name/nm0000138/") == 1)
+    assert (not any("find?q=leonardo" in url for url in requested))
+    assert (stats.people_lookups > stats.people_scraped)
+    assert (stats.dedup_ratio == crawler.registry.dedup_ratio() > 1.0)
+
+
+@mock.patch('requests.Session.get')
+def test_crawl_pipelined(mock_request_get, routes):
+    mock_request_get.side_effect = lambda url, **kwargs: routes.get(url, _mock_response(404))
+    amdb = mock.Mock()
+    crawler = Crawler(IMDbScraper(), amdb, workers=2)
+
+    stats = crawler.crawl_pipelined(["The Dark Knight", "The Wolf of Wall Street", "Not A Film"], queue_size=1)
+
+    assert (stats.titles == 2)
+    assert (stats.failed_titles == 1)
+    assert (stats.entities == 5)
+    assert (amdb.create_title.call_count == 2)
+    created = sorted(c.kwargs["person"].name for c in amdb.create_acted_in_relation.call_args_list)
+    assert (created == ["Christian Bale", "Leonardo DiCaprio"])
+    amdb.flush.assert_called_once()
+
+
+@mock.patch('requests.Session.get')
+def test_crawl_skips_titles_completed_in_journal(mock_request_get, routes):
+    mock_request_get.side_effect = lambda url, **kwargs: routes.get(url, _mock_response(404))
+    journal = Journal()
+    journal.complete_title("The Dark Knight")
+    amdb = mock.Mock()
+    crawler = Crawler(IMDbScraper(), amdb, workers=2, journal=journal)
+
+    stats = crawler.crawl(["The Dark Knight", "The Wolf of Wall Street"])
+
+    assert (stats.titles == 1 and stats.skipped_titles == 1)
+    assert (amdb.create_title.call_args.args[0].name == "The Wolf of Wall Street")
+    assert (journal.is_title_completed("The Wolf of Wall Street"))
+
+
+def test_batched_director_relations_are_not_queued_when_the_person_fails():
+    client = mock.Mock()
+    client.execute_batch.side_effect = lambda operations: [
+        Exception("Person exists") if name == "CreatePerson" else {} for name, _ in operations]
+    amdb = AMDbService(client, batch_size=10)
+    title = Title("The Dark Knight", "", 2008, "12A", 152, "", "", imdb_id="tt0468569")
+    director = Person("Christopher Nolan", datetime(1970, 7, 30), "", imdb_id="nm0634240")
+    award = Award("Best Director", "Nominee", 2009, "The Dark Knight", 2008)
+    scraped = ScrapedTitle(title, genres=[], directors=[(director, {"Academy Awards": [award]})], writers=[],
+                           producers=[], cast=[])
+
+    Crawler(mock.Mock(), amdb).write(scraped)
+    amdb.flush()
+
+    sent = [name for call in client.execute_batch.call_args_list for name, _ in call.args[0]]
+    assert (sent == ["CreateTitle", "CreatePerson"])
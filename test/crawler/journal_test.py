@@ -0,0 +1,51 @@
+from src.crawler.journal import Journal, get_mutation_key
+from src.services.amdb_service import AMDbService
+
+import mock
+
+
+def test_journal_is_read_back_ignoring_a_truncated_record(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = Journal(path)
+    journal.complete_title("The Dark Knight")
+    journal.record_pending("a", "CreateGenre", {"name": "Crime"})
+    journal.record_pending("b", "CreateGenre", {"name": "Drama"})
+    journal.record_confirmed("a", {"createGenre": {"name": "Crime"}})
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"type": "confirmed", "key": "b", "resp')
+
+    journal = Journal(path)
+    journal.record_pending("c", "CreateGenre", {"name": "Action"})
+    journal.close()
+
+    resumed = Journal(path)
+    assert (resumed.is_title_completed("The Dark Knight"))
+    assert (resumed.get_confirmed("a") == (True, {"createGenre": {"name": "Crime"}}))
+    assert ([key for key, _, _ in resumed.pending()] == ["b", "c"])
+
+
+def test_mutation_keys_are_stable():
+    assert (get_mutation_key("CreateGenre", {"name": "Crime", "id": 1}) ==
+            get_mutation_key("CreateGenre", {"id": 1, "name": "Crime"}))
+    assert (get_mutation_key("CreateGenre", {"name": "Crime"}) != get_mutation_key("CreateGenre", {"name": "Drama"}))
+
+
+def test_amdb_service_skips_confirmed_and_replays_pending_mutations(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    client = mock.Mock()
+    client.execute.side_effect = [{"createGenre": {"name": "Crime"}}, Exception("AMDb is down")]
+    amdb = AMDbService(client, journal=Journal(path))
+    amdb.create_genre("Crime")
+    assert (amdb.create_genre("Drama") is None)
+    amdb.journal.close()
+
+    client = mock.Mock()
+    client.execute.side_effect = lambda operation_name, variables: {"createGenre": variables}
+    amdb = AMDbService(client, journal=Journal(path))
+    assert (amdb.replay_pending() == 1)
+    assert (amdb.create_genre("Crime") == {"createGenre": {"name": "Crime"}})
+    assert (amdb.create_genre("Drama") == {"createGenre": {"name": "Drama"}})
+    # Only the pending mutation was resent.
+    assert (client.execute.call_args_list == [mock.call(operation_name="CreateGenre", variables={"name": "Drama"})])
+    assert (amdb.journal.pending() == [])
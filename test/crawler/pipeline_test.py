@@ -0,0 +1,47 @@
+from src.crawler.pipeline import Pipeline, Stage
+
+import threading
+import time
+
+
+def test_pipeline_runs_every_item_through_every_stage():
+    results = []
+    pipeline = Pipeline([Stage("double", lambda x: x * 2, workers=3), Stage("inc", lambda x: x + 1, workers=2)],
+                        on_result=results.append)
+
+    stats = pipeline.run(range(20))
+
+    assert (sorted(results) == [x * 2 + 1 for x in range(20)])
+    assert ([s.processed for s in stats] == [20, 20])
+
+
+def test_pipeline_drops_failed_items():
+    results = []
+    pipeline = Pipeline([Stage("invert", lambda x: 1 / x)], on_result=results.append)
+
+    stats = pipeline.run([1, 0, 2])
+
+    assert (sorted(results) == [0.5, 1.0])
+    assert (stats[0].failed == 1)
+
+
+def test_slow_stage_applies_backpressure():
+    produced, lock = [0], threading.Lock()
+    max_ahead = [0]
+    written = []
+
+    def produce(x):
+        with lock:
+            produced[0] += 1
+            max_ahead[0] = max(max_ahead[0], produced[0] - len(written))
+        return x
+
+    def write(x):
+        time.sleep(0.01)
+        written.append(x)
+
+    Pipeline([Stage("produce", produce, workers=4), Stage("write", write)], queue_size=2).run(range(30))
+
+    assert (len(written) == 30)
+    # At most the write queue, the item being written and one item per producer can be ahead of the writer.
+    assert (max_ahead[0] <= 2 + 1 + 4)
@@ -0,0 +1,69 @@
+from src.crawler.journal import Journal, get_mutation_key
+from src.gql_client.async_client import AsyncGQLClient
+from src.model.person import Person
+from src.model.title import Title
+from src.services.amdb_service import AMDbService
+from src.services.async_amdb_service import AsyncAMDbService
+
+from datetime import datetime
+import asyncio
+import mock
+
+
+class FakeSession:
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.operations = []
+
+    async def execute(self, document, variable_values=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.operations.append(document.definitions[0].name.value)
+        return {"createGenre": {"name": variable_values["name"]}}
+
+
+def test_async_amdb_service_bounds_requests_in_flight():
+    async def run():
+        client = AsyncGQLClient("http://localhost:8080/graphql", max_in_flight=2)
+        client.session = FakeSession()
+        amdb = AsyncAMDbService(client)
+        results = await amdb.create_all(*[amdb.create_genre(str(i)) for i in range(6)])
+        return client.session, results
+
+    session, results = asyncio.run(run())
+    assert ([r["createGenre"]["name"] for r in results] == [str(i) for i in range(6)])
+    assert (session.operations == ["CreateGenre"] * 6)
+    assert (session.max_in_flight == 2)
+
+
+def test_async_amdb_service_skips_mutations_confirmed_in_the_journal():
+    async def run(client, journal):
+        amdb = AsyncAMDbService(client, journal=journal)
+        return await amdb.create_all(amdb.create_genre("Drama"), amdb.create_genre("Crime"))
+
+    journal = Journal()
+    journal.record_confirmed(get_mutation_key("CreateGenre", {"name": "Drama"}), {"createGenre": {"name": "Drama"}})
+    # Built outside the event loop, which must not bind its semaphore to the wrong loop.
+    client = AsyncGQLClient("http://localhost:8080/graphql", max_in_flight=2)
+    client.session = FakeSession()
+    results = asyncio.run(run(client, journal))
+
+    assert (results == [{"createGenre": {"name": "Drama"}}, {"createGenre": {"name": "Crime"}}])
+    assert (client.session.operations == ["CreateGenre"])
+    assert (journal.pending() == [])
+
+
+def test_async_amdb_service_sends_the_same_variables_as_amdb_service():
+    bale = Person("Christian Bale", datetime(1974, 1, 30), "Bio.")
+    title = Title("The Dark Knight", "Batman.", 2008, "12A", 152, "Gotham.", "Why so serious?")
+    client = mock.Mock()
+    AMDbService(client).create_acted_in_relation(bale, title, ["Bruce Wayne"], 1)
+
+    async_client = mock.Mock()
+    async_client.execute = mock.AsyncMock(return_value={})
+    asyncio.run(AsyncAMDbService(async_client).create_acted_in_relation(bale, title, ["Bruce Wayne"], 1))
+    assert (async_client.execute.call_args == client.execute.call_args)
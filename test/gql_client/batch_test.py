@@ -0,0 +1,60 @@
+from src.gql_client.batch import merge_operations, split_results
+from src.model.title import Title
+from src.services.amdb_service import AMDbService
+
+from graphql import parse, print_ast
+
+import mock
+import pytest
+
+CREATE_GENRE = "mutation CreateGenre($name: String!) { createGenre(name: $name) { name } }"
+
+
+def test_merge_operations_aliases_fields_and_renames_variables():
+    document, variables = merge_operations([(parse(CREATE_GENRE), {"name": "Crime"}),
+                                            (parse(CREATE_GENRE), {"name": "Drama"})])
+    printed = print_ast(document)
+    assert ("m0: createGenre(name: $m0_name)" in printed)
+    assert ("m1: createGenre(name: $m1_name)" in printed)
+    assert (variables == {"m0_name": "Crime", "m1_name": "Drama"})
+
+
+def test_merge_operations_rejects_queries():
+    with pytest.raises(ValueError):
+        merge_operations([(parse("query { genres { name } }"), {})])
+
+
+def test_split_results_maps_errors_to_their_operation():
+    results = split_results(3, {"m0": {"name": "Crime"}, "m1": None, "m2": {"name": "Drama"}},
+                            [{"message": "Genre exists", "path": ["m1"]}])
+    assert (results[0] == {"name": "Crime"})
+    assert (isinstance(results[1], Exception) and str(results[1]) == "Genre exists")
+    assert (results[2] == {"name": "Drama"})
+
+
+def test_amdb_service_sends_mutations_in_batches():
+    client = mock.Mock()
+    client.execute_batch.side_effect = lambda ops: [{"name": v["name"]} for _, v in ops]
+    amdb = AMDbService(client, batch_size=2)
+
+    crime = amdb.create_genre("Crime")
+    assert (not crime.done and client.execute_batch.call_count == 0)
+    drama = amdb.create_genre("Drama")
+    assert (client.execute_batch.call_count == 1)
+    assert (crime.result == {"name": "Crime"} and drama.result == {"name": "Drama"})
+
+    action = amdb.create_genre("Action")
+    amdb.flush()
+    assert (client.execute_batch.call_count == 2 and action.result == {"name": "Action"})
+    client.execute.assert_not_called()
+
+
+def test_amdb_service_records_batch_errors_per_mutation():
+    client = mock.Mock()
+    client.execute_batch.return_value = [Exception("Title exists"), {"name": "Crime"}]
+    amdb = AMDbService(client, batch_size=10)
+    title = amdb.create_title(Title("The Dark Knight", "", 2008, "12A", 152, "", ""))
+    genre = amdb.create_genre("Crime")
+    amdb.flush()
+    assert (str(title.error) == "Title exists" and title.result is None)
+    assert (genre.result == {"name": "Crime"} and genre.error is None)
@@ -0,0 +1,28 @@
+from src.gql_client.documents import DocumentRegistry
+
+from graphql import print_ast
+
+import mock
+import pytest
+
+
+def test_registry_loads_every_operation_once():
+    with mock.patch("builtins.open", wraps=open) as opened:
+        registry = DocumentRegistry()
+        registry.get("CreatePerson")
+        registry.get("CreatePerson")
+    assert ("CreatePerson" in registry and "CreateWroteRelation" in registry)
+    assert (opened.call_count == len(registry.names()))
+    assert ("createPerson(" in print_ast(registry.get("CreatePerson")))
+
+
+def test_registry_loads_lazily(tmp_path):
+    (tmp_path / "createGenre.graphql").write_text("mutation CreateGenre { createGenre(name: \"Crime\") { name } }")
+    registry = DocumentRegistry(str(tmp_path), preload=False)
+    (tmp_path / "createAward.graphql").write_text("mutation CreateAward { createAward(name: \"Oscar\") { name } }")
+    assert (registry.names() == ["CreateAward", "CreateGenre"])
+
+
+def test_registry_raises_for_unknown_operations():
+    with pytest.raises(KeyError):
+        DocumentRegistry().get("DeletePerson")
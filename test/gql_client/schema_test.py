@@ -0,0 +1,47 @@
+from src.gql_client.client import GQLClient
+from src.gql_client.schema import SchemaCache, get_schema_options, load_schema
+
+from graphql import build_schema, get_introspection_query, graphql_sync
+
+import json
+
+ENDPOINT = "http://localhost:8080/graphql"
+SDL = "type Query { genres: [String] }\ntype Mutation { createGenre(name: String!): String }"
+
+
+def _introspect() -> dict:
+    return graphql_sync(build_schema(SDL), get_introspection_query()).data
+
+
+def test_load_schema_reads_sdl_and_introspection_json(tmp_path):
+    sdl_path, json_path = tmp_path / "amdb.graphql", tmp_path / "amdb.json"
+    sdl_path.write_text(SDL)
+    json_path.write_text(json.dumps({"data": _introspect()}))
+    assert (load_schema(str(sdl_path)) == {"schema": SDL})
+    assert (load_schema(str(json_path)) == {"introspection": _introspect()})
+
+
+def test_schema_cache_ignores_other_versions_and_endpoints(tmp_path):
+    path = str(tmp_path / "schema.json")
+    SchemaCache(path, "1.0").store(ENDPOINT, _introspect())
+    assert (SchemaCache(path, "1.0").load(ENDPOINT) == _introspect())
+    assert (SchemaCache(path, "1.1").load(ENDPOINT) is None)
+    assert (SchemaCache(path, "1.0").load("http://amdb/graphql") is None)
+    assert (SchemaCache(str(tmp_path / "missing.json")).load(ENDPOINT) is None)
+
+
+def test_get_schema_options_only_fetches_without_a_local_schema(tmp_path):
+    cache = SchemaCache(str(tmp_path / "schema.json"))
+    assert (get_schema_options(ENDPOINT, validate=False) == {"fetch_schema_from_transport": False})
+    assert (get_schema_options(ENDPOINT, schema_cache=cache) == {"fetch_schema_from_transport": True})
+    cache.store(ENDPOINT, _introspect())
+    assert (get_schema_options(ENDPOINT, schema_cache=cache) ==
+            {"introspection": _introspect(), "fetch_schema_from_transport": False})
+
+
+def test_client_with_cached_schema_does_not_introspect(tmp_path):
+    cache = SchemaCache(str(tmp_path / "schema.json"))
+    cache.store(ENDPOINT, _introspect())
+    client = GQLClient(ENDPOINT, schema_cache=cache)
+    assert (not client.client.fetch_schema_from_transport)
+    assert (client.client.schema.mutation_type.name == "Mutation")
@@ -0,0 +1,71 @@
+from src.instrumentation import metrics
+from src.scraper import extractor
+from src.scraper.fetcher import Fetcher
+from src.scraper.parser import parse
+
+import mock
+import pytest
+import threading
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    yield metrics.REGISTRY
+    metrics.disable()
+    metrics.REGISTRY.reset()
+
+
+def test_nothing_is_recorded_when_disabled(registry):
+    metrics.disable()
+    metrics.inc("imdb_requests_total", status=200)
+    with metrics.timer("imdb_parse_seconds", parser="lxml"):
+        pass
+    assert (registry.render() == "")
+
+
+def test_counters_and_histograms_render_in_prometheus_text_format(registry):
+    metrics.inc("imdb_requests_total", status=200)
+    metrics.inc("imdb_requests_total", status=200)
+    metrics.observe("imdb_request_seconds", 0.02)
+    metrics.observe("imdb_request_seconds", 3.0)
+    text = registry.render()
+    assert ("# TYPE imdb_requests_total counter" in text)
+    assert ('imdb_requests_total{status="200"} 2' in text)
+    assert ("# TYPE imdb_request_seconds histogram" in text)
+    assert ('imdb_request_seconds_bucket{le="0.025"} 1' in text)
+    assert ('imdb_request_seconds_bucket{le="+Inf"} 2' in text)
+    assert ("imdb_request_seconds_count 2" in text)
+    assert (registry.get("imdb_request_seconds").quantile(0.95) == 5.0)
+
+
+def test_fetches_parses_and_extractors_are_recorded(registry):
+    fetcher = Fetcher()
+    response = mock.Mock(status_code=200, content=b"<html><h1>Title</h1></html>", headers={})
+    with mock.patch.object(fetcher.session, "get", return_value=response):
+        fetcher.get("https://www.imdb.com/title/tt0000001/")
+    extractor.get_title_name(parse(response.content))
+    text = registry.render()
+    assert ('imdb_requests_total{status="200"} 1' in text)
+    assert (f"imdb_response_bytes_total {len(response.content)}" in text)
+    assert ('imdb_parse_seconds_count{parser="html.parser"} 1' in text)
+    assert ('imdb_extractor_seconds_count{extractor="get_title_name"} 1' in text)
+    assert ("imdb_extractor_seconds" in registry.summary())
+
+
+def test_rendering_while_recording_from_other_threads(registry):
+    def record(worker):
+        for i in range(2000):
+            metrics.inc("imdb_requests_total", status=f"{worker}-{i}")
+            metrics.observe("amdb_request_seconds", 0.01, operation=f"{worker}-{i}")
+
+    threads = [threading.Thread(target=record, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        registry.render()
+        registry.summary()
+    for thread in threads:
+        thread.join()
+    assert (registry.render().count("amdb_request_seconds_count") == 8000)
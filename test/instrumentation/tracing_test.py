@@ -0,0 +1,94 @@
+from src.instrumentation import tracing
+from src.scraper import extractor
+from src.scraper.parser import parse
+
+import json
+import pstats
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def tracer():
+    tracing.TRACER.reset()
+    tracing.enable()
+    yield tracing.TRACER
+    tracing.disable()
+    tracing.profile(None, None)
+    tracing.TRACER.reset()
+
+
+def test_nothing_is_recorded_when_disabled(tracer):
+    tracing.disable()
+    with tracing.span("title", "title", entity="The Dark Knight") as span:
+        assert (span is None)
+    assert (tracer.spans == [])
+
+
+def test_spans_nest_and_extractors_are_traced(tracer):
+    with tracing.span("title", "title", entity="The Dark Knight") as title:
+        extractor.get_title_name(parse(b"<html><h1>The Dark Knight</h1></html>"))
+    assert (tracing.current_span() is None)
+    spans = {s.name: s for s in tracer.spans}
+    assert (set(spans) == {"title", "parse", "get_title_name"})
+    assert (spans["parse"].parent_id == title.span_id and spans["get_title_name"].parent_id == title.span_id)
+    assert (len({s.trace_id for s in tracer.spans}) == 1)
+    assert (spans["get_title_name"].category == "extractor" and title.duration() >= 0)
+
+
+def test_failed_spans_keep_their_error(tracer):
+    with pytest.raises(ValueError):
+        with tracing.span("person", "person", entity="Christian Bale"):
+            raise ValueError("boom")
+    assert (isinstance(tracer.spans[0].error, ValueError))
+
+
+def test_spans_past_the_cap_are_dropped(tracer, monkeypatch):
+    monkeypatch.setattr(tracer, "max_spans", 2)
+    for name in ("first", "second", "third"):
+        with tracing.span(name, "title"):
+            pass
+    assert ([s.name for s in tracer.spans] == ["first", "second"])
+    assert (tracer.dropped == 1)
+    tracer.reset()
+    assert (tracer.dropped == 0)
+
+
+def test_spans_are_not_kept_when_only_profiling(tracer, tmp_path):
+    tracing.enable(keep_spans=False)
+    tracing.profile("The Dark Knight", str(tmp_path / "dark_knight.prof"))
+    with tracing.span("title", "title", entity="The Dark Knight"):
+        with tracing.span("fetch", "fetch"):
+            pass
+    assert (tracer.spans == [] and tracer.profiled)
+    assert ((tmp_path / "dark_knight.prof").exists())
+
+
+def test_traces_are_written_as_chrome_events_and_otlp_json(tracer, tmp_path):
+    with tracing.span("title", "title", entity="The Dark Knight"):
+        with tracing.span("fetch", "fetch", url="https://www.imdb.com/title/tt0468569/"):
+            pass
+    tracing.write_trace(str(tmp_path / "trace.json"))
+    tracing.write_trace(str(tmp_path / "trace.otlp.json"))
+
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    assert ([e["name"] for e in events] == ["fetch", "title"] and all(e["ph"] == "X" for e in events))
+    assert (events[0]["args"]["parent_id"] == events[1]["args"]["span_id"])
+
+    with open(tmp_path / "trace.otlp.json") as f:
+        spans = json.load(f)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert (spans[0]["parentSpanId"] == spans[1]["spanId"] and spans[0]["traceId"] == spans[1]["traceId"])
+    assert ({"key": "url", "value": {"stringValue": "https://www.imdb.com/title/tt0468569/"}}
+            in spans[0]["attributes"])
+
+
+def test_only_the_chosen_entity_is_profiled(tracer, tmp_path):
+    path = str(tmp_path / "crawl.prof")
+    tracing.profile("The Dark Knight", path)
+    with tracing.span("title", "title", entity="Avengers Endgame"):
+        pass
+    assert (not tracer.profiled)
+    with tracing.span("title", "title", entity="The Dark Knight"):
+        parse(b"<html><h1>The Dark Knight</h1></html>")
+    assert (tracer.profiled)
+    assert (any(function == "parse" for _, _, function in pstats.Stats(path).stats))
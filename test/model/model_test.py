@@ -0,0 +1,42 @@
+from src.model.award import Award
+from src.model.person import Person
+from src.model.title import Title
+
+from datetime import datetime
+
+import pytest
+
+
+def test_people_are_identified_by_name_and_dob():
+    bale = Person("Christian Bale", datetime(1974, 1, 30), "Bio.")
+    rescraped = Person("Christian Bale", datetime(1974, 1, 30), "A longer bio.")
+    assert (bale == rescraped and len({bale, rescraped}) == 1)
+    assert (bale != Person("Christian Bale", datetime(1975, 1, 30), "Bio."))
+
+
+def test_titles_and_awards_without_imdb_ids_are_identified_by_their_fields():
+    title = Title("The Dark Knight", "Batman.", 2008, "12A", 152, "Gotham.", "Why so serious?")
+    award = Award("Oscar", "Winner", 2009, "The Dark Knight", 2008)
+    assert (title == Title("The Dark Knight", "", 2008, "12A", 152, "", ""))
+    assert (title != Title("The Dark Knight", "", 2009, "12A", 152, "", ""))
+    assert (award == Award("Oscar", "Winner", 2009, "The Dark Knight", 2008))
+    assert (hash(award) == hash(Award("Oscar", "Winner", 2009, "The Dark Knight", 2008)))
+    assert (award != Award("Oscar", "Nominee", 2009, "The Dark Knight", 2008))
+
+
+def test_models_have_no_instance_dict():
+    with pytest.raises(AttributeError):
+        Title("The Dark Knight", "", 2008, "12A", 152, "", "").rating = 9
+
+
+def test_models_with_imdb_ids_are_identified_by_them():
+    bale = Person("Christian Bale", datetime(1974, 1, 30), "Bio.", imdb_id="nm0000288")
+    assert (bale == Person("Christian Bale ", datetime(1974, 1, 30), "", imdb_id="nm0000288"))
+    assert (bale != Person("Christian Bale", datetime(1974, 1, 30), "Bio.", imdb_id="nm0000289"))
+    title = Title("The Dark Knight", "", 2008, "12A", 152, "", "", imdb_id="tt0468569")
+    assert (len({title, Title("The Dark Knight (2008)", "", 2008, "12A", 152, "", "", imdb_id="tt0468569")}) == 1)
+    oscar = Award("Oscar", "Winner", 2009, "The Dark Knight", 2008, event_id="ev0000003", title_imdb_id="tt0468569")
+    assert (oscar == Award("Oscar", "Winner", 2009, "Dark Knight", 2008, event_id="ev0000003",
+                           title_imdb_id="tt0468569"))
+    assert (oscar != Award("Oscar", "Winner", 2009, "The Dark Knight", 2008, event_id="ev0000292",
+                           title_imdb_id="tt0468569"))
@@ -0,0 +1,130 @@
+from src.scraper.async_imdb_scraper import AsyncIMDbScraper
+from src.scraper.cache import ResponseCache
+
+import asyncio
+import httpx
+import json
+import os
+import pytest
+import sys
+
+IMDB_TITLE_PATH = os.path.join(sys.path[0], "test/resources/imdb_pages/title/")
+IMDB_NAME_PATH = os.path.join(sys.path[0], "test/resources/imdb_pages/name/")
+EXPECTED_RESULTS_PATH = os.path.join(sys.path[0], "test/resources/expected_results/")
+
+TITLE_FILES = {"Avengers Endgame": "avengers_endgame", "The Wolf of Wall Street": "wolf_of_wall_st",
+               "The Dark Knight": "the_dark_knight"}
+NAME_FILES = {"Leonardo DiCaprio": "leonardo_dicaprio", "Christian Bale": "christian_bale",
+              "Gwyneth Paltrow": "gwyneth_paltrow"}
+
+
+def get_fields(model) -> dict:
+    return {field: getattr(model, field) for field in model.__slots__}
+
+
+def get_imdb_page(filepath: str):
+    with open(filepath, "rb") as f:
+        return f.read()
+
+
+def load_expected(filename: str):
+    with open(EXPECTED_RESULTS_PATH + filename) as json_file:
+        return json.load(json_file)
+
+
+def fixture_routes() -> dict:
+    """
+    Maps every IMDb URL used by the expected results onto the content of its saved page.
+    """
+    routes = {}
+    for query, expected in load_expected("titles.json").items():
+        prefix = IMDB_TITLE_PATH + TITLE_FILES[query]
+        routes[expected["search_uri"]] = get_imdb_page(prefix + "_search.htm")
+        routes[expected["main_uri"]] = get_imdb_page(prefix + "_main.htm")
+        routes[expected["credits_uri"]] = get_imdb_page(prefix + "_credits.htm")
+    for query, expected in load_expected("names.json").items():
+        prefix = IMDB_NAME_PATH + NAME_FILES[query]
+        routes[expected["search_uri"]] = get_imdb_page(prefix + "_search.htm")
+        routes[expected["main_uri"]] = get_imdb_page(prefix + "_main.htm")
+        routes[expected["awards_uri"]] = get_imdb_page(prefix + "_awards.htm")
+        routes[expected["bio_uri"]] = get_imdb_page(prefix + "_bio.htm")
+    return routes
+
+
+class FixtureTransport(httpx.AsyncBaseTransport):
+    """
+    A local fake transport serving the saved IMDb pages, recording request counts and peak concurrency.
+    """
+
+    def __init__(self, routes: dict, delay: float = 0):
+        self.routes = routes
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_async_request(self, request):
+        self.requests.append(str(request.url))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        content = self.routes.get(str(request.url))
+        if content is None:
+            return httpx.Response(404, request=request)
+        return httpx.Response(200, content=content, request=request)
+
+
+@pytest.fixture(scope="module")
+def routes():
+    return fixture_routes()
+
+
+def run_scraper(transport, coroutine, max_concurrency=10):
+    async def run():
+        async with AsyncIMDbScraper(client=httpx.AsyncClient(transport=transport),
+                                    max_concurrency=max_concurrency) as scraper:
+            return await coroutine(scraper)
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("query", ["Avengers Endgame", "The Wolf of Wall Street", "The Dark Knight"])
+def test_title(routes, query):
+    transport = FixtureTransport(routes)
+    expected = load_expected("titles.json")[query]
+    title, relations = run_scraper(transport, lambda s: s.title(query))
+    assert(get_fields(title) == expected["contents"])
+    assert(relations == expected["relations"])
+    assert(len(transport.requests) == 3)
+
+
+def test_people(routes):
+    transport = FixtureTransport(routes)
+    expected = load_expected("names.json")
+    people = run_scraper(transport, lambda s: s.people(list(expected.keys()) + ["Nobody"]))
+    assert(set(people.keys()) == set(expected.keys()))
+    for query, (person, awards) in people.items():
+        assert(person.name == expected[query]["contents"]["name"])
+        assert(person.bio == expected[query]["contents"]["bio"])
+        for organisation, organisation_awards in awards.items():
+            assert([get_fields(a) for a in organisation_awards] == expected[query]["relations"][organisation])
+
+
+def test_concurrency_is_bounded(routes):
+    transport = FixtureTransport(routes, delay=0.01)
+    names = list(load_expected("names.json").keys())
+    run_scraper(transport, lambda s: s.people(names), max_concurrency=2)
+    assert(transport.max_in_flight == 2)
+
+
+def test_scraper_built_outside_the_event_loop_is_reusable_across_loops(routes, tmp_path):
+    transport = FixtureTransport(routes)
+    scraper = AsyncIMDbScraper(client=httpx.AsyncClient(transport=transport),
+                               cache=ResponseCache(str(tmp_path / "cache.db")))
+    first, _ = asyncio.run(scraper.title("The Dark Knight"))
+    second, _ = asyncio.run(scraper.title("The Dark Knight"))
+    asyncio.run(scraper.close())
+    assert (first == second)
+    assert (len(transport.requests) == 3 and scraper.cache.hits == 3)
@@ -0,0 +1,89 @@
+from src.scraper.cache import ResponseCache
+from src.scraper.fetcher import Fetcher
+
+import mock
+import pytest
+
+URL = "https://www.imdb.com/name/nm0000288/"
+
+
+def _mock_response(status=200, content=b"CONTENT", headers=None):
+    mock_resp = mock.Mock()
+    mock_resp.status_code = status
+    mock_resp.content = content
+    mock_resp.headers = headers or {}
+    return mock_resp
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"))
+    yield cache
+    cache.close()
+
+
+@mock.patch('requests.Session.get')
+def test_fresh_entry_skips_network(mock_request_get, cache):
+    mock_request_get.return_value = _mock_response(content=b"<html>bale</html>")
+    fetcher = Fetcher(cache=cache)
+    assert (fetcher.get(URL).content == b"<html>bale</html>")
+    assert (fetcher.get(URL).content == b"<html>bale</html>")
+    assert (mock_request_get.call_count == 1)
+    assert (fetcher.request_count == 1)
+    assert (cache.hits == 1 and cache.misses == 1)
+
+
+@mock.patch('requests.Session.get')
+def test_stale_entry_is_revalidated(mock_request_get, cache):
+    cache.ttl = 0
+    mock_request_get.side_effect = [
+        _mock_response(content=b"<html>bale</html>", headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2020"}),
+        _mock_response(status=304, content=b""),
+    ]
+    fetcher = Fetcher(cache=cache)
+    fetcher.get(URL)
+    assert (fetcher.get(URL).content == b"<html>bale</html>")
+    assert (mock_request_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"',
+                                                            "If-Modified-Since": "Wed, 01 Jan 2020"})
+    assert (cache.revalidations == 1)
+
+
+@mock.patch('requests.Session.get')
+def test_entries_persist_across_instances(mock_request_get, tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    mock_request_get.return_value = _mock_response()
+    first = ResponseCache(path)
+    Fetcher(cache=first).get(URL)
+    first.close()
+
+    second = ResponseCache(path)
+    Fetcher(cache=second).get(URL)
+    assert (mock_request_get.call_count == 1)
+    assert (second.stats()["hits"] == 1)
+    second.close()
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.max_entries = 2
+    cache.store("a", b"a")
+    cache.store("b", b"b")
+    cache.lookup("a")
+    cache.store("c", b"c")
+    assert (cache.lookup("a")[0] is not None)
+    assert (cache.lookup("b")[0] is None)
+    assert (cache.stats()["entries"] == 2)
+
+
+def test_access_times_are_written_on_close(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    first = ResponseCache(path)
+    first.store("a", b"a")
+    first.store("b", b"b")
+    first.lookup("a")
+    first.close()
+
+    second = ResponseCache(path, max_entries=2)
+    second.store("c", b"c")
+    assert (second.lookup("a")[0] is not None)
+    assert (second.lookup("b")[0] is None)
+    second.close()
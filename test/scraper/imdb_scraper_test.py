@@ -1,5 +1,8 @@
+from src.error.exception import FetchError
 from src.scraper.imdb_scraper import IMDbScraper
+from src.scraper.search_index import SearchIndex
 
+from concurrent.futures import ThreadPoolExecutor
 import json
 import mock
 import os
@@ -11,6 +14,10 @@ IMDB_NAME_PATH = os.path.join(sys.path[0], "test/resources/imdb_pages/name/")
 EXPECTED_RESULTS_PATH = os.path.join(sys.path[0], "test/resources/expected_results/")
 
 
+def get_fields(model) -> dict:
+    return {field: getattr(model, field) for field in model.__slots__}
+
+
 def get_imdb_page(filepath: str):
     f = open(filepath, "r")
     return f.read()
@@ -108,7 +115,7 @@ def mock_req_name(request):
 
 @pytest.mark.parametrize("mock_req_title, query", [("ae", "Avengers Endgame"), ("wows", "The Wolf of Wall Street"),
                                                    ("dk", "The Dark Knight")], indirect=["mock_req_title"])
-@mock.patch('requests.get')
+@mock.patch('requests.Session.get')
 def test_load_title_page(mock_request_get, scraper, expected_title_contents, mock_req_title, query):
     mock_request_get.side_effect = [mock_req_title['search'], mock_req_title['main']]
     expected = expected_title_contents[query]
@@ -120,31 +127,31 @@ def test_load_title_page(mock_request_get, scraper, expected_title_contents, moc
 
 @pytest.mark.parametrize("mock_req_title, query", [("ae", "Avengers Endgame"), ("wows", "The Wolf of Wall Street"),
                                                    ("dk", "The Dark Knight")], indirect=["mock_req_title"])
-@mock.patch('requests.get')
+@mock.patch('requests.Session.get')
 def test_get_title_contents(mock_request_get, scraper, expected_title_contents, mock_req_title, query):
-    mock_request_get.side_effect = [mock_req_title['search']] + [mock_req_title['main']] * 8
+    mock_request_get.side_effect = [mock_req_title['search'], mock_req_title['main']]
     expected = expected_title_contents[query]["contents"]
     scraper.load_title_page(query)
     title = scraper.get_title_contents()
-    assert(title.__dict__ == expected)
+    assert(get_fields(title) == expected)
+    assert(mock_request_get.call_count == 2)
 
 
 @pytest.mark.parametrize("mock_req_title, query", [("ae", "Avengers Endgame"), ("wows", "The Wolf of Wall Street"),
                                                    ("dk", "The Dark Knight")], indirect=["mock_req_title"])
-@mock.patch('requests.get')
+@mock.patch('requests.Session.get')
 def test_get_title_relation_contents(mock_request_get, scraper, expected_title_contents, mock_req_title, query):
-    mock_request_get.side_effect = [mock_req_title['search'], mock_req_title['main'], mock_req_title['credits'],
-                                    mock_req_title['credits'], mock_req_title['credits'], mock_req_title['main'],
-                                    mock_req_title['main']]
+    mock_request_get.side_effect = [mock_req_title['search'], mock_req_title['main'], mock_req_title['credits']]
     expected = expected_title_contents[query]["relations"]
     scraper.load_title_page(query)
     title_relations = scraper.get_title_relation_contents()
     assert(title_relations == expected)
+    assert(mock_request_get.call_count == 3)
 
 
 @pytest.mark.parametrize("mock_req_name, query", [("ld", "Leonardo DiCaprio"), ("cb", "Christian Bale"),
                                                    ("gp", "Gwyneth Paltrow")], indirect=["mock_req_name"])
-@mock.patch('requests.get')
+@mock.patch('requests.Session.get')
 def test_load_person_page(mock_request_get, scraper, expected_name_contents, mock_req_name, query):
     mock_request_get.side_effect = [mock_req_name['search'], mock_req_name['main']]
     expected = expected_name_contents[query]
@@ -157,28 +164,108 @@ def test_load_person_page(mock_request_get, scraper, expected_name_contents, moc
 
 @pytest.mark.parametrize("mock_req_name, query", [("ld", "Leonardo DiCaprio"), ("cb", "Christian Bale"),
                                                    ("gp", "Gwyneth Paltrow")], indirect=["mock_req_name"])
-@mock.patch('requests.get')
+@mock.patch('requests.Session.get')
 def test_get_person_contents(mock_request_get, scraper, expected_name_contents, mock_req_name, query):
-    mock_request_get.side_effect = [mock_req_name["search"]] + [mock_req_name["main"]] * 3 + [mock_req_name["bio"]]
+    mock_request_get.side_effect = [mock_req_name["search"], mock_req_name["main"], mock_req_name["bio"]]
     expected = expected_name_contents[query]["contents"]
     scraper.load_person_page(query)
     person = scraper.get_person_contents()
+    assert (person.imdb_id == expected["imdb_id"])
     assert (person.name == expected["name"])
     assert (person.get_dob("%d-%b-%Y") == expected["date_of_birth"])
     assert (person.bio == expected["bio"])
+    assert (mock_request_get.call_count == 3)
 
 
 @pytest.mark.parametrize("mock_req_name, query", [("ld", "Leonardo DiCaprio"), ("cb", "Christian Bale"),
                                                    ("gp", "Gwyneth Paltrow")], indirect=["mock_req_name"])
-@mock.patch('requests.get')
+@mock.patch('requests.Session.get')
 def test_get_person_relation_contents(mock_request_get, scraper, expected_name_contents, mock_req_name, query):
-    mock_request_get.side_effect = [mock_req_name["search"]] + [mock_req_name["main"]] + [mock_req_name["awards"]] * 3
+    mock_request_get.side_effect = [mock_req_name["search"], mock_req_name["main"], mock_req_name["awards"]]
     expected = expected_name_contents[query]["relations"]
     scraper.load_person_page(query)
     person_relations = scraper.get_person_relation_contents()
     for i in range(len(person_relations["Academy Awards"])):
-        assert(person_relations["Academy Awards"][i].__dict__ == expected["Academy Awards"][i])
+        assert(get_fields(person_relations["Academy Awards"][i]) == expected["Academy Awards"][i])
     for i in range(len(person_relations["Golden Globes"])):
-        assert(person_relations["Golden Globes"][i].__dict__ == expected["Golden Globes"][i])
+        assert(get_fields(person_relations["Golden Globes"][i]) == expected["Golden Globes"][i])
     for i in range(len(person_relations["BAFTA Awards"])):
-        assert(person_relations["BAFTA Awards"][i].__dict__ == expected["BAFTA Awards"][i])
+        assert(get_fields(person_relations["BAFTA Awards"][i]) == expected["BAFTA Awards"][i])
+
+
+@mock.patch('requests.Session.get')
+def test_scrape_person_shared_across_threads(mock_request_get, scraper, expected_name_contents):
+    pages = {"ld": "leonardo_dicaprio", "cb": "christian_bale", "gp": "gwyneth_paltrow"}
+    queries = {"ld": "Leonardo DiCaprio", "cb": "Christian Bale", "gp": "Gwyneth Paltrow"}
+    routes = {}
+    for key, query in queries.items():
+        expected = expected_name_contents[query]
+        for page, uri in [("search", "search_uri"), ("main", "main_uri"), ("awards", "awards_uri"), ("bio", "bio_uri")]:
+            routes[expected[uri]] = _mock_response(status=200, content=get_imdb_page(
+                IMDB_NAME_PATH + pages[key] + "_" + page + ".htm"))
+    mock_request_get.side_effect = lambda url, **kwargs: routes[url]
+
+    work = list(queries.values()) * 2
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(scraper.scrape_person, work))
+
+    assert (mock_request_get.call_count == 24)
+    for query, (person, awards) in zip(work, results):
+        expected = expected_name_contents[query]
+        assert (person.name == expected["contents"]["name"])
+        assert (person.bio == expected["contents"]["bio"])
+        for organisation, organisation_awards in awards.items():
+            assert ([get_fields(a) for a in organisation_awards] == expected["relations"][organisation])
+
+
+@pytest.mark.parametrize("mock_req_name, query", [("cb", "Christian Bale")], indirect=["mock_req_name"])
+@mock.patch('requests.Session.get')
+def test_search_index_skips_search_page(mock_request_get, expected_name_contents, mock_req_name, query):
+    scraper = IMDbScraper(search_index=SearchIndex())
+    mock_request_get.side_effect = [mock_req_name["search"], mock_req_name["main"], mock_req_name["main"]]
+    expected = expected_name_contents[query]
+    scraper.load_person_page(query)
+    scraper.load_person_page(query.upper())
+    assert (scraper.first_result_url == expected["main_uri"])
+    assert (mock_request_get.call_count == 3)
+    assert (scraper.search_index.hits == 1)
+
+
+@pytest.mark.parametrize("mock_req_title, query, imdb_id", [("dk", "The Dark Knight", "tt0468569")],
+                         indirect=["mock_req_title"])
+@mock.patch('requests.Session.get')
+def test_load_title_by_id(mock_request_get, scraper, expected_title_contents, mock_req_title, query, imdb_id):
+    mock_request_get.side_effect = [mock_req_title['main'], mock_req_title['credits']]
+    expected = expected_title_contents[query]
+    scraper.load_title_by_id(imdb_id)
+    assert (scraper.first_result_url == expected["main_uri"])
+    assert (scraper.full_credits_url == expected["credits_uri"])
+    assert (get_fields(scraper.get_title_contents()) == expected["contents"])
+    assert (scraper.get_title_relation_contents() == expected["relations"])
+    assert ([c.args[0] for c in mock_request_get.call_args_list] == [expected["main_uri"], expected["credits_uri"]])
+
+
+@pytest.mark.parametrize("mock_req_name, query, imdb_id", [("cb", "Christian Bale", "nm0000288")],
+                         indirect=["mock_req_name"])
+@mock.patch('requests.Session.get')
+def test_scrape_person_by_id(mock_request_get, scraper, expected_name_contents, mock_req_name, query, imdb_id):
+    mock_request_get.side_effect = [mock_req_name["main"], mock_req_name["bio"], mock_req_name["awards"]]
+    expected = expected_name_contents[query]
+    person, _ = scraper.scrape_person_by_id(imdb_id)
+    assert (person.name == expected["contents"]["name"])
+    assert (mock_request_get.call_count == 3)
+
+
+def test_load_by_id_rejects_wrong_id_type(scraper):
+    with pytest.raises(ValueError):
+        scraper.load_title_by_id("nm0000288")
+    with pytest.raises(ValueError):
+        scraper.load_person_by_id("the dark knight")
+
+
+@pytest.mark.parametrize("status", [404, 503])
+@mock.patch('requests.Session.get')
+def test_failed_page_raises_fetch_error(mock_request_get, scraper, status):
+    mock_request_get.return_value = _mock_response(status=status, content=b"")
+    with pytest.raises(FetchError):
+        scraper.scrape_title_by_id("tt0468569")
@@ -0,0 +1,74 @@
+from src.scraper import extractor
+from src.scraper.page import Page, PersonDocument, TitleDocument
+from src.scraper.parser import DEFAULT_PARSER, PARSER_MODULES, is_parser_available
+
+import os
+import pytest
+import sys
+
+IMDB_TITLE_PATH = os.path.join(sys.path[0], "test/resources/imdb_pages/title/")
+IMDB_NAME_PATH = os.path.join(sys.path[0], "test/resources/imdb_pages/name/")
+
+TITLES = ["avengers_endgame", "wolf_of_wall_st", "the_dark_knight"]
+NAMES = ["leonardo_dicaprio", "christian_bale", "gwyneth_paltrow"]
+PARSERS = list(PARSER_MODULES.keys())
+
+
+def get_fields(model) -> dict:
+    return {field: getattr(model, field) for field in model.__slots__}
+
+
+def get_imdb_page(filepath: str):
+    with open(filepath, "rb") as f:
+        return f.read()
+
+
+def scrape_title(prefix: str, parser: str, strained: bool):
+    credits_region = extractor.FULL_CREDITS_REGION if strained else None
+    document = TitleDocument(url=prefix,
+                             main=Page(prefix, get_imdb_page(prefix + "_main.htm"), parser=parser),
+                             full_credits=Page(prefix, get_imdb_page(prefix + "_credits.htm"), parser=parser,
+                                               region=credits_region))
+    return get_fields(extractor.get_title_contents(document)), extractor.get_title_relation_contents(document)
+
+
+def scrape_person(prefix: str, parser: str, strained: bool):
+    document = PersonDocument(url=prefix,
+                              main=Page(prefix, get_imdb_page(prefix + "_main.htm"), parser=parser),
+                              bio=Page(prefix, get_imdb_page(prefix + "_bio.htm"), parser=parser,
+                                       region=extractor.BIO_REGION if strained else None),
+                              awards=Page(prefix, get_imdb_page(prefix + "_awards.htm"), parser=parser,
+                                          region=extractor.AWARDS_REGION if strained else None))
+    awards = extractor.get_person_relation_contents(document)
+    return (get_fields(extractor.get_person_contents(document)),
+            {organisation: [get_fields(a) for a in items] for organisation, items in awards.items()})
+
+
+def search_result(filepath: str, parser: str, strained: bool):
+    region = extractor.SEARCH_REGION if strained else None
+    return extractor.get_first_result_path(Page(filepath, get_imdb_page(filepath), parser=parser, region=region).soup)
+
+
+def require(parser: str):
+    if not is_parser_available(parser):
+        pytest.skip(f"{parser} is not installed")
+
+
+@pytest.mark.parametrize("strained", [False, True])
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("title", TITLES)
+def test_title_parity(parser, strained, title):
+    require(parser)
+    prefix, search = IMDB_TITLE_PATH + title, IMDB_TITLE_PATH + title + "_search.htm"
+    assert (scrape_title(prefix, parser, strained) == scrape_title(prefix, DEFAULT_PARSER, False))
+    assert (search_result(search, parser, strained) == search_result(search, DEFAULT_PARSER, False))
+
+
+@pytest.mark.parametrize("strained", [False, True])
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("name", NAMES)
+def test_person_parity(parser, strained, name):
+    require(parser)
+    prefix, search = IMDB_NAME_PATH + name, IMDB_NAME_PATH + name + "_search.htm"
+    assert (scrape_person(prefix, parser, strained) == scrape_person(prefix, DEFAULT_PARSER, False))
+    assert (search_result(search, parser, strained) == search_result(search, DEFAULT_PARSER, False))
@@ -0,0 +1,80 @@
+from src.scraper.fetcher import Fetcher
+from src.scraper.rate_limiter import HostLimiter, RateLimiter, parse_retry_after
+
+from email.utils import formatdate
+
+import mock
+import time
+
+
+def _mock_response(status=200, headers=None):
+    mock_resp = mock.Mock()
+    mock_resp.status_code = status
+    mock_resp.headers = headers or {}
+    mock_resp.content = b""
+    return mock_resp
+
+
+def test_parse_retry_after():
+    assert (parse_retry_after("120") == 120.0)
+    assert (118 <= parse_retry_after(formatdate(1000120, usegmt=True), now=1000000) <= 120)
+    assert (parse_retry_after("soon") is None and parse_retry_after(None) is None)
+
+
+def test_concurrency_grows_additively_and_halves_when_throttled():
+    host = HostLimiter(rate=1000, burst=1000, initial_concurrency=2, max_concurrency=8)
+    now = time.monotonic()
+    for _ in range(20):
+        assert (host.try_acquire(now) == 0)
+        host.release(0.1, 200, now=now)
+        now += 0.1
+    assert (4 < host.limit <= 8)
+
+    grown = host.limit
+    assert (host.try_acquire(now) == 0)
+    host.release(0.1, 429, retry_after=5, now=now)
+    assert (host.limit == grown / 2)
+    assert (host.try_acquire(now + 1) == 4)
+    assert (host.try_acquire(now + 5) == 0)
+
+
+def test_slow_responses_trim_concurrency_and_in_flight_is_capped():
+    host = HostLimiter(rate=1000, burst=1000, initial_concurrency=2)
+    now = time.monotonic()
+    assert (host.try_acquire(now) == 0 and host.try_acquire(now) == 0)
+    assert (host.try_acquire(now) > 0)
+    host.release(0.1, 200, now=now + 1)
+    host.release(1.0, 200, now=now + 2)
+    assert (host.limit < 2.5)
+
+
+def test_concurrency_recovers_after_latency_steps_up_for_good():
+    host = HostLimiter(rate=1000, burst=1000, initial_concurrency=8, max_concurrency=8)
+    now = time.monotonic()
+    for latency in [0.1] * 10 + [1.0] * 100:
+        assert (host.try_acquire(now) == 0)
+        host.release(latency, 200, now=now)
+        now += latency
+    assert (0.5 < host.baseline_latency <= 1.0)
+    assert (host.limit > 4)
+
+
+def test_token_bucket_paces_requests():
+    host = HostLimiter(rate=2, burst=1, initial_concurrency=10)
+    now = time.monotonic()
+    assert (host.try_acquire(now) == 0)
+    assert (host.try_acquire(now) == 0.5)
+    assert (host.try_acquire(now + 0.5) == 0)
+
+
+@mock.patch('time.sleep')
+@mock.patch('requests.Session.get')
+def test_fetcher_retries_throttled_requests(mock_request_get, mock_sleep):
+    mock_request_get.side_effect = [_mock_response(429, {"Retry-After": "2"}), _mock_response(200)]
+    limiter = RateLimiter(rate=1000, burst=1000)
+    fetcher = Fetcher(rate_limiter=limiter)
+
+    assert (fetcher.get("https://www.imdb.com/title/tt0468569/").status_code == 200)
+    assert (mock_request_get.call_count == 2 and fetcher.request_count == 2)
+    assert (sum(c.args[0] for c in mock_sleep.call_args_list) > 1.9)
+    assert (limiter.stats()["www.imdb.com"]["throttled"] == 1)
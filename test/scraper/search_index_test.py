@@ -0,0 +1,39 @@
+from src.scraper.search_index import SearchIndex, normalise_query
+
+import pytest
+
+
+@pytest.mark.parametrize("query", ["Penélope Cruz", "  penelope   CRUZ ", "PENELOPE\tcruz"])
+def test_normalise_query(query):
+    assert (normalise_query(query) == "penelope cruz")
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / "search_index.jsonl")
+    index = SearchIndex(path)
+    index.put("Christian Bale", "/name/nm0000288/")
+    assert (SearchIndex(path).get("christian  bale") == "/name/nm0000288/")
+
+
+def test_preload(tmp_path):
+    preload_file = tmp_path / "known.tsv"
+    preload_file.write_text("The Dark Knight\ttt0468569\n"
+                            "Christian Bale\thttps://www.imdb.com/name/nm0000288/?ref_=fn_al_nm_1\n"
+                            "Nobody\tnot an id\n", encoding="utf-8")
+    index = SearchIndex()
+    assert (index.preload(str(preload_file)) == 2)
+    assert (index.get("the dark knight") == "/title/tt0468569/")
+    assert (index.get("Christian Bale") == "/name/nm0000288/")
+    assert (index.get("Nobody") is None)
+    assert (index.hits == 2 and index.misses == 1)
+
+
+def test_truncated_last_entry_is_skipped(tmp_path):
+    path = str(tmp_path / "index.jsonl")
+    SearchIndex(path).put("The Dark Knight", "/title/tt0468569/")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"query": "christian ba')
+    index = SearchIndex(path)
+    assert (len(index) == 1)
+    index.put("Christian Bale", "/name/nm0000288/")
+    assert (SearchIndex(path).get("Christian Bale") == "/name/nm0000288/")
@@ -0,0 +1,61 @@
+from src.model.person import Person
+from src.model.title import Title
+from src.services.bulk_loader import BulkLoader
+from src.services.export_service import ExportService, JsonLinesWriter, ParquetWriter, open_writer, read_records
+
+from datetime import datetime
+
+import mock
+import pytest
+
+
+def _export(writer):
+    exporter = ExportService(writer)
+    title = Title("The Dark Knight", "Batman.", 2008, "12A", 152, "Gotham.", "Why so serious?")
+    person = Person("Christian Bale", datetime(1974, 1, 30), "Bio.")
+    exporter.create_title(title)
+    for _ in range(2):
+        exporter.create_person(person)
+        exporter.create_acted_in_relation(person=person, title=title, characters=["Bruce Wayne"], billing=0)
+    exporter.close()
+    return exporter
+
+
+def test_export_to_json_lines_and_bulk_load(tmp_path):
+    path = str(tmp_path / "export.jsonl.gz")
+    assert (_export(JsonLinesWriter(path)).records == 5)
+    records = list(read_records(path))
+    assert ([name for name, _ in records] ==
+            ["CreateTitle", "CreatePerson", "CreateActedInRelation", "CreatePerson", "CreateActedInRelation"])
+    assert (records[2][1]["characters"] == ["Bruce Wayne"])
+
+    client = mock.Mock()
+    client.execute_batch.side_effect = lambda batch: [{} for _ in batch]
+    stats = BulkLoader(client, batch_size=2).load(path)
+
+    assert ((stats.records, stats.duplicates, stats.sent, stats.requests) == (5, 2, 3, 2))
+    sent = [name for call in client.execute_batch.call_args_list for name, _ in call.args[0]]
+    assert (sent == ["CreateTitle", "CreatePerson", "CreateActedInRelation"])
+
+
+def test_export_to_parquet_reads_back_entities_first(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "export.parquet")
+    _export(ParquetWriter(path, row_group_size=1))
+    records = list(read_records(path))
+    assert ([name for name, _ in records] ==
+            ["CreateTitle", "CreatePerson", "CreatePerson", "CreateActedInRelation", "CreateActedInRelation"])
+    assert (records[0][1]["released"] == 2008)
+    assert (records[3][1]["characters"] == ["Bruce Wayne"])
+
+
+def test_resumed_export_keeps_earlier_records(tmp_path):
+    path = str(tmp_path / "export.jsonl")
+    _export(open_writer(path))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"operation": "CreatePer')  # The first run died mid-record.
+    _export(open_writer(path, append=True))
+    assert ([name for name, _ in read_records(path)] ==
+            ["CreateTitle", "CreatePerson", "CreateActedInRelation", "CreatePerson", "CreateActedInRelation"] * 2)
+    with pytest.raises(ValueError):
+        open_writer(str(tmp_path / "export.parquet"), append=True)